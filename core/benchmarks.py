@@ -0,0 +1,312 @@
+import io
+import platform
+import statistics
+import timeit
+from datetime import date, timedelta
+from unittest import mock
+
+import django
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import Prefetch
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.middleware import QueryRecorder
+from core.renderers import FastJSONRenderer, orjson
+from core.throttling import SlidingWindowRateThrottle
+from team_meeting.cache import get_reference_cache
+from team_meeting.models import (
+    Booking,
+    MeetingRoom,
+    Project,
+    Team,
+    TypeOfMeeting,
+)
+from team_meeting.prefetch import plan_queryset
+from team_meeting.serializers import (
+    BOOKING_LIST_COLUMNS,
+    BookingCreateSerializer,
+    BookingListSerializer,
+    ProjectRetrieveSerializer,
+    booking_list_row,
+)
+
+RESULTS_VERSION = 1
+PAGE_ROWS = 100
+SERIALIZER_DATASET = 1000
+PROJECT_TEAMS = 200
+START = date(2023, 1, 2)
+LIST_ENDPOINTS = (
+    "team-meeting:meetingroom-list",
+    "team-meeting:project-list",
+    "team-meeting:typeofmeeting-list",
+    "team-meeting:team-list",
+    "team-meeting:meeting-list",
+    "team-meeting:booking-list",
+    "team-meeting:async-meeting-room-list",
+    "team-meeting:async-booking-list",
+)
+
+
+class Benchmark:
+    """Function measured number times per run, size is the number
+    of bookings of the dataset if it depends on one"""
+
+    def __init__(self, name, function, number, size=None):
+        self.name = name
+        self.function = function
+        self.number = number
+        self.size = size
+
+    def run(self, repeat, scale):
+        number = max(1, int(self.number * scale))
+        # warm up caches and count queries of a single call, requests
+        # reset connection.queries
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            self.function()
+        times = [
+            elapsed / number
+            for elapsed in timeit.repeat(
+                self.function, number=number, repeat=repeat
+            )
+        ]
+        return {
+            "name": self.name,
+            "size": self.size,
+            "number": number,
+            "repeat": repeat,
+            "min": min(times),
+            "median": statistics.median(times),
+            "queries": recorder.count,
+        }
+
+
+def rolled_back(function):
+    """Run function in a transaction rolled back afterwards,
+    so that every call sees the same data"""
+
+    def wrapper():
+        with transaction.atomic():
+            function()
+            transaction.set_rollback(True)
+
+    return wrapper
+
+
+def generate(size, seed):
+    """Generate a dataset of size bookings spread over a year"""
+    call_command(
+        "generate_data",
+        rooms=max(10, size // 250),
+        projects=max(5, size // 1000),
+        teams=max(10, size // 100),
+        users=max(10, size // 20),
+        meetings=size // 10,
+        bookings=size,
+        start=START,
+        days=365,
+        seed=seed,
+        stdout=io.StringIO(),
+    )
+
+
+def serializer_benchmarks(user):
+    """Benchmarks of validation and serializers"""
+    room = MeetingRoom.objects.first()
+    project = Project.objects.create(name="Benchmark project")
+    Team.objects.bulk_create(
+        Team(name=f"Team {index}", project=project, num_of_members=5)
+        for index in range(PROJECT_TEAMS)
+    )
+    team = project.teams.first()
+
+    def validate_conflicting_time():
+        try:
+            Booking.validate_time(
+                9, 11, serializers.ValidationError, occupied=0b11 << 10
+            )
+        except serializers.ValidationError:
+            pass
+
+    create_serializer = BookingCreateSerializer(
+        data={
+            "room": room.id,
+            # past the generated days, so the hours are free
+            "day": START + timedelta(days=400),
+            "start_hour": 9,
+            "end_hour": 11,
+            "meeting": {
+                "team": team.id,
+                "type_of_meeting": TypeOfMeeting.objects.first().id,
+            },
+        }
+    )
+    create_serializer.is_valid(raise_exception=True)
+    validated_data = create_serializer.validated_data
+
+    def create_booking():
+        create_serializer.create(
+            dict(
+                validated_data,
+                meeting=dict(validated_data["meeting"]),
+                user=user,
+            )
+        )
+
+    page = list(
+        plan_queryset(Booking.objects.all(), BookingListSerializer())[
+            :PAGE_ROWS
+        ]
+    )
+    rows = list(Booking.objects.values(*BOOKING_LIST_COLUMNS)[:PAGE_ROWS])
+    renderer = FastJSONRenderer()
+    project = Project.objects.prefetch_related(
+        Prefetch("teams", Team.objects.order_by("name"))
+    ).get(pk=project.pk)
+
+    return [
+        Benchmark(
+            "validate_time",
+            lambda: Booking.validate_time(
+                9, 11, serializers.ValidationError, occupied=0
+            ),
+            100_000,
+        ),
+        Benchmark("validate_time_conflict", validate_conflicting_time, 20_000),
+        Benchmark(
+            "booking_create_serializer_create",
+            rolled_back(create_booking),
+            50,
+        ),
+        Benchmark(
+            f"booking_list_serializer_{PAGE_ROWS}_rows",
+            lambda: renderer.render(
+                BookingListSerializer(page, many=True).data,
+                renderer.media_type,
+            ),
+            50,
+        ),
+        Benchmark(
+            f"booking_list_rows_{PAGE_ROWS}_rows",
+            lambda: renderer.render(
+                [booking_list_row(row) for row in rows], renderer.media_type
+            ),
+            200,
+        ),
+        Benchmark(
+            f"project_retrieve_serializer_{PROJECT_TEAMS}_teams",
+            lambda: ProjectRetrieveSerializer(project).data,
+            100,
+        ),
+    ]
+
+
+def endpoint_benchmarks(client, size):
+    """Benchmarks of list endpoints served from warm caches, as after
+    the first call, and from the database with the reference data cache
+    cleared before every request"""
+    benchmarks = []
+    for name in LIST_ENDPOINTS:
+        url = reverse(name)
+
+        def get(url=url):
+            response = client.get(url)
+            if response.status_code != 200:
+                raise RuntimeError(f"{url}: {response.status_code}")
+
+        def get_cold(get=get):
+            get_reference_cache().clear()
+            get()
+
+        benchmarks.append(Benchmark(name.split(":")[1], get, 20, size))
+        benchmarks.append(
+            Benchmark(f"{name.split(':')[1]}-cold", get_cold, 20, size)
+        )
+    return benchmarks
+
+
+def client_for(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION="Bearer "
+        f"{RefreshToken.for_user(user).access_token}"
+    )
+    return client
+
+
+def run(sizes, repeat=5, scale=1.0, seed=0, log=None):
+    """Return results of the serializer benchmarks, on a dataset of
+    SERIALIZER_DATASET bookings, and of list endpoints for datasets
+    of each size
+
+    Datasets are rolled back afterwards. Throttling is disabled,
+    so that repeated requests are not rejected.
+    """
+    results = []
+
+    def measure(benchmarks):
+        for benchmark in benchmarks:
+            result = benchmark.run(repeat, scale)
+            results.append(result)
+            if log:
+                log(result)
+
+    def allow_request(throttle, request, view):
+        return True
+
+    async def aallow_request(throttle, request, view):
+        return True
+
+    with mock.patch.object(
+        SlidingWindowRateThrottle, "allow_request", allow_request
+    ), mock.patch.object(
+        SlidingWindowRateThrottle, "aallow_request", aallow_request
+    ):
+        for size in [None] + list(sizes):
+            with transaction.atomic():
+                generate(size or SERIALIZER_DATASET, seed)
+                user = Booking.objects.first().user
+                if size is None:
+                    measure(serializer_benchmarks(user))
+                else:
+                    measure(endpoint_benchmarks(client_for(user), size))
+                transaction.set_rollback(True)
+            for cache in caches.all():
+                cache.clear()
+
+    return results
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "orjson": orjson is not None,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Return (result, baseline result, time ratio, regressed) of results
+    found in the baseline, regressed if slower by more than threshold
+    or running more queries"""
+    baseline = {
+        (result["name"], result["size"]): result
+        for result in baseline["results"]
+    }
+    comparison = []
+    for result in results:
+        old = baseline.get((result["name"], result["size"]))
+        if old is None:
+            continue
+        ratio = result["min"] / old["min"] if old["min"] else 1.0
+        regressed = (
+            ratio > 1 + threshold or result["queries"] > old["queries"]
+        )
+        comparison.append((result, old, ratio, regressed))
+    return comparison
@@ -0,0 +1,75 @@
+import csv
+import io
+
+from django.core.management.color import no_style
+from django.db import connection
+
+NULL = "\\N"
+
+
+def batches(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def copy_rows(model, fields, rows):
+    """Insert rows of database values of fields with COPY"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([NULL if value is None else value for value in row])
+    buffer.seek(0)
+
+    quote_name = connection.ops.quote_name
+    columns = ", ".join(quote_name(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {quote_name(model._meta.db_table)} ({columns}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '{NULL}')",
+            buffer,
+        )
+
+
+def insert_rows(model, fields, rows):
+    """Insert rows of database values of fields, with COPY on PostgreSQL
+    and bulk_create elsewhere"""
+    if connection.vendor == "postgresql":
+        copy_rows(model, fields, rows)
+        return
+
+    names = [field.attname for field in fields]
+    model.objects.bulk_create(
+        [model(**dict(zip(names, row))) for row in rows]
+    )
+
+
+def insert_objects(model, objs, batch_size):
+    """Insert objects in batches, without setting their ids"""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if not field.primary_key
+    ]
+    for batch in batches(objs, batch_size):
+        if connection.vendor != "postgresql":
+            model.objects.bulk_create(batch)
+            continue
+        copy_rows(
+            model,
+            fields,
+            (
+                [
+                    field.get_db_prep_save(
+                        field.pre_save(obj, True), connection
+                    )
+                    for field in fields
+                ]
+                for obj in batch
+            ),
+        )
+
+
+def reset_sequences(*models):
+    """Move primary key sequences past ids inserted explicitly"""
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), models):
+            cursor.execute(sql)
@@ -0,0 +1,132 @@
+import json
+
+from django.core.management import BaseCommand, CommandError
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from core import benchmarks
+
+
+class Command(BaseCommand):
+    """Django command running the benchmarks of validation, serializers
+    and list endpoints in a test database
+
+    Results are written as JSON with --output and compared with
+    the results of another commit with --compare, which fails if any
+    benchmark got slower than --threshold or runs more queries.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[1000, 10_000],
+            help="Bookings of the datasets of the list endpoints",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Measurements of each benchmark, the fastest one counts",
+        )
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="Factor of the calls per measurement",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="JSON file of the results")
+        parser.add_argument(
+            "--compare", help="JSON file of results to compare with"
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Slowdown reported as a regression (0.2 is 20%%)",
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Reuse the test database",
+        )
+
+    def log(self, result):
+        size = "" if result["size"] is None else result["size"]
+        self.stdout.write(
+            f"{result['name']:<42} {size:>7} "
+            f"{result['min'] * 1e6:>12.1f} {result['median'] * 1e6:>12.1f} "
+            f"{result['queries']:>7}"
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["compare"]:
+            with open(options["compare"]) as file:
+                baseline = json.load(file)
+
+        self.stdout.write(
+            f"{'benchmark':<42} {'size':>7} {'min µs':>12} "
+            f"{'median µs':>12} {'queries':>7}"
+        )
+        setup_test_environment(debug=False)
+        old_config = setup_databases(
+            verbosity=0, interactive=False, keepdb=options["keepdb"]
+        )
+        try:
+            results = benchmarks.run(
+                options["sizes"],
+                repeat=options["repeat"],
+                scale=options["scale"],
+                seed=options["seed"],
+                log=self.log,
+            )
+            environment = benchmarks.environment()
+        finally:
+            teardown_databases(
+                old_config, verbosity=0, keepdb=options["keepdb"]
+            )
+            teardown_test_environment()
+
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(
+                    {
+                        "version": benchmarks.RESULTS_VERSION,
+                        "environment": environment,
+                        "results": results,
+                    },
+                    file,
+                    indent=2,
+                )
+
+        if baseline is not None:
+            self.report(
+                benchmarks.compare(results, baseline, options["threshold"])
+            )
+
+    def report(self, comparison):
+        self.stdout.write("")
+        self.stdout.write(
+            f"{'benchmark':<42} {'size':>7} {'ratio':>7} {'queries':>12}"
+        )
+        regressions = 0
+        for result, old, ratio, regressed in comparison:
+            size = "" if result["size"] is None else result["size"]
+            line = (
+                f"{result['name']:<42} {size:>7} {ratio:>7.2f} "
+                f"{old['queries']:>6} -> {result['queries']:<4}"
+            )
+            if regressed:
+                regressions += 1
+                line = self.style.ERROR(line)
+            self.stdout.write(line)
+
+        if regressions:
+            raise CommandError(f"{regressions} benchmarks regressed")
@@ -0,0 +1,111 @@
+import io
+import timeit
+from datetime import date, timedelta
+
+from django.core.management import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer, orjson
+from team_meeting.models import Booking
+from team_meeting.serializers import booking_list_row
+
+ROOMS = ("Blue", "Green", "Yellow", "Ocean view", "Кімната 4")
+TEAMS = ("Backend", "Frontend", "QA", "Data", "Design")
+
+
+def booking_page(rows):
+    """Return a page of the booking list, as paginated by the API"""
+    day = date(2023, 1, 2)
+    results = []
+    for index in range(rows):
+        recurring = index % 3 == 0
+        results.append(
+            booking_list_row(
+                {
+                    "id": index + 1,
+                    "day": day + timedelta(days=index // 8),
+                    "start_hour": index % 8 + 9,
+                    "end_hour": index % 8 + 10,
+                    "room__name": ROOMS[index % len(ROOMS)],
+                    "user__email": f"user{index % 40}@example.com",
+                    "meeting__team__name": TEAMS[index % len(TEAMS)],
+                    "meeting__team__project__name": f"Project {index % 7}",
+                    "meeting__type_of_meeting__name": "Weekly sync",
+                    "frequency": Booking.WEEKLY if recurring else "",
+                    "interval": 1,
+                    "repeat_until": day + timedelta(days=90)
+                    if recurring else None,
+                    "repeat_count": None,
+                }
+            )
+        )
+    return {
+        "count": rows * 20,
+        "next": "http://testserver/api/team-meeting/bookings/?page=2",
+        "previous": None,
+        "results": results,
+    }
+
+
+class Command(BaseCommand):
+    """Django command comparing JSON renderers and parsers
+    on pages of the booking list"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[10, 100],
+            help="Rows per page",
+        )
+        parser.add_argument(
+            "--number",
+            type=int,
+            default=200,
+            help="Renders and parses of each page per measurement",
+        )
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(
+                self.style.WARNING(
+                    "orjson is not installed, "
+                    "the fast renderer falls back to JSONRenderer"
+                )
+            )
+
+        number = options["number"]
+        self.stdout.write(
+            f"{'rows':>6} {'implementation':<18} "
+            f"{'render µs':>10} {'parse µs':>10} {'bytes':>8}"
+        )
+        for rows in options["rows"]:
+            page = booking_page(rows)
+            for name, renderer, parser in (
+                ("JSONRenderer", JSONRenderer(), JSONParser()),
+                ("FastJSONRenderer", FastJSONRenderer(), FastJSONParser()),
+            ):
+                content = renderer.render(page, "application/json")
+                render_time = min(
+                    timeit.repeat(
+                        lambda: renderer.render(page, "application/json"),
+                        number=number,
+                        repeat=5,
+                    )
+                )
+                parse_time = min(
+                    timeit.repeat(
+                        lambda: parser.parse(io.BytesIO(content)),
+                        number=number,
+                        repeat=5,
+                    )
+                )
+                self.stdout.write(
+                    f"{rows:>6} {name:<18} "
+                    f"{render_time / number * 1e6:>10.1f} "
+                    f"{parse_time / number * 1e6:>10.1f} "
+                    f"{len(content):>8}"
+                )
@@ -0,0 +1,322 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import BaseCommand, CommandError
+from django.db import DatabaseError, transaction
+from django.db.models import Max
+
+from core.bulk import batches, insert_rows, reset_sequences
+from team_meeting import cache
+from team_meeting.models import (
+    Booking,
+    Meeting,
+    MeetingRoom,
+    Project,
+    RoomOccupancy,
+    Team,
+    TypeOfMeeting,
+    hours_mask,
+)
+
+TYPES_OF_MEETING = ("Daily", "Planning", "Review", "Retrospective", "Demo")
+# bookings are placed within working hours
+WORK_START = 8
+WORK_END = 20
+MAX_HOURS = 3
+MAX_REPEAT_COUNT = 8
+# room days tried for a booking before the rooms are considered full
+ATTEMPTS = 20
+
+MEETING_FIELDS = ("id", "team", "type_of_meeting", "requires_meeting_room")
+BOOKING_FIELDS = (
+    "room",
+    "day",
+    "start_hour",
+    "end_hour",
+    "user",
+    "meeting",
+    "frequency",
+    "interval",
+    "repeat_until",
+    "repeat_count",
+)
+OCCUPANCY_FIELDS = ("room", "day", "mask")
+
+
+def get_fields(model, names):
+    return [model._meta.get_field(name) for name in names]
+
+
+class BookingGenerator:
+    """Generate bookings of new rooms that do not overlap each other,
+    from a seeded random generator
+
+    Occupied hours are kept as RoomOccupancy masks by (room_id, day),
+    bookings are placed into free intervals of a random room day.
+    """
+
+    def __init__(self, rng, room_ids, days, recurring):
+        self.rng = rng
+        self.room_ids = room_ids
+        self.days = days
+        self.recurring = recurring
+        self.masks = {}
+        self.work_mask = hours_mask(WORK_START, WORK_END)
+
+    def free_intervals(self, room_id, day):
+        mask = self.masks.get((room_id, day), 0) | ~self.work_mask
+        return RoomOccupancy.free_intervals(mask & hours_mask(0, 24))
+
+    def occurrence_days(self, day):
+        if self.rng.random() >= self.recurring:
+            return "", None, [day]
+
+        # weeks until the last day
+        weeks = (self.days[-1] - day).days // 7 + 1
+        if weeks < 2:
+            return "", None, [day]
+        repeat_count = self.rng.randint(2, min(weeks, MAX_REPEAT_COUNT))
+        days = list(
+            Booking.occurrence_days(
+                day, Booking.WEEKLY, 1, None, repeat_count
+            )
+        )
+        return Booking.WEEKLY, repeat_count, days
+
+    def is_free(self, room_id, days, mask):
+        return not any(
+            self.masks.get((room_id, day), 0) & mask for day in days
+        )
+
+    def place(self):
+        """Return (room_id, day, start_hour, end_hour, frequency,
+        repeat_count) of a new booking and occupy its hours"""
+        rng = self.rng
+        for _ in range(ATTEMPTS):
+            room_id = rng.choice(self.room_ids)
+            day = rng.choice(self.days)
+            intervals = self.free_intervals(room_id, day)
+            if not intervals:
+                continue
+
+            start_hour, end_hour = rng.choice(intervals)
+            start_hour = rng.randrange(start_hour, end_hour)
+            end_hour = min(
+                end_hour, start_hour + rng.randint(1, MAX_HOURS)
+            )
+            mask = hours_mask(start_hour, end_hour)
+            frequency, repeat_count, days = self.occurrence_days(day)
+            if not self.is_free(room_id, days, mask):
+                frequency, repeat_count, days = "", None, [day]
+
+            for occurrence_day in days:
+                key = (room_id, occurrence_day)
+                self.masks[key] = self.masks.get(key, 0) | mask
+            return (
+                room_id, day, start_hour, end_hour, frequency, repeat_count
+            )
+        raise CommandError(
+            "Rooms are almost full, generate more rooms or days "
+            "for this many bookings"
+        )
+
+
+class Command(BaseCommand):
+    """Django command to generate a dataset for scale testing
+
+    The same options give the same dataset. Rooms, projects and users
+    are named after the seed, so datasets of different seeds can be
+    generated into one database. Meetings, bookings and occupied hours
+    are written with COPY on PostgreSQL, in one transaction.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rooms", type=int, default=50)
+        parser.add_argument("--projects", type=int, default=10)
+        parser.add_argument("--teams", type=int, default=50)
+        parser.add_argument("--users", type=int, default=500)
+        parser.add_argument(
+            "--meetings",
+            type=int,
+            default=100,
+            help="Meetings without a booking",
+        )
+        parser.add_argument("--bookings", type=int, default=10_000)
+        parser.add_argument(
+            "--start",
+            type=date.fromisoformat,
+            default=date(2023, 1, 2),
+            help="First booking day (ex. 2023-01-02)",
+        )
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument(
+            "--recurring",
+            type=float,
+            default=0.1,
+            help="Share of weekly recurring bookings",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--password",
+            default="password",
+            help="Password of the generated users",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50_000,
+            help="Rows inserted per COPY or INSERT",
+        )
+
+    def log(self, message):
+        elapsed = time.monotonic() - self.started_at
+        self.stdout.write(f"{elapsed:8.1f}s {message}")
+
+    def handle(self, *args, **options):
+        for name in ("rooms", "projects", "teams", "users", "days"):
+            if options[name] < 1:
+                raise CommandError(f"--{name} should be at least 1")
+
+        self.started_at = time.monotonic()
+        self.rng = random.Random(options["seed"])
+        try:
+            with transaction.atomic():
+                self.generate(options)
+        except DatabaseError as error:
+            raise CommandError(
+                f"Nothing generated: {error}, try another --seed"
+            )
+
+        # COPY and bulk_create send no post_save
+        for model in (
+            MeetingRoom,
+            Project,
+            TypeOfMeeting,
+            Team,
+            get_user_model(),
+            Meeting,
+            Booking,
+        ):
+            cache.invalidate(model)
+        self.log(self.style.SUCCESS("Generated"))
+
+    def generate(self, options):
+        rng = self.rng
+        seed = options["seed"]
+
+        rooms = MeetingRoom.objects.bulk_create(
+            MeetingRoom(
+                name=f"Room {seed}-{index + 1}",
+                capacity=rng.randint(2, 30),
+                has_projector=rng.random() < 0.5,
+                is_soundproof=rng.random() < 0.3,
+            )
+            for index in range(options["rooms"])
+        )
+        projects = Project.objects.bulk_create(
+            Project(name=f"Project {seed}-{index + 1}")
+            for index in range(options["projects"])
+        )
+        types = [
+            TypeOfMeeting.objects.get_or_create(name=name)[0]
+            for name in TYPES_OF_MEETING
+        ]
+        teams = Team.objects.bulk_create(
+            Team(
+                name=f"Team {index + 1}",
+                project=rng.choice(projects),
+                num_of_members=rng.randint(2, 12),
+            )
+            for index in range(options["teams"])
+        )
+        # hashing is slow, the users share one hash
+        password = make_password(options["password"])
+        users = get_user_model().objects.bulk_create(
+            get_user_model()(
+                email=f"user{index + 1}.{seed}@example.com",
+                password=password,
+                team=rng.choice(teams) if rng.random() < 0.9 else None,
+            )
+            for index in range(options["users"])
+        )
+        self.log(
+            f"{len(rooms)} rooms, {len(projects)} projects, "
+            f"{len(teams)} teams, {len(users)} users"
+        )
+
+        team_ids = [team.id for team in teams]
+        type_ids = [type_of_meeting.id for type_of_meeting in types]
+        user_ids = [user.id for user in users]
+
+        # meetings get ids here, so that bookings can refer to them
+        meeting_id = Meeting.objects.aggregate(Max("id"))["id__max"] or 0
+        meetings = []
+        for _ in range(options["meetings"]):
+            meeting_id += 1
+            meetings.append(
+                (meeting_id, rng.choice(team_ids), rng.choice(type_ids), False)
+            )
+        meeting_fields = get_fields(Meeting, MEETING_FIELDS)
+        for batch in batches(meetings, options["batch_size"]):
+            insert_rows(Meeting, meeting_fields, batch)
+
+        generator = BookingGenerator(
+            rng,
+            [room.id for room in rooms],
+            [
+                options["start"] + timedelta(days=index)
+                for index in range(options["days"])
+            ],
+            options["recurring"],
+        )
+        booking_fields = get_fields(Booking, BOOKING_FIELDS)
+        generated = 0
+        while generated < options["bookings"]:
+            size = min(
+                options["batch_size"], options["bookings"] - generated
+            )
+            meetings, bookings = [], []
+            for _ in range(size):
+                room_id, day, start_hour, end_hour, frequency, count = (
+                    generator.place()
+                )
+                meeting_id += 1
+                meetings.append(
+                    (
+                        meeting_id,
+                        rng.choice(team_ids),
+                        rng.choice(type_ids),
+                        True,
+                    )
+                )
+                bookings.append(
+                    (
+                        room_id,
+                        day,
+                        start_hour,
+                        end_hour,
+                        rng.choice(user_ids),
+                        meeting_id,
+                        frequency,
+                        1,
+                        None,
+                        count,
+                    )
+                )
+            insert_rows(Meeting, meeting_fields, meetings)
+            insert_rows(Booking, booking_fields, bookings)
+            generated += size
+            self.log(f"{generated} bookings")
+        reset_sequences(Meeting)
+
+        occupancies = [
+            (room_id, day, mask)
+            for (room_id, day), mask in generator.masks.items()
+        ]
+        occupancy_fields = get_fields(RoomOccupancy, OCCUPANCY_FIELDS)
+        for batch in batches(occupancies, options["batch_size"]):
+            insert_rows(RoomOccupancy, occupancy_fields, batch)
+        self.log(f"{len(occupancies)} occupied room days")
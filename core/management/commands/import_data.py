@@ -0,0 +1,371 @@
+import csv
+import json
+import os
+from collections import namedtuple
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.core.management import BaseCommand, CommandError
+from django.db import DatabaseError, models, transaction
+from rest_framework import exceptions
+
+from core.bulk import batches, insert_objects
+from team_meeting import cache, feeds
+from team_meeting.models import (
+    Booking,
+    Meeting,
+    MeetingRoom,
+    Project,
+    RoomOccupancy,
+    Team,
+    TypeOfMeeting,
+)
+
+TRUE_VALUES = ("1", "t", "true", "y", "yes")
+FALSE_VALUES = ("0", "f", "false", "n", "no")
+MAX_REPORTED_ERRORS = 50
+
+# field: (model, {column: lookup}), rows refer to objects by name
+Reference = namedtuple("Reference", ("model", "columns"))
+REFERENCES = {
+    "room": Reference(MeetingRoom, {"room": "name"}),
+    "project": Reference(Project, {"project": "name"}),
+    "type_of_meeting": Reference(TypeOfMeeting, {"type_of_meeting": "name"}),
+    # team names are unique within their project only
+    "team": Reference(Team, {"project": "project__name", "team": "name"}),
+    "user": Reference(get_user_model(), {"user": "email"}),
+}
+
+# sources in the order of import, by file name without extension
+Source = namedtuple("Source", ("name", "model", "columns", "references"))
+SOURCES = (
+    Source(
+        "meeting_rooms",
+        MeetingRoom,
+        ("name", "capacity", "has_projector", "is_soundproof"),
+        (),
+    ),
+    Source("projects", Project, ("name", "description"), ()),
+    Source("types_of_meeting", TypeOfMeeting, ("name",), ()),
+    Source("teams", Team, ("name", "num_of_members"), ("project",)),
+    Source(
+        "users",
+        get_user_model(),
+        ("email", "first_name", "last_name", "is_staff", "password"),
+        ("team",),
+    ),
+    Source(
+        "meetings",
+        Meeting,
+        ("requires_meeting_room",),
+        ("team", "type_of_meeting"),
+    ),
+    # every booking gets a meeting of its own, as in the bulk endpoint
+    Source(
+        "bookings",
+        Booking,
+        (
+            "day",
+            "start_hour",
+            "end_hour",
+            "frequency",
+            "interval",
+            "repeat_until",
+            "repeat_count",
+        ),
+        ("room", "user", "team", "type_of_meeting"),
+    ),
+)
+
+
+class ImportFailed(Exception):
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def read_rows(path):
+    """Yield (line, row) of a CSV file with a header
+    or of a JSON file holding a list of objects"""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8", newline="") as file:
+        if extension == ".csv":
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row
+        elif extension == ".json":
+            for index, row in enumerate(json.load(file)):
+                yield index + 1, row
+        else:
+            raise CommandError(f"{path}: only .csv and .json are supported")
+
+
+def to_python(field, value):
+    if value is None or value == "":
+        return None if field.null else field.get_default()
+    if isinstance(field, models.BooleanField) and isinstance(value, str):
+        value = value.strip().lower()
+        if value in TRUE_VALUES:
+            return True
+        if value in FALSE_VALUES:
+            return False
+        raise ValidationError(f"“{value}” is not a boolean.")
+    return field.to_python(value)
+
+
+def resolve(name, rows):
+    """Return ids of the objects the rows refer to by the reference,
+    None for ambiguous ones"""
+    model, columns = REFERENCES[name]
+    keys = {
+        tuple(row.get(column) for column in columns)
+        for _, row in rows
+        if row.get(name)
+    }
+    if not keys:
+        return {}
+
+    lookups = list(columns.values())
+    filters = {
+        f"{lookup}__in": {key[index] for key in keys}
+        for index, lookup in enumerate(lookups)
+    }
+    ids = {}
+    for *key, pk in model.objects.filter(**filters).values_list(
+        *lookups, "pk"
+    ):
+        key = tuple(key)
+        ids[key] = None if key in ids else pk
+    return ids
+
+
+def reference_field(model, name):
+    if model is Booking and name not in ("room", "user"):
+        # bookings refer to the team and type of their meeting
+        model = Meeting
+    return model._meta.get_field(name)
+
+
+def build(source, row, ids):
+    """Return the unsaved object of a row"""
+    model = source.model
+    values = {}
+    for column in source.columns:
+        field = model._meta.get_field(column)
+        values[column] = to_python(field, row.get(column))
+
+    for name in source.references:
+        if not row.get(name):
+            if not reference_field(model, name).null:
+                raise ValidationError({name: "This field is required."})
+            values[f"{name}_id"] = None
+            continue
+        columns = REFERENCES[name].columns
+        key = tuple(row.get(column) for column in columns)
+        if key not in ids[name]:
+            raise ValidationError(
+                {name: f"{' / '.join(map(str, key))} does not exist."}
+            )
+        if ids[name][key] is None:
+            raise ValidationError(
+                {name: f"{' / '.join(map(str, key))} is ambiguous."}
+            )
+        values[f"{name}_id"] = ids[name][key]
+
+    if model is get_user_model():
+        try:
+            identify_hasher(values["password"])
+        except ValueError:
+            # hashing takes a while, prefer hashed passwords in big files
+            values["password"] = make_password(values["password"] or None)
+
+    if model is Booking:
+        meeting = Meeting(
+            requires_meeting_room=True,
+            team_id=values.pop("team_id"),
+            type_of_meeting_id=values.pop("type_of_meeting_id"),
+        )
+        meeting.full_clean(exclude=["team", "type_of_meeting"])
+        obj = Booking(**values)
+        obj.meeting = meeting
+    else:
+        obj = model(**values)
+
+    # references are resolved, uniqueness is left to the database
+    exclude = [
+        field.name for field in model._meta.concrete_fields
+        if field.name not in source.columns
+    ]
+    try:
+        obj.full_clean(
+            exclude=exclude, validate_unique=False, validate_constraints=False
+        )
+    except exceptions.ValidationError as error:
+        # raised by clean() of bookings
+        raise ValidationError(error.detail)
+    return obj
+
+
+def format_error(path, line, error):
+    if hasattr(error, "error_dict"):
+        messages = [
+            f"{field}: {message}"
+            for field, field_messages in error.message_dict.items()
+            for message in field_messages
+        ]
+    else:
+        messages = error.messages
+    return f"{path}:{line}: {'; '.join(messages)}"
+
+
+def occupy(path, bookings, batch_size):
+    """Claim hours of the bookings set-wise, return errors of bookings
+    overlapping existing ones or each other"""
+    errors = []
+    for batch in batches(bookings, batch_size):
+        slots = [booking.get_slots() for _, booking in batch]
+        occupancies = RoomOccupancy.lock(
+            (room_id, day)
+            for booking_slots in slots
+            for room_id, day, _ in booking_slots
+        )
+        for (line, booking), booking_slots in zip(batch, slots):
+            conflicts = RoomOccupancy.find_conflicts(
+                occupancies, booking_slots
+            )
+            if conflicts:
+                error = Booking.conflicts_error(
+                    conflicts, len(booking_slots) > 1, ValidationError
+                )
+                errors.append(format_error(path, line, error))
+                continue
+            RoomOccupancy.occupy(occupancies, booking_slots)
+        RoomOccupancy.objects.bulk_update(occupancies.values(), ["mask"])
+    return errors
+
+
+def import_bookings(path, bookings, batch_size):
+    errors = occupy(path, bookings, batch_size)
+    if errors:
+        raise ImportFailed(errors)
+
+    meetings = [booking.meeting for _, booking in bookings]
+    Meeting.objects.bulk_create(meetings, batch_size=batch_size)
+    for meeting, (_, booking) in zip(meetings, bookings):
+        booking.meeting = meeting
+    insert_objects(
+        Booking, [booking for _, booking in bookings], batch_size
+    )
+
+
+def import_source(source, path, batch_size):
+    """Import rows of a file, return the imported objects"""
+    rows = list(read_rows(path))
+    ids = {name: resolve(name, rows) for name in source.references}
+
+    objs, errors = [], []
+    for line, row in rows:
+        try:
+            objs.append((line, build(source, row, ids)))
+        except ValidationError as error:
+            errors.append(format_error(path, line, error))
+    if errors:
+        raise ImportFailed(errors)
+
+    if source.model is Booking:
+        import_bookings(path, objs, batch_size)
+    else:
+        insert_objects(source.model, [obj for _, obj in objs], batch_size)
+    return [obj for _, obj in objs]
+
+
+def invalidate(model, objs):
+    """Expire cached responses, COPY and bulk_create send no post_save"""
+    cache.invalidate(model)
+    if model is Booking:
+        cache.invalidate(Meeting)
+        scopes = set()
+        for booking in objs:
+            scopes |= {
+                (feeds.ROOM, booking.room_id),
+                (feeds.USER, booking.user_id),
+                (feeds.TEAM, booking.meeting.team_id),
+            }
+        for scope, pk in scopes:
+            feeds.invalidate_scope(scope, pk)
+
+
+class Command(BaseCommand):
+    """Django command to import rooms, projects, types of meeting, teams,
+    users, meetings and bookings from CSV or JSON files
+
+    Files are named after what they hold (ex. meeting_rooms.csv,
+    bookings.json) and imported in the order of SOURCES, in one
+    transaction. Rows refer to rooms, projects, types of meeting and
+    users by name or email and to teams by team and project names.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("files", nargs="+", help="CSV or JSON files")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows inserted per COPY or INSERT",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate and import, then roll back",
+        )
+
+    def get_paths(self, files):
+        paths = {}
+        for path in files:
+            name = os.path.splitext(os.path.basename(path))[0]
+            if name not in {source.name for source in SOURCES}:
+                raise CommandError(
+                    f"{path}: unknown file, expected one of: "
+                    + ", ".join(source.name for source in SOURCES)
+                )
+            if not os.path.isfile(path):
+                raise CommandError(f"{path}: no such file")
+            paths[name] = path
+        return paths
+
+    def handle(self, *args, **options):
+        paths = self.get_paths(options["files"])
+        imported = []
+        try:
+            with transaction.atomic():
+                for source in SOURCES:
+                    if source.name not in paths:
+                        continue
+                    objs = import_source(
+                        source, paths[source.name], options["batch_size"]
+                    )
+                    imported.append((source, objs))
+                if options["dry_run"]:
+                    transaction.set_rollback(True)
+        except ImportFailed as failure:
+            errors = failure.errors
+            for error in errors[:MAX_REPORTED_ERRORS]:
+                self.stderr.write(error)
+            if len(errors) > MAX_REPORTED_ERRORS:
+                self.stderr.write(
+                    f"... {len(errors) - MAX_REPORTED_ERRORS} more errors"
+                )
+            raise CommandError(f"{len(errors)} errors, nothing imported")
+        except DatabaseError as error:
+            raise CommandError(f"Nothing imported: {error}")
+
+        for source, objs in imported:
+            self.stdout.write(f"{source.name}: {len(objs)}")
+        if options["dry_run"]:
+            self.stdout.write(self.style.WARNING("Dry run, rolled back"))
+            return
+
+        for source, objs in imported:
+            invalidate(source.model, objs)
+        self.stdout.write(self.style.SUCCESS("Imported"))
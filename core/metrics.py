@@ -0,0 +1,304 @@
+import bisect
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+SIZE_BUCKETS = (100, 1000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# name: (help, buckets)
+HISTOGRAMS = {
+    "http_request_duration_seconds": (
+        "Time until the view returned its response",
+        DURATION_BUCKETS,
+    ),
+    "http_request_db_duration_seconds": (
+        "Time spent in database queries",
+        DURATION_BUCKETS,
+    ),
+    "http_request_serializer_duration_seconds": (
+        "Time spent in serializers of the view",
+        DURATION_BUCKETS,
+    ),
+    "http_response_size_bytes": (
+        "Size of response bodies, streaming ones excluded",
+        SIZE_BUCKETS,
+    ),
+}
+COUNTERS = {
+    "http_requests_total": "Requests by view, method and status",
+}
+
+SNAPSHOT_PATTERN = "metrics-*.json"
+
+
+def labels_key(labels):
+    return json.dumps(sorted(labels.items()))
+
+
+class Registry:
+    """Metrics of the process, written to METRICS_DIR so that the
+    metrics endpoint of any worker process reports all of them"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {name: {} for name in HISTOGRAMS}
+        self.counters = {name: {} for name in COUNTERS}
+        self.flushed_at = 0.0
+
+    def observe(self, name, labels, value):
+        buckets = HISTOGRAMS[name][1]
+        key = labels_key(labels)
+        with self.lock:
+            histogram = self.histograms[name].get(key)
+            if histogram is None:
+                histogram = self.histograms[name][key] = {
+                    "buckets": [0] * len(buckets),
+                    "sum": 0.0,
+                    "count": 0,
+                }
+            # counts per bucket, made cumulative when rendered
+            index = bisect.bisect_left(buckets, value)
+            if index < len(buckets):
+                histogram["buckets"][index] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def inc(self, name, labels, value=1):
+        key = labels_key(labels)
+        with self.lock:
+            counters = self.counters[name]
+            counters[key] = counters.get(key, 0) + value
+
+    def snapshot(self):
+        with self.lock:
+            return json.loads(
+                json.dumps(
+                    {"histograms": self.histograms, "counters": self.counters}
+                )
+            )
+
+    def flush(self, directory):
+        """Replace the snapshot file of the process"""
+        data = json.dumps(self.snapshot())
+        descriptor, path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(descriptor, "w") as file:
+            file.write(data)
+        os.replace(
+            path, os.path.join(directory, f"metrics-{os.getpid()}.json")
+        )
+        self.flushed_at = time.monotonic()
+
+    def flush_if_due(self, directory, interval):
+        if time.monotonic() - self.flushed_at >= interval:
+            self.flush(directory)
+
+
+registry = Registry()
+
+
+def merge(snapshots):
+    merged = {
+        "histograms": {name: {} for name in HISTOGRAMS},
+        "counters": {name: {} for name in COUNTERS},
+    }
+    for snapshot in snapshots:
+        for name, series in snapshot["histograms"].items():
+            for key, histogram in series.items():
+                total = merged["histograms"][name].setdefault(
+                    key,
+                    {
+                        "buckets": [0] * len(histogram["buckets"]),
+                        "sum": 0.0,
+                        "count": 0,
+                    },
+                )
+                total["buckets"] = [
+                    total_count + count
+                    for total_count, count in zip(
+                        total["buckets"], histogram["buckets"]
+                    )
+                ]
+                total["sum"] += histogram["sum"]
+                total["count"] += histogram["count"]
+        for name, series in snapshot["counters"].items():
+            for key, value in series.items():
+                counters = merged["counters"][name]
+                counters[key] = counters.get(key, 0) + value
+    return merged
+
+
+def collect():
+    """Return metrics of all worker processes with METRICS_DIR,
+    of this process otherwise"""
+    directory = settings.METRICS_DIR
+    if not directory:
+        return registry.snapshot()
+
+    registry.flush(directory)
+    snapshots = []
+    for path in glob.glob(os.path.join(directory, SNAPSHOT_PATTERN)):
+        try:
+            with open(path) as file:
+                snapshots.append(json.load(file))
+        except (OSError, ValueError):
+            # removed or being replaced meanwhile
+            continue
+    return merge(snapshots)
+
+
+def escape_label(value):
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def format_labels(pairs):
+    return ",".join(f'{name}="{escape_label(value)}"' for name, value in pairs)
+
+
+def render(snapshot):
+    """Render metrics in the Prometheus text exposition format"""
+    lines = []
+    for name, (help_text, buckets) in HISTOGRAMS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for key, histogram in sorted(snapshot["histograms"][name].items()):
+            pairs = json.loads(key)
+            cumulative = 0
+            for bound, count in zip(buckets, histogram["buckets"]):
+                cumulative += count
+                labels = format_labels(pairs + [("le", bound)])
+                lines.append(f"{name}_bucket{{{labels}}} {cumulative}")
+            labels = format_labels(pairs + [("le", "+Inf")])
+            lines.append(f"{name}_bucket{{{labels}}} {histogram['count']}")
+            labels = format_labels(pairs)
+            lines.append(f"{name}_sum{{{labels}}} {histogram['sum']}")
+            lines.append(f"{name}_count{{{labels}}} {histogram['count']}")
+
+    for name, help_text in COUNTERS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for key, value in sorted(snapshot["counters"][name].items()):
+            lines.append(f"{name}{{{format_labels(json.loads(key))}}} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+def get_view_name(view_func, method):
+    """Return the view and action serving the request,
+    ex. BookingViewSet.list"""
+    view_class = getattr(
+        view_func, "cls", getattr(view_func, "view_class", None)
+    )
+    if view_class is None:
+        return f"{view_func.__module__}.{view_func.__name__}"
+
+    actions = getattr(view_func, "actions", None)
+    if actions:
+        action = actions.get(method.lower(), method.lower())
+        return f"{view_class.__name__}.{action}"
+    return f"{view_class.__name__}.{method.lower()}"
+
+
+class MetricsMiddleware:
+    """Record latency, database time, serializer time and response size
+    of requests per view and action"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        request.metrics_view = "unmatched"
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        request.metrics_view = "unmatched"
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, response, time.perf_counter() - start)
+        return response
+
+    @staticmethod
+    def record(request, response, duration):
+        labels = {"view": request.metrics_view, "method": request.method}
+        registry.observe("http_request_duration_seconds", labels, duration)
+
+        recorder = getattr(request, "query_recorder", None)
+        if recorder is not None:
+            registry.observe(
+                "http_request_db_duration_seconds", labels, recorder.duration
+            )
+        if hasattr(request, "serializer_duration"):
+            registry.observe(
+                "http_request_serializer_duration_seconds",
+                labels,
+                request.serializer_duration,
+            )
+        if not response.streaming:
+            registry.observe(
+                "http_response_size_bytes", labels, len(response.content)
+            )
+        registry.inc(
+            "http_requests_total",
+            dict(labels, status=response.status_code),
+        )
+
+        if settings.METRICS_DIR:
+            registry.flush_if_due(
+                settings.METRICS_DIR, settings.METRICS_FLUSH_INTERVAL
+            )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.metrics_view = get_view_name(view_func, request.method)
+
+
+@contextmanager
+def serializer_timer(request):
+    """Add the time spent in the block to the serializer time
+    of the request"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        request.serializer_duration = getattr(
+            request, "serializer_duration", 0.0
+        ) + time.perf_counter() - start
+
+
+class SerializerTimingMixin:
+    """Add the time spent in serializers of the view to the metrics
+    of the request"""
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        request = self.request._request
+        to_representation = serializer.to_representation
+
+        def timed_to_representation(instance):
+            with serializer_timer(request):
+                return to_representation(instance)
+
+        serializer.to_representation = timed_to_representation
+        return serializer
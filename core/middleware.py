@@ -0,0 +1,167 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+SAVEPOINT_RE = re.compile(r"^\s*(RELEASE |ROLLBACK TO )?SAVEPOINT", re.I)
+PARAMS_RE = re.compile(r"%s(, %s)+")
+
+# recorder of the current request, concurrent async requests run their
+# queries in one shared thread, each with the context of its request
+current_recorder = ContextVar("current_recorder", default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_shape(sql):
+    """Return the SQL with lists of parameters collapsed, so that
+    queries differing only in the number of IN values match"""
+    return PARAMS_RE.sub("%s, ...", sql)
+
+
+class QueryRecorder:
+    """Database execute wrapper counting queries, their time and shapes"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.monotonic() - start
+            self.count += 1
+            if not SAVEPOINT_RE.match(sql):
+                self.shapes[query_shape(sql)] += 1
+
+    def repeated(self, limit):
+        return [
+            (shape, count)
+            for shape, count in self.shapes.most_common()
+            if count > limit
+        ]
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper of every connection, passing queries to the
+    recorder of the current request if there is one"""
+    recorder = current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """Receiver of connection_created, connections keep their wrappers
+    when they reconnect"""
+    if record_query not in connection.execute_wrappers:
+        # below wrappers of execute_wrapper(), which pop the last one
+        connection.execute_wrappers.insert(0, record_query)
+
+
+def get_query_budget(view_func, method):
+    """Return the query budget of the view, views may declare
+    query_budget as a number or as a dict by viewset action"""
+    view_class = getattr(
+        view_func, "cls", getattr(view_func, "view_class", None)
+    )
+    budget = getattr(view_class, "query_budget", None)
+    if isinstance(budget, dict):
+        actions = getattr(view_func, "actions", None) or {}
+        budget = budget.get(actions.get(method.lower()))
+    return settings.QUERY_BUDGET if budget is None else budget
+
+
+class QueryBudgetMiddleware:
+    """Record SQL queries of every request and report requests which
+    exceed their query budget or repeat a query more than
+    QUERY_REPEAT_LIMIT times, which is the sign of N+1 queries.
+
+    Reports are logged as warnings, or raised as QueryBudgetExceeded
+    with QUERY_BUDGET_STRICT (in tests). Queries of streaming responses
+    run after the middleware and are not recorded. The middleware serves
+    async views without a thread of its own under ASGI.
+
+    Queries are passed to the recorder of the request by record_query,
+    which CoreConfig installs on every connection.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        request.query_budget = settings.QUERY_BUDGET
+        recorder = request.query_recorder = QueryRecorder()
+        token = current_recorder.set(recorder)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_recorder.reset(token)
+
+        self.report(request, recorder)
+        return response
+
+    async def __acall__(self, request):
+        request.query_budget = settings.QUERY_BUDGET
+        recorder = request.query_recorder = QueryRecorder()
+        # the async ORM runs queries in the thread of sync_to_async,
+        # which copies the context
+        token = current_recorder.set(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_recorder.reset(token)
+
+        self.report(request, recorder)
+        return response
+
+    def report(self, request, recorder):
+        logger.debug(
+            "%s %s: %d queries in %.1f ms",
+            request.method,
+            request.path,
+            recorder.count,
+            recorder.duration * 1000,
+        )
+        self.check(request, recorder)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_query_budget(view_func, request.method)
+
+    @staticmethod
+    def check(request, recorder):
+        problems = []
+        if recorder.count > request.query_budget:
+            problems.append(
+                f"{recorder.count} queries exceed the budget "
+                f"of {request.query_budget}"
+            )
+        for shape, count in recorder.repeated(settings.QUERY_REPEAT_LIMIT):
+            problems.append(f"query repeated {count} times: {shape}")
+
+        if not problems:
+            return
+
+        message = f"{request.method} {request.path}: " + "; ".join(problems)
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -0,0 +1,30 @@
+# Generated by Django 4.1.7 on 2026-10-18 07:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="ThrottleCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=255, unique=True)),
+                ("window", models.BigIntegerField()),
+                ("previous", models.IntegerField(default=0)),
+                ("current", models.IntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -1,3 +1,25 @@
 from django.db import models
 
-# Create your models here.
+
+class ThrottleCounter(models.Model):
+    """Requests of a throttle key counted in the current fixed window
+    of its rate and in the previous one"""
+
+    key = models.CharField(max_length=255, unique=True)
+    window = models.BigIntegerField()
+    previous = models.IntegerField(default=0)
+    current = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.key} {self.window} ({self.previous}, {self.current})"
+
+
+class VersionStamp(models.Model):
+    """Version stamp of cached data, renewed when the data changes,
+    shared by the worker processes"""
+
+    key = models.CharField(max_length=255, unique=True)
+    stamp = models.CharField(max_length=32)
+
+    def __str__(self):
+        return f"{self.key} {self.stamp}"
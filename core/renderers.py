@@ -0,0 +1,52 @@
+from rest_framework.utils import encoders
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def orjson_default(obj):
+    """Encode what orjson does not, as the stdlib renderer does"""
+    return encoders.JSONEncoder().default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer producing the same JSON with orjson when installed
+
+    Datetimes are passed to the encoder of DRF, which formats them like
+    the stdlib renderer. Indented, ASCII only or non compact output and
+    data orjson cannot encode (ex. integers over 64 bits) are rendered
+    by JSONRenderer.
+    """
+
+    options = (
+        0 if orjson is None
+        else orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+            is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data, default=orjson_default, option=self.options
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # the JSON is a strict javascript subset, as with JSONRenderer
+        return ret.replace("\u2028".encode(), b"\\u2028").replace(
+            "\u2029".encode(), b"\\u2029"
+        )
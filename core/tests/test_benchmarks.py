@@ -0,0 +1,60 @@
+from django.test import TestCase
+
+from core import benchmarks
+from team_meeting.models import Booking
+
+
+class BenchmarkTests(TestCase):
+    def test_run(self):
+        results = benchmarks.run([20], repeat=1, scale=0.001)
+
+        names = [(result["name"], result["size"]) for result in results]
+        self.assertIn(("validate_time", None), names)
+        self.assertIn(("booking_create_serializer_create", None), names)
+        self.assertIn(("booking-list", 20), names)
+        self.assertIn(("async-meeting-room-list", 20), names)
+        queries = {result["name"]: result["queries"] for result in results}
+        # cached lists are queried with a cold cache only
+        self.assertGreater(
+            queries["meetingroom-list-cold"], queries["meetingroom-list"]
+        )
+        for result in results:
+            self.assertGreater(result["min"], 0)
+        # data of the benchmarks is rolled back
+        self.assertFalse(Booking.objects.exists())
+
+    def test_compare(self):
+        def result(name, seconds, queries):
+            return {
+                "name": name, "size": 10, "min": seconds, "queries": queries
+            }
+
+        baseline = {
+            "results": [
+                result("faster", 2.0, 1),
+                result("slower", 1.0, 1),
+                result("more-queries", 1.0, 1),
+            ]
+        }
+        comparison = benchmarks.compare(
+            [
+                result("faster", 1.0, 1),
+                result("slower", 1.5, 1),
+                result("more-queries", 1.0, 2),
+                result("new", 1.0, 1),
+            ],
+            baseline,
+            0.2,
+        )
+
+        self.assertEqual(
+            [
+                (new["name"], ratio, regressed)
+                for new, _, ratio, regressed in comparison
+            ],
+            [
+                ("faster", 0.5, False),
+                ("slower", 1.5, True),
+                ("more-queries", 1.0, True),
+            ],
+        )
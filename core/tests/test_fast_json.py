@@ -0,0 +1,61 @@
+import io
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+
+
+class FastJSONTests(SimpleTestCase):
+    data = {
+        "datetime": datetime(2023, 1, 2, 9, 30, 15, 123456, timezone.utc),
+        "naive": datetime(2023, 1, 2, 9, 30),
+        "date": date(2023, 1, 2),
+        "time": time(9, 30, 15, 500),
+        "duration": timedelta(hours=1),
+        "decimal": Decimal("10.50"),
+        "lazy": gettext_lazy("This field is required."),
+        "uuid": uuid.UUID(int=1),
+        "text": "Кімната\u20281",
+        1: [None, True, 1.5],
+    }
+
+    def render(self, renderer, accepted_media_type="application/json"):
+        return renderer.render(self.data, accepted_media_type)
+
+    def test_same_json_as_json_renderer(self):
+        for accepted_media_type in (
+            "application/json",
+            "application/json; indent=4",
+        ):
+            self.assertEqual(
+                self.render(FastJSONRenderer(), accepted_media_type),
+                self.render(JSONRenderer(), accepted_media_type),
+            )
+
+    def test_without_orjson(self):
+        with mock.patch("core.renderers.orjson", None):
+            content = self.render(FastJSONRenderer())
+        with mock.patch("core.parsers.orjson", None):
+            data = FastJSONParser().parse(io.BytesIO(content))
+
+        self.assertEqual(content, self.render(JSONRenderer()))
+        self.assertEqual(data["decimal"], 10.5)
+
+    def test_parse(self):
+        parser = FastJSONParser()
+
+        self.assertEqual(
+            parser.parse(io.BytesIO('{"name": "Кімната"}'.encode())),
+            {"name": "Кімната"},
+        )
+        for content in (b'{"name": ', b'{"value": NaN}'):
+            with self.assertRaises(ParseError):
+                parser.parse(io.BytesIO(content))
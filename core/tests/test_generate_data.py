@@ -0,0 +1,89 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from team_meeting.models import (
+    MeetingRoom,
+    Project,
+    Team,
+    TypeOfMeeting,
+    Meeting,
+    Booking,
+    RoomOccupancy,
+)
+
+
+class GenerateDataTests(TestCase):
+    def generate(self, *args):
+        call_command(
+            "generate_data",
+            "--rooms=3",
+            "--projects=2",
+            "--teams=3",
+            "--users=4",
+            "--meetings=2",
+            "--bookings=60",
+            "--days=14",
+            "--recurring=0.3",
+            "--batch-size=25",
+            *args,
+            stdout=io.StringIO(),
+        )
+
+    def test_bookings_do_not_overlap(self):
+        self.generate()
+
+        self.assertEqual(MeetingRoom.objects.count(), 3)
+        self.assertEqual(get_user_model().objects.count(), 4)
+        self.assertEqual(Booking.objects.count(), 60)
+        self.assertEqual(Meeting.objects.count(), 62)
+        self.assertTrue(Booking.objects.exclude(frequency="").exists())
+
+        masks = {}
+        for booking in Booking.objects.all():
+            for room_id, day, mask in booking.get_slots():
+                occupied = masks.get((room_id, day), 0)
+                self.assertFalse(occupied & mask)
+                masks[(room_id, day)] = occupied | mask
+        self.assertEqual(
+            {
+                (occupancy.room_id, occupancy.day): occupancy.mask
+                for occupancy in RoomOccupancy.objects.all()
+            },
+            masks,
+        )
+
+        # ids of generated meetings are taken by the sequence
+        Meeting.objects.create(
+            team=Team.objects.first(),
+            type_of_meeting=TypeOfMeeting.objects.first(),
+        )
+
+    def test_same_seed_same_dataset(self):
+        def dataset(seed):
+            self.generate(f"--seed={seed}")
+            return list(
+                Booking.objects.filter(
+                    room__name__startswith=f"Room {seed}-"
+                ).values_list(
+                    "room__name",
+                    "day",
+                    "start_hour",
+                    "end_hour",
+                    "user__email",
+                    "repeat_count",
+                )
+            )
+
+        first = dataset(1)
+        Booking.objects.all().delete()
+        MeetingRoom.objects.all().delete()
+        Project.objects.all().delete()
+        get_user_model().objects.all().delete()
+
+        self.assertEqual(dataset(1), first)
+        self.assertNotEqual(
+            [row[1:4] for row in dataset(2)], [row[1:4] for row in first]
+        )
@@ -0,0 +1,138 @@
+import io
+import json
+import os
+import tempfile
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from team_meeting.models import (
+    MeetingRoom,
+    Team,
+    Meeting,
+    Booking,
+    RoomOccupancy,
+)
+
+
+class ImportDataTests(TestCase):
+    files = {
+        "meeting_rooms.csv": (
+            "name,capacity,has_projector,is_soundproof\n"
+            "Blue,4,yes,no\n"
+            "Green,8,false,true\n"
+        ),
+        "projects.json": [{"name": "Rooms", "description": "Booking"}],
+        "types_of_meeting.csv": "name\nDaily\n",
+        "teams.csv": "name,project,num_of_members\nCore,Rooms,3\n",
+        "users.csv": (
+            "email,first_name,last_name,is_staff,password,team,project\n"
+            "ann@test.com,Ann,Lee,true,testpass,Core,Rooms\n"
+            "bob@test.com,Bob,,,,,\n"
+        ),
+        "bookings.csv": (
+            "room,day,start_hour,end_hour,user,team,project,"
+            "type_of_meeting,frequency,repeat_count\n"
+            "Blue,2023-01-02,9,11,ann@test.com,Core,Rooms,Daily,,\n"
+            "Blue,2023-01-02,11,12,bob@test.com,Core,Rooms,Daily,,\n"
+            "Green,2023-01-02,9,10,ann@test.com,Core,Rooms,Daily,DAILY,3\n"
+        ),
+    }
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, files):
+        paths = []
+        for name, content in files.items():
+            path = os.path.join(self.directory, name)
+            with open(path, "w") as file:
+                if isinstance(content, str):
+                    file.write(content)
+                else:
+                    json.dump(content, file)
+            paths.append(path)
+        return paths
+
+    def import_data(self, files, *args):
+        out, err = io.StringIO(), io.StringIO()
+        call_command(
+            "import_data", *self.write(files), *args, stdout=out, stderr=err
+        )
+        return out.getvalue()
+
+    def test_import(self):
+        out = self.import_data(self.files, "--batch-size", "2")
+
+        self.assertIn("bookings: 3", out)
+        blue = MeetingRoom.objects.get(name="Blue")
+        self.assertTrue(blue.has_projector)
+        self.assertFalse(blue.is_soundproof)
+        ann = get_user_model().objects.get(email="ann@test.com")
+        self.assertEqual(ann.team.name, "Core")
+        self.assertTrue(ann.is_staff)
+        self.assertTrue(ann.check_password("testpass"))
+        bob = get_user_model().objects.get(email="bob@test.com")
+        self.assertIsNone(bob.team)
+        self.assertFalse(bob.has_usable_password())
+
+        self.assertEqual(Booking.objects.count(), 3)
+        self.assertEqual(Meeting.objects.count(), 3)
+        self.assertEqual(
+            RoomOccupancy.objects.get(room=blue, day=date(2023, 1, 2)).mask,
+            0b111 << 9,
+        )
+        self.assertEqual(
+            RoomOccupancy.objects.filter(room__name="Green").count(), 3
+        )
+
+    def test_overlapping_bookings(self):
+        self.import_data(
+            {name: content for name, content in self.files.items()
+             if name != "bookings.csv"}
+        )
+        files = {
+            "bookings.csv": (
+                "room,day,start_hour,end_hour,user,team,project,"
+                "type_of_meeting\n"
+                "Blue,2023-01-02,9,11,ann@test.com,Core,Rooms,Daily\n"
+                "Blue,2023-01-02,10,12,bob@test.com,Core,Rooms,Daily\n"
+            )
+        }
+
+        with self.assertRaises(CommandError):
+            self.import_data(files)
+
+        self.assertFalse(Booking.objects.exists())
+        self.assertFalse(
+            RoomOccupancy.objects.filter(mask__gt=0).exists()
+        )
+
+    def test_errors_are_reported_by_line(self):
+        files = {
+            "teams.csv": (
+                "name,project,num_of_members\n"
+                "Core,Unknown,3\n"
+                "QA,,three\n"
+            ),
+        }
+        err = io.StringIO()
+
+        with self.assertRaisesMessage(CommandError, "2 errors"):
+            call_command("import_data", *self.write(files), stderr=err)
+
+        errors = err.getvalue()
+        self.assertIn("teams.csv:2: project: Unknown does not exist.", errors)
+        self.assertIn("teams.csv:3:", errors)
+        self.assertFalse(Team.objects.exists())
+
+    def test_dry_run(self):
+        out = self.import_data(self.files, "--dry-run")
+
+        self.assertIn("bookings: 3", out)
+        self.assertFalse(MeetingRoom.objects.exists())
+        self.assertFalse(Booking.objects.exists())
@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.metrics import Registry, collect, registry, render
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpassword",
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_metrics_of_view_action(self):
+        self.client.get(reverse("team-meeting:booking-list"))
+
+        res = self.client.get(reverse("metrics"))
+        content = res.content.decode()
+
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res["Content-Type"].startswith("text/plain"))
+        for name in (
+            "http_request_duration_seconds_count",
+            "http_request_db_duration_seconds_count",
+            "http_request_serializer_duration_seconds_count",
+            "http_response_size_bytes_count",
+        ):
+            self.assertIn(
+                f'{name}{{method="GET",view="BookingViewSet.list"}}', content
+            )
+        self.assertIn(
+            'http_requests_total{method="GET",status="200",'
+            'view="BookingViewSet.list"}',
+            content,
+        )
+
+    def test_render_histogram(self):
+        metrics = Registry()
+        labels = {"view": "View.get", "method": "GET"}
+        metrics.observe("http_request_duration_seconds", labels, 0.02)
+        metrics.observe("http_request_duration_seconds", labels, 20)
+
+        content = render(metrics.snapshot())
+
+        self.assertIn(
+            'http_request_duration_seconds_bucket{method="GET",'
+            'view="View.get",le="0.01"} 0',
+            content,
+        )
+        self.assertIn(
+            'http_request_duration_seconds_bucket{method="GET",'
+            'view="View.get",le="0.025"} 1',
+            content,
+        )
+        self.assertIn(
+            'http_request_duration_seconds_bucket{method="GET",'
+            'view="View.get",le="+Inf"} 2',
+            content,
+        )
+
+    def test_metrics_of_worker_processes_are_merged(self):
+        labels = {"view": "Other.get", "method": "GET"}
+        other = Registry()
+        other.inc("http_requests_total", labels, 2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "metrics-0.json"), "w") as file:
+                json.dump(other.snapshot(), file)
+            registry.inc("http_requests_total", labels, 3)
+
+            with override_settings(METRICS_DIR=directory):
+                snapshot = collect()
+
+        self.assertEqual(
+            snapshot["counters"]["http_requests_total"][
+                json.dumps(sorted(labels.items()))
+            ],
+            registry.snapshot()["counters"]["http_requests_total"][
+                json.dumps(sorted(labels.items()))
+            ] + 2,
+        )
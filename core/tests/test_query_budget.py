@@ -0,0 +1,464 @@
+import tempfile
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from django.urls import URLResolver, reverse
+from PIL import Image
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.middleware import (
+    QueryBudgetExceeded,
+    QueryBudgetMiddleware,
+    QueryRecorder,
+    query_shape,
+)
+from team_meeting import feeds
+from team_meeting import urls as team_meeting_urls
+from team_meeting.cache import get_reference_cache
+from team_meeting.models import (
+    MeetingRoom,
+    Project,
+    Team,
+    TypeOfMeeting,
+    Meeting,
+    Booking,
+)
+from user import urls as user_urls
+
+# more rows than QUERY_REPEAT_LIMIT, so that N+1 queries are reported
+ROWS = 6
+DAY = date.today() + timedelta(days=1)
+HTTP_METHODS = ("get", "post", "put", "patch", "delete")
+
+
+def get_routes(urlconf):
+    """Return (namespaced name, method) of every route of the urlconf"""
+
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns)
+            else:
+                yield pattern
+
+    routes = set()
+    for pattern in walk(urlconf.urlpatterns):
+        view = pattern.callback
+        actions = getattr(view, "actions", None)
+        if actions:
+            methods = actions
+        else:
+            view_class = getattr(view, "cls", getattr(view, "view_class"))
+            methods = [
+                method for method in HTTP_METHODS
+                if hasattr(view_class, method)
+            ]
+        # HEAD is served by GET
+        for method in set(methods) & set(HTTP_METHODS):
+            routes.add((f"{urlconf.app_name}:{pattern.name}", method))
+    return routes
+
+
+def image_file():
+    ntf = tempfile.NamedTemporaryFile(suffix=".jpg")
+    Image.new("RGB", (10, 10)).save(ntf, format="JPEG")
+    ntf.seek(0)
+    return ntf
+
+
+def booking_payload(test, day=DAY):
+    return {
+        "room": test.room.id,
+        "day": day,
+        "start_hour": 16,
+        "end_hour": 17,
+        "meeting": {
+            "team": test.team.id,
+            "type_of_meeting": test.type_of_meeting.id,
+        },
+    }
+
+
+# route: function of the test returning URL and request data
+ROUTE_CASES = {
+    ("team-meeting:api-root", "get"): lambda t: (
+        reverse("team-meeting:api-root"), None
+    ),
+    ("team-meeting:meetingroom-list", "get"): lambda t: (
+        reverse("team-meeting:meetingroom-list"), None
+    ),
+    ("team-meeting:meetingroom-list", "post"): lambda t: (
+        reverse("team-meeting:meetingroom-list"),
+        {"name": "Yellow", "capacity": 4},
+    ),
+    ("team-meeting:meetingroom-find", "get"): lambda t: (
+        reverse("team-meeting:meetingroom-find"),
+        {"day": DAY, "start_hour": 9, "end_hour": 10, "headcount": 2},
+    ),
+    ("team-meeting:meetingroom-rooms-availability", "get"): lambda t: (
+        reverse("team-meeting:meetingroom-rooms-availability"),
+        {"from": DAY, "to": DAY + timedelta(days=6)},
+    ),
+    ("team-meeting:meetingroom-availability", "get"): lambda t: (
+        reverse("team-meeting:meetingroom-availability", args=[t.room.id]),
+        None,
+    ),
+    ("team-meeting:meetingroom-calendar", "get"): lambda t: (
+        reverse("team-meeting:meetingroom-calendar", args=[t.room.id]),
+        None,
+    ),
+    ("team-meeting:project-list", "get"): lambda t: (
+        reverse("team-meeting:project-list"), None
+    ),
+    ("team-meeting:project-list", "post"): lambda t: (
+        reverse("team-meeting:project-list"), {"name": "Library"}
+    ),
+    ("team-meeting:project-detail", "get"): lambda t: (
+        reverse("team-meeting:project-detail", args=[t.project.id]), None
+    ),
+    ("team-meeting:project-upload-image", "post"): lambda t: (
+        reverse("team-meeting:project-upload-image", args=[t.project.id]),
+        {"image": image_file()},
+    ),
+    ("team-meeting:typeofmeeting-list", "get"): lambda t: (
+        reverse("team-meeting:typeofmeeting-list"), None
+    ),
+    ("team-meeting:typeofmeeting-list", "post"): lambda t: (
+        reverse("team-meeting:typeofmeeting-list"), {"name": "Retro"}
+    ),
+    ("team-meeting:team-list", "get"): lambda t: (
+        reverse("team-meeting:team-list"), None
+    ),
+    ("team-meeting:team-list", "post"): lambda t: (
+        reverse("team-meeting:team-list"),
+        {"name": "QA", "project": t.project.id, "num_of_members": 3},
+    ),
+    ("team-meeting:team-detail", "get"): lambda t: (
+        reverse("team-meeting:team-detail", args=[t.team.id]), None
+    ),
+    ("team-meeting:team-calendar", "get"): lambda t: (
+        reverse("team-meeting:team-calendar", args=[t.team.id]), None
+    ),
+    ("team-meeting:meeting-list", "get"): lambda t: (
+        reverse("team-meeting:meeting-list"), None
+    ),
+    ("team-meeting:meeting-list", "post"): lambda t: (
+        reverse("team-meeting:meeting-list"),
+        {"team": t.team.id, "type_of_meeting": t.type_of_meeting.id},
+    ),
+    ("team-meeting:meeting-detail", "get"): lambda t: (
+        reverse("team-meeting:meeting-detail", args=[t.meeting.id]), None
+    ),
+    ("team-meeting:meeting-detail", "put"): lambda t: (
+        reverse("team-meeting:meeting-detail", args=[t.meeting.id]),
+        {
+            "team": t.team.id,
+            "type_of_meeting": t.type_of_meeting.id,
+            "requires_meeting_room": True,
+        },
+    ),
+    ("team-meeting:meeting-detail", "patch"): lambda t: (
+        reverse("team-meeting:meeting-detail", args=[t.meeting.id]),
+        {"requires_meeting_room": False},
+    ),
+    ("team-meeting:meeting-detail", "delete"): lambda t: (
+        reverse("team-meeting:meeting-detail", args=[t.meeting.id]), None
+    ),
+    ("team-meeting:booking-list", "get"): lambda t: (
+        reverse("team-meeting:booking-list"), None
+    ),
+    ("team-meeting:booking-list", "post"): lambda t: (
+        reverse("team-meeting:booking-list"), booking_payload(t)
+    ),
+    ("team-meeting:booking-bulk-create", "post"): lambda t: (
+        reverse("team-meeting:booking-bulk-create"),
+        {
+            "bookings": [
+                booking_payload(t, DAY + timedelta(days=offset))
+                for offset in range(ROWS)
+            ]
+        },
+    ),
+    ("team-meeting:booking-calendar", "get"): lambda t: (
+        reverse("team-meeting:booking-calendar"), None
+    ),
+    ("team-meeting:booking-export", "get"): lambda t: (
+        reverse("team-meeting:booking-export"), None
+    ),
+    ("team-meeting:booking-detail", "get"): lambda t: (
+        reverse("team-meeting:booking-detail", args=[t.booking.id]), None
+    ),
+    ("team-meeting:booking-detail", "put"): lambda t: (
+        reverse("team-meeting:booking-detail", args=[t.booking.id]),
+        {
+            "room": t.room.id,
+            "day": DAY,
+            "start_hour": 17,
+            "end_hour": 18,
+        },
+    ),
+    ("team-meeting:booking-detail", "patch"): lambda t: (
+        reverse("team-meeting:booking-detail", args=[t.booking.id]),
+        {"end_hour": 12},
+    ),
+    ("team-meeting:booking-detail", "delete"): lambda t: (
+        reverse("team-meeting:booking-detail", args=[t.booking.id]), None
+    ),
+    ("team-meeting:booking-exceptions", "post"): lambda t: (
+        reverse("team-meeting:booking-exceptions", args=[t.recurring.id]),
+        {"original_day": DAY + timedelta(days=1), "is_cancelled": True},
+    ),
+    ("team-meeting:booking-occurrences", "get"): lambda t: (
+        reverse("team-meeting:booking-occurrences", args=[t.recurring.id]),
+        None,
+    ),
+    ("team-meeting:calendar-feed", "get"): lambda t: (
+        reverse(
+            "team-meeting:calendar-feed",
+            args=[feeds.feed_token(feeds.USER, t.user.id)],
+        ),
+        None,
+    ),
+    ("team-meeting:async-booking-list", "get"): lambda t: (
+        reverse("team-meeting:async-booking-list"),
+        None,
+    ),
+    ("team-meeting:async-meeting-room-list", "get"): lambda t: (
+        reverse("team-meeting:async-meeting-room-list"),
+        None,
+    ),
+    ("team-meeting:async-meeting-room-availability", "get"): lambda t: (
+        reverse("team-meeting:async-meeting-room-availability"),
+        {"from": DAY, "to": DAY + timedelta(days=6)},
+    ),
+    (
+        "team-meeting:async-meeting-room-detail-availability", "get"
+    ): lambda t: (
+        reverse(
+            "team-meeting:async-meeting-room-detail-availability",
+            args=[t.room.id],
+        ),
+        {"from": DAY, "to": DAY + timedelta(days=6)},
+    ),
+    ("user:create", "post"): lambda t: (
+        reverse("user:create"),
+        {"email": "new@test.com", "password": "testpassword"},
+    ),
+    ("user:token_obtain_pair", "post"): lambda t: (
+        reverse("user:token_obtain_pair"),
+        {"email": "test@test.com", "password": "testpassword"},
+    ),
+    ("user:token_refresh", "post"): lambda t: (
+        reverse("user:token_refresh"),
+        {"refresh": str(RefreshToken.for_user(t.user))},
+    ),
+    ("user:token_verify", "post"): lambda t: (
+        reverse("user:token_verify"),
+        {"token": str(RefreshToken.for_user(t.user).access_token)},
+    ),
+    ("user:manage", "get"): lambda t: (reverse("user:manage"), None),
+    ("user:manage", "put"): lambda t: (
+        reverse("user:manage"),
+        {"email": "test@test.com", "password": "newpassword"},
+    ),
+    ("user:manage", "patch"): lambda t: (
+        reverse("user:manage"), {"password": "newpassword"}
+    ),
+}
+
+
+# route: function of the test returning URL and data of a request
+# rejected with 400, conflicting bookings are found by the database
+FAILURE_CASES = {
+    ("team-meeting:booking-list", "post"): lambda t: (
+        reverse("team-meeting:booking-list"),
+        dict(booking_payload(t), start_hour=t.booking.start_hour),
+    ),
+    ("team-meeting:booking-bulk-create", "post"): lambda t: (
+        reverse("team-meeting:booking-bulk-create"),
+        {
+            "bookings": [
+                dict(
+                    booking_payload(t, DAY + timedelta(days=offset)),
+                    start_hour=t.booking.start_hour,
+                )
+                for offset in range(ROWS)
+            ],
+            "all_or_nothing": True,
+        },
+    ),
+    ("team-meeting:booking-detail", "put"): lambda t: (
+        reverse("team-meeting:booking-detail", args=[t.booking.id]),
+        {
+            "room": t.room.id,
+            "day": DAY,
+            "start_hour": t.recurring.start_hour,
+            "end_hour": t.recurring.end_hour,
+        },
+    ),
+    ("team-meeting:booking-exceptions", "post"): lambda t: (
+        reverse("team-meeting:booking-exceptions", args=[t.recurring.id]),
+        {
+            "original_day": DAY,
+            "start_hour": t.booking.start_hour,
+            "end_hour": t.booking.end_hour,
+        },
+    ),
+}
+
+
+class QueryRecorderTests(SimpleTestCase):
+    def test_query_shape(self):
+        self.assertEqual(
+            query_shape("SELECT 1 WHERE id IN (%s, %s, %s) AND x = %s"),
+            "SELECT 1 WHERE id IN (%s, ...) AND x = %s",
+        )
+
+    def test_repeated_queries(self):
+        recorder = QueryRecorder()
+
+        def execute(sql, params, many, context):
+            return None
+
+        for sql in ["SELECT %s"] * 3 + ["SAVEPOINT s1"] * 3:
+            recorder(execute, sql, None, False, {})
+
+        self.assertEqual(recorder.count, 6)
+        self.assertEqual(recorder.repeated(2), [("SELECT %s", 3)])
+
+    @override_settings(
+        QUERY_BUDGET=1, QUERY_REPEAT_LIMIT=5, QUERY_BUDGET_STRICT=True
+    )
+    def test_exceeded_budget(self):
+        request = RequestFactory().get("/")
+        request.query_budget = 1
+        recorder = QueryRecorder()
+        recorder.count = 2
+
+        with self.assertRaisesMessage(
+            QueryBudgetExceeded, "2 queries exceed the budget of 1"
+        ):
+            QueryBudgetMiddleware.check(request, recorder)
+
+    @override_settings(
+        QUERY_BUDGET=1, QUERY_REPEAT_LIMIT=5, QUERY_BUDGET_STRICT=False
+    )
+    def test_exceeded_budget_is_logged(self):
+        request = RequestFactory().get("/")
+        request.query_budget = 1
+        recorder = QueryRecorder()
+        recorder.count = 2
+
+        with self.assertLogs("core.middleware", "WARNING"):
+            QueryBudgetMiddleware.check(request, recorder)
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class RouteQueryBudgetTests(TestCase):
+    """Every route is requested with more rows than QUERY_REPEAT_LIMIT,
+    the middleware fails the request when its budget is exceeded"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            "test@test.com",
+            "testpassword",
+        )
+        self.client.force_authenticate(self.user)
+        # async views authenticate the JWT themselves
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer "
+            f"{RefreshToken.for_user(self.user).access_token}"
+        )
+
+        self.type_of_meeting = TypeOfMeeting.objects.create(name="Weekly")
+        for index in range(ROWS):
+            self.room = MeetingRoom.objects.create(
+                name=f"Room {index}", capacity=10
+            )
+            self.project = Project.objects.create(name=f"Project {index}")
+            for team_index in range(2):
+                self.team = Team.objects.create(
+                    name=f"Team {index}.{team_index}",
+                    project=self.project,
+                    num_of_members=5,
+                )
+            self.meeting = Meeting.objects.create(
+                team=self.team, type_of_meeting=self.type_of_meeting
+            )
+            self.booking = Booking.objects.create(
+                room=self.room,
+                day=DAY,
+                start_hour=index,
+                end_hour=index + 1,
+                user=self.user,
+                meeting=self.meeting,
+            )
+        self.user.team = self.team
+        self.user.save()
+
+        # throttle counters of the user exist unless it is new, requests
+        # of the routes are rolled back
+        self.client.get(reverse("team-meeting:meetingroom-list"))
+        self.client.get(reverse("team-meeting:booking-list"))
+        self.client.post(reverse("team-meeting:booking-list"))
+
+        self.recurring = Booking.objects.create(
+            room=self.room,
+            day=DAY,
+            start_hour=12,
+            end_hour=13,
+            user=self.user,
+            meeting=Meeting.objects.create(
+                team=self.team, type_of_meeting=self.type_of_meeting
+            ),
+            frequency=Booking.DAILY,
+            repeat_count=ROWS * 2,
+        )
+        for offset in range(2, ROWS + 2):
+            self.recurring.add_exception(
+                DAY + timedelta(days=offset), is_cancelled=True
+            )
+
+    def test_every_route_has_a_case(self):
+        routes = get_routes(team_meeting_urls) | get_routes(user_urls)
+
+        self.assertEqual(routes - set(ROUTE_CASES), set())
+
+    def request(self, name, method, url, data):
+        get_reference_cache().clear()
+        with transaction.atomic():
+            if method == "get":
+                res = self.client.get(url, data)
+            elif name == "team-meeting:project-upload-image":
+                res = self.client.post(url, data, format="multipart")
+            else:
+                res = getattr(self.client, method)(url, data, format="json")
+            if res.streaming:
+                b"".join(res.streaming_content)
+            transaction.set_rollback(True)
+        return res
+
+    def test_routes_stay_within_query_budget(self):
+        for (name, method), case in ROUTE_CASES.items():
+            url, data = case(self)
+            with self.subTest(route=name, method=method):
+                res = self.request(name, method, url, data)
+
+                self.assertLess(res.status_code, 400)
+
+    def test_failing_requests_stay_within_query_budget(self):
+        for (name, method), case in FAILURE_CASES.items():
+            url, data = case(self)
+            with self.subTest(route=name, method=method):
+                res = self.request(name, method, url, data)
+
+                self.assertEqual(res.status_code, 400)
@@ -0,0 +1,129 @@
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+from django.db import connection
+from django.test import (
+    TestCase,
+    TransactionTestCase,
+    skipUnlessDBFeature,
+)
+
+from core.models import ThrottleCounter
+from core.throttling import ReadWriteRateThrottle, UserRateThrottle
+
+
+class ThrottleTests(TestCase):
+    def setUp(self):
+        self.now = 1_000_000 * 60
+
+    def request(self, method="GET", pk=1):
+        user = SimpleNamespace(pk=pk, is_authenticated=True)
+        return SimpleNamespace(user=user, method=method)
+
+    def allow(self, throttle_class, request, view=None):
+        throttle = throttle_class()
+        throttle.timer = lambda: self.now
+        return throttle.allow_request(request, view), throttle
+
+    def test_sliding_window(self):
+        class Throttle(UserRateThrottle):
+            rate = "4/min"
+
+        request = self.request()
+        for _ in range(4):
+            self.assertTrue(self.allow(Throttle, request)[0])
+        allowed, throttle = self.allow(Throttle, request)
+        self.assertFalse(allowed)
+        self.assertEqual(throttle.wait(), 60)
+        self.assertTrue(self.allow(Throttle, self.request(pk=2))[0])
+
+        # two thirds of the previous window are inside the sliding one
+        self.now += 80
+        self.assertTrue(self.allow(Throttle, request)[0])
+        self.assertTrue(self.allow(Throttle, request)[0])
+        allowed, throttle = self.allow(Throttle, request)
+        self.assertFalse(allowed)
+        self.assertEqual(throttle.wait(), 10)
+
+        self.now += 11
+        self.assertTrue(self.allow(Throttle, request)[0])
+
+        # no request in the previous window
+        self.now += 120
+        for _ in range(4):
+            self.assertTrue(self.allow(Throttle, request)[0])
+        self.assertFalse(self.allow(Throttle, request)[0])
+
+    def test_allowed_request_updates_counter(self):
+        class Throttle(UserRateThrottle):
+            rate = "4/min"
+
+        request = self.request()
+        self.allow(Throttle, request)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(self.allow(Throttle, request)[0])
+        self.assertEqual(ThrottleCounter.objects.get().current, 2)
+
+    def test_user_rate_leaves_scoped_views_to_their_rates(self):
+        class Throttle(UserRateThrottle):
+            rate = "1/min"
+
+        view = SimpleNamespace(throttle_scope="test")
+        for _ in range(3):
+            self.assertTrue(self.allow(Throttle, self.request(), view)[0])
+        self.assertFalse(ThrottleCounter.objects.exists())
+
+    @mock.patch.dict(
+        ReadWriteRateThrottle.THROTTLE_RATES,
+        {"test_read": "2/hour", "test_write": "1/hour"},
+    )
+    def test_read_and_write_rates(self):
+        view = SimpleNamespace(throttle_scope="test")
+
+        self.assertTrue(self.allow(ReadWriteRateThrottle, self.request())[0])
+        for method, allowed in (
+            ("GET", True),
+            ("POST", True),
+            ("GET", True),
+            ("PATCH", False),
+            ("GET", False),
+        ):
+            self.assertEqual(
+                self.allow(
+                    ReadWriteRateThrottle, self.request(method), view
+                )[0],
+                allowed,
+            )
+
+
+@skipUnlessDBFeature("has_select_for_update")
+class ConcurrentThrottleTests(TransactionTestCase):
+    def test_concurrent_requests_are_all_counted(self):
+        class Throttle(UserRateThrottle):
+            rate = "15/min"
+
+            def timer(self):
+                return 1_000_000 * 60
+
+        request = SimpleNamespace(
+            user=SimpleNamespace(pk=1, is_authenticated=True), method="GET"
+        )
+        results = []
+
+        def send_requests():
+            try:
+                for _ in range(5):
+                    results.append(Throttle().allow_request(request, None))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=send_requests) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count(True), 15)
+        self.assertEqual(ThrottleCounter.objects.get().current, 15)
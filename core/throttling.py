@@ -0,0 +1,168 @@
+from django.db.models import Case, F, FloatField, Q, Value, When
+from rest_framework import throttling
+from rest_framework.permissions import SAFE_METHODS
+
+from core.models import ThrottleCounter
+
+
+class SlidingWindowRateThrottle(throttling.SimpleRateThrottle):
+    """Rate throttle counting requests in the database, shared by
+    the worker processes
+
+    Requests are counted per fixed window of the rate duration, the rate
+    applies to the count of the current window plus the share of the
+    previous window still inside the sliding one. A key has one counter
+    row holding both counts, an allowed request costs one conditional
+    update of it whatever the rate, which also moves the counts to a new
+    window: the row lock serializes concurrent requests of the key and
+    the condition is checked under it.
+    """
+
+    def allow_request(self, request, view):
+        counters = self.get_counters(request, view)
+        if counters is None:
+            return True
+
+        while True:
+            queryset, values = self.increment(counters)
+            if queryset.update(**values):
+                return True
+
+            counter = counters.first()
+            if counter is None:
+                ThrottleCounter.objects.bulk_create(
+                    [ThrottleCounter(key=self.key, window=self.window)],
+                    ignore_conflicts=True,
+                )
+            elif not self.retry(counter):
+                return False
+
+    async def aallow_request(self, request, view):
+        """allow_request() with the queries of the async ORM"""
+        counters = self.get_counters(request, view)
+        if counters is None:
+            return True
+
+        while True:
+            queryset, values = self.increment(counters)
+            if await queryset.aupdate(**values):
+                return True
+
+            counter = await counters.afirst()
+            if counter is None:
+                await ThrottleCounter.objects.abulk_create(
+                    [ThrottleCounter(key=self.key, window=self.window)],
+                    ignore_conflicts=True,
+                )
+            elif not self.retry(counter):
+                return False
+
+    def get_counters(self, request, view):
+        """Return the counter queryset of the request, None if the request
+        is not throttled"""
+        if self.rate is None:
+            return None
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return None
+
+        window, self.elapsed = divmod(self.timer(), self.duration)
+        self.window = int(window)
+        return ThrottleCounter.objects.filter(key=self.key)
+
+    def increment(self, counters):
+        """Return the counter queryset and the values of the update
+        counting a request, which updates nothing if the rate is reached"""
+        window = self.window
+        share = (self.duration - self.elapsed) / self.duration
+        current = Q(window=window)
+        previous = Q(window=window - 1)
+        queryset = counters.filter(window__lte=window).alias(
+            estimate=Case(
+                When(current, then=F("previous") * share + F("current")),
+                When(previous, then=F("current") * share),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        ).filter(estimate__lt=self.num_requests)
+        return queryset, {
+            "window": window,
+            "previous": Case(
+                When(current, then=F("previous")),
+                When(previous, then=F("current")),
+                default=0,
+            ),
+            "current": Case(When(current, then=F("current") + 1), default=1),
+        }
+
+    def retry(self, counter):
+        """Return if the request should be counted again after the counter
+        was not updated, or keep the counts of the reached rate"""
+        if counter.window > self.window:
+            # the clock of another worker is ahead
+            self.window = counter.window
+            return True
+
+        if counter.window == self.window:
+            self.previous = counter.previous
+            self.current = counter.current
+        else:
+            # the previous window alone reaches the rate
+            self.previous = counter.current
+            self.current = 0
+        return False
+
+    def wait(self):
+        remaining = self.duration - self.elapsed
+        if self.current < self.num_requests:
+            # until enough of the previous window slides out
+            return max(
+                remaining
+                - (self.num_requests - self.current)
+                * self.duration
+                / self.previous,
+                0,
+            )
+        # until enough of the current window slides out in the next one
+        return remaining + self.duration * (
+            1 - self.num_requests / self.current
+        )
+
+
+class UserRateThrottle(SlidingWindowRateThrottle, throttling.UserRateThrottle):
+    """Throttle requests per user, per IP address if anonymous
+
+    Views declaring throttle_scope are limited by the rates of their
+    scope instead, so that polling them is not cut off by the user rate.
+    """
+
+    def get_counters(self, request, view):
+        if getattr(view, "throttle_scope", None) is not None:
+            return None
+        return super().get_counters(request, view)
+
+
+class ReadWriteRateThrottle(
+    SlidingWindowRateThrottle, throttling.UserRateThrottle
+):
+    """Throttle requests per user to views declaring throttle_scope
+
+    Reads are limited by the <throttle_scope>_read rate and writes by
+    the <throttle_scope>_write rate, each counted on their own.
+    """
+
+    def __init__(self):
+        # the rate depends on the view and the method
+        pass
+
+    def get_counters(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        if scope is None:
+            return None
+
+        kind = "read" if request.method in SAFE_METHODS else "write"
+        self.scope = f"{scope}_{kind}"
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().get_counters(request, view)
@@ -1,3 +1,28 @@
-from django.shortcuts import render
+import os
 
-# Create your views here.
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
+from django.views.static import serve
+
+from core.metrics import collect, render
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def metrics(request):
+    """Metrics of requests in the Prometheus text format"""
+    return HttpResponse(
+        render(collect()), content_type="text/plain; version=0.0.4"
+    )
+
+
+def media(request, path, document_root=None):
+    """Serve media files in development, those of IMMUTABLE_MEDIA_DIRS
+    are named by their content and cached for good"""
+    response = serve(request, path, document_root)
+    if os.path.dirname(path) + "/" in settings.IMMUTABLE_MEDIA_DIRS:
+        patch_cache_control(
+            response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True
+        )
+    return response
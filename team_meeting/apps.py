@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TeamMeetingConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "team_meeting"
+
+    def ready(self):
+        import team_meeting.signals  # noqa
@@ -0,0 +1,255 @@
+import hashlib
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import quote_etag
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.models import VersionStamp
+
+REFERENCE_DATA_CACHE = "reference_data"
+
+
+class ExpiredKeys(threading.local):
+    def __init__(self):
+        self.keys = set()
+
+
+# keys expired by the transactions of this thread, not yet stored
+expired = ExpiredKeys()
+
+
+def get_reference_cache():
+    return caches[REFERENCE_DATA_CACHE]
+
+
+def version_key(model):
+    return f"version:{model._meta.label_lower}"
+
+
+def new_stamp():
+    return uuid.uuid4().hex
+
+
+def store_stamps(keys):
+    """Return stored version stamps of keys, storing new ones
+    for missing keys"""
+    stamps = dict(
+        VersionStamp.objects.filter(key__in=keys).values_list("key", "stamp")
+    )
+    missing = [key for key in keys if key not in stamps]
+    if missing:
+        VersionStamp.objects.bulk_create(
+            [VersionStamp(key=key, stamp=new_stamp()) for key in missing],
+            ignore_conflicts=True,
+        )
+        # another process may have stored them meanwhile
+        stamps.update(
+            VersionStamp.objects.filter(key__in=missing).values_list(
+                "key", "stamp"
+            )
+        )
+    return stamps
+
+
+async def astore_stamps(keys):
+    """store_stamps() with the queries of the async ORM"""
+    stamps = {
+        key: stamp
+        async for key, stamp in VersionStamp.objects.filter(
+            key__in=keys
+        ).values_list("key", "stamp")
+    }
+    missing = [key for key in keys if key not in stamps]
+    if missing:
+        await VersionStamp.objects.abulk_create(
+            [VersionStamp(key=key, stamp=new_stamp()) for key in missing],
+            ignore_conflicts=True,
+        )
+        async for key, stamp in VersionStamp.objects.filter(
+            key__in=missing
+        ).values_list("key", "stamp"):
+            stamps[key] = stamp
+    return stamps
+
+
+def get_stamps(keys):
+    """Return current version stamps of keys
+
+    Stamps are stored in the database and kept in the reference data
+    cache. Unless that cache is shared by the worker processes, a write
+    renews the cached stamps of its own process only, the others read
+    the stored stamps again after REFERENCE_DATA_STAMP_TIMEOUT seconds.
+    Stamps do not change until their data does.
+    """
+    cache = get_reference_cache()
+    stamps = cache.get_many(keys)
+    missing = [key for key in keys if key not in stamps]
+    if missing:
+        stored = store_stamps(missing)
+        cache.set_many(stored, settings.REFERENCE_DATA_STAMP_TIMEOUT)
+        stamps.update(stored)
+    return [stamps[key] for key in keys]
+
+
+async def aget_stamps(keys):
+    """get_stamps() with the async cache methods and ORM"""
+    cache = get_reference_cache()
+    stamps = await cache.aget_many(keys)
+    missing = [key for key in keys if key not in stamps]
+    if missing:
+        stored = await astore_stamps(missing)
+        await cache.aset_many(stored, settings.REFERENCE_DATA_STAMP_TIMEOUT)
+        stamps.update(stored)
+    return [stamps[key] for key in keys]
+
+
+def get_versions(models):
+    return get_stamps([version_key(model) for model in models])
+
+
+async def aget_versions(models):
+    return await aget_stamps([version_key(model) for model in models])
+
+
+def renew_stamps():
+    """Store new stamps of the keys expired by this thread, in one query
+    for the keys of a transaction"""
+    keys, expired.keys = expired.keys, set()
+    if not keys:
+        return
+
+    stamps = {key: new_stamp() for key in keys}
+    VersionStamp.objects.bulk_create(
+        [VersionStamp(key=key, stamp=stamp) for key, stamp in stamps.items()],
+        update_conflicts=True,
+        unique_fields=["key"],
+        update_fields=["stamp"],
+    )
+    get_reference_cache().set_many(
+        stamps, settings.REFERENCE_DATA_STAMP_TIMEOUT
+    )
+
+
+def expire(key):
+    """Renew the version stamp of key, expiring what was cached with it
+
+    The cached stamp is renewed at once, so that responses rendered
+    from the not yet committed data are expired too. The stored stamp is
+    renewed on commit, keys of a rolled back transaction are renewed
+    with the next commit.
+    """
+    get_reference_cache().set(
+        key, new_stamp(), settings.REFERENCE_DATA_STAMP_TIMEOUT
+    )
+    expired.keys.add(key)
+    transaction.on_commit(renew_stamps)
+
+
+def invalidate(model):
+    """Expire every cached response depending on the model"""
+    expire(version_key(model))
+
+
+class CachedListMixin:
+    """Serve list responses from the reference data cache
+
+    Responses are keyed by the full request URL (host, query params and
+    page) and by the version stamps of cache_dependencies, which are
+    renewed on post_save and post_delete of those models.
+    Permissions are checked before the cache is consulted.
+    """
+
+    cache_dependencies = ()
+
+    def get_list_cache_key(self, request):
+        return self.make_list_cache_key(
+            request, get_versions(self.cache_dependencies)
+        )
+
+    async def aget_list_cache_key(self, request):
+        return self.make_list_cache_key(
+            request, await aget_versions(self.cache_dependencies)
+        )
+
+    def make_list_cache_key(self, request, versions):
+        url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+        return f"list:{self.basename}:{':'.join(versions)}:{url}"
+
+    def list(self, request, *args, **kwargs):
+        cache = get_reference_cache()
+        key = self.get_list_cache_key(request)
+
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        cache.set(key, response.data, settings.REFERENCE_DATA_CACHE_TIMEOUT)
+        return response
+
+
+class ConditionalGetMixin:
+    """Answer list and retrieve with strong ETags and 304 Not Modified
+
+    The ETag is derived from the version stamps of etag_dependencies
+    and the request URL and format, so If-None-Match is answered
+    without querying or serializing anything.
+    """
+
+    etag_dependencies = ()
+
+    def get_etag(self, request):
+        return self.make_etag(request, get_versions(self.etag_dependencies))
+
+    async def aget_etag(self, request):
+        return self.make_etag(
+            request, await aget_versions(self.etag_dependencies)
+        )
+
+    @staticmethod
+    def make_etag(request, versions):
+        value = ":".join(
+            versions
+            + [request.build_absolute_uri(), request.accepted_media_type]
+        )
+        return quote_etag(hashlib.md5(value.encode()).hexdigest())
+
+    @staticmethod
+    def is_not_modified(request, etag):
+        header = request.headers.get("If-None-Match")
+        if not header:
+            return False
+
+        etags = parse_etags(header)
+        # If-None-Match uses the weak comparison
+        return "*" in etags or etag in [
+            tag.removeprefix("W/") for tag in etags
+        ]
+
+    def get_conditional_response(self, request, handler, *args, **kwargs):
+        etag = self.get_etag(request)
+        if self.is_not_modified(request, etag):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response["ETag"] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            request, super().list, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            request, super().retrieve, *args, **kwargs
+        )
@@ -0,0 +1,86 @@
+import csv
+import tempfile
+
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import FileResponse, StreamingHttpResponse
+
+EXPORT_CHUNK_SIZE = 2000
+# bytes of an export kept in memory under ASGI, the rest goes to disk
+EXPORT_SPOOL_SIZE = 2**22
+
+# column name: field lookup
+BOOKING_EXPORT_COLUMNS = {
+    "id": "id",
+    "day": "day",
+    "start_hour": "start_hour",
+    "end_hour": "end_hour",
+    "room": "room__name",
+    "user": "user__email",
+    "team": "meeting__team__name",
+    "project": "meeting__team__project__name",
+    "type_of_meeting": "meeting__type_of_meeting__name",
+    "frequency": "frequency",
+    "interval": "interval",
+    "repeat_until": "repeat_until",
+    "repeat_count": "repeat_count",
+}
+
+
+class Echo:
+    """File-like object returning what is written, so that csv.writer
+    produces lines instead of writing them"""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(header, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(header, rows):
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(dict(zip(header, row))) + "\n"
+
+
+def join_chunks(lines, size=EXPORT_CHUNK_SIZE):
+    """Join lines into chunks of the given number of lines, so that
+    the response is not written one row at a time"""
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def is_asgi(request):
+    """Return whether the request is served by the ASGI handler, which
+    iterates streaming responses in the event loop (as of Django 4.1),
+    where the ORM cannot run"""
+    return isinstance(getattr(request, "_request", request), ASGIRequest)
+
+
+def streaming_response(chunks, request, content_type):
+    """Return a response streaming chunks of text read from the database
+
+    Under ASGI chunks are written to a temporary file in the thread of
+    the view first, and the file is streamed.
+    """
+    if not is_asgi(request):
+        return StreamingHttpResponse(chunks, content_type=content_type)
+
+    file = tempfile.SpooledTemporaryFile(EXPORT_SPOOL_SIZE)
+    for chunk in chunks:
+        file.write(chunk.encode())
+    file.seek(0)
+    response = FileResponse(file, content_type=content_type)
+    response.block_size = 2**16
+    return response
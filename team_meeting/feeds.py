@@ -0,0 +1,217 @@
+import hashlib
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.db.models import Q
+
+from team_meeting import cache
+from team_meeting.export import join_chunks
+from team_meeting.models import (
+    MeetingRoom,
+    Project,
+    Team,
+    TypeOfMeeting,
+    Booking,
+)
+
+ROOM = "room"
+TEAM = "team"
+USER = "user"
+
+CALENDAR_PAST_DAYS = 30
+CALENDAR_FUTURE_DAYS = 180
+CALENDAR_MAX_DAYS = 366
+CALENDAR_CHUNK_SIZE = 500
+
+# tables whose names are shown in the events
+CALENDAR_DEPENDENCIES = (MeetingRoom, TypeOfMeeting, Team, Project)
+
+signer = signing.Signer(salt="team_meeting.calendar")
+
+
+def feed_token(scope, pk):
+    return signer.sign(f"{scope}.{pk}")
+
+
+def parse_feed_token(token):
+    """Return scope and primary key signed in the token,
+    raise signing.BadSignature if it was not signed by us"""
+    scope, pk = signer.unsign(token).split(".")
+    return scope, int(pk)
+
+
+def scope_key(scope, pk):
+    return f"version:calendar:{scope}:{pk}"
+
+
+def invalidate_scope(scope, pk):
+    if pk is not None:
+        cache.expire(scope_key(scope, pk))
+
+
+def invalidate_booking(booking):
+    """Expire feeds of the room, team and user of the booking"""
+    invalidate_scope(ROOM, booking.room_id)
+    invalidate_scope(USER, booking.user_id)
+    invalidate_scope(TEAM, booking.meeting.team_id)
+
+
+def escape_text(value):
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line):
+    """Split a content line into lines of at most 75 octets"""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + "\r\n"
+
+    parts = []
+    while encoded:
+        size = 75 if not parts else 74
+        # do not split multibyte characters
+        while size < len(encoded) and encoded[size] & 0xC0 == 0x80:
+            size -= 1
+        parts.append(encoded[:size].decode())
+        encoded = encoded[size:]
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def format_datetime(day, hour):
+    local = datetime.combine(day, time(), ZoneInfo(settings.TIME_ZONE))
+    moment = (local + timedelta(hours=hour)).astimezone(timezone.utc)
+    return moment.strftime("%Y%m%dT%H%M%SZ")
+
+
+class CalendarFeed:
+    """iCalendar feed of the bookings of a meeting room, team or user
+    within a rolling window of days around today"""
+
+    def __init__(self, scope, owner, past_days, future_days):
+        self.scope = scope
+        self.owner = owner
+        today = date.today()
+        self.day_from = today - timedelta(days=past_days)
+        self.day_to = today + timedelta(days=future_days)
+
+    @classmethod
+    def get(cls, scope, pk, past_days, future_days):
+        """Return feed of the scope, None if its owner does not exist"""
+        models = {ROOM: MeetingRoom, TEAM: Team, USER: get_user_model()}
+        if scope not in models:
+            return None
+        owner = models[scope].objects.filter(pk=pk).first()
+        if owner is None:
+            return None
+        return cls(scope, owner, past_days, future_days)
+
+    @property
+    def name(self):
+        if self.scope == ROOM:
+            return f"{self.owner.name} meeting room"
+        if self.scope == TEAM:
+            return f"{self.owner.name} team"
+        return self.owner.email
+
+    def get_scopes(self):
+        scopes = [(self.scope, self.owner.pk)]
+        # the feed of a user includes the meetings of the user's team
+        if self.scope == USER and self.owner.team_id:
+            scopes.append((TEAM, self.owner.team_id))
+        return scopes
+
+    def get_cache_key(self):
+        stamps = cache.get_stamps(
+            [scope_key(scope, pk) for scope, pk in self.get_scopes()]
+        ) + cache.get_versions(CALENDAR_DEPENDENCIES)
+        value = ":".join(
+            [self.scope, str(self.owner.pk), str(self.day_from),
+             str(self.day_to)] + stamps
+        )
+        return f"calendar:{hashlib.md5(value.encode()).hexdigest()}"
+
+    def get_bookings(self):
+        owned = Q()
+        for scope, pk in self.get_scopes():
+            if scope == ROOM:
+                owned |= Q(room_id=pk)
+            elif scope == TEAM:
+                owned |= Q(meeting__team_id=pk)
+            else:
+                owned |= Q(user_id=pk)
+
+        # recurring bookings may start before the window
+        in_window = Q(day__gte=self.day_from) | (
+            ~Q(frequency="")
+            & (
+                Q(repeat_until__isnull=True)
+                | Q(repeat_until__gte=self.day_from)
+            )
+        )
+        return Booking.objects.filter(
+            owned, in_window, day__lte=self.day_to
+        ).select_related(
+            "room",
+            "user",
+            "meeting__team__project",
+            "meeting__type_of_meeting",
+        ).prefetch_related("exceptions")
+
+    def events(self, booking, stamp):
+        booking._exceptions = {
+            exception.original_day: exception
+            for exception in booking.exceptions.all()
+        }
+        meeting = booking.meeting
+        for occurrence in booking.occurrences(self.day_from, self.day_to):
+            yield from (
+                "BEGIN:VEVENT",
+                f"UID:booking-{booking.pk}-"
+                f"{occurrence.original_day:%Y%m%d}@team-meeting",
+                f"DTSTAMP:{stamp}",
+                "DTSTART:"
+                + format_datetime(occurrence.day, occurrence.start_hour),
+                "DTEND:"
+                + format_datetime(occurrence.day, occurrence.end_hour),
+                "SUMMARY:" + escape_text(
+                    f"{meeting.type_of_meeting.name} "
+                    f"({meeting.team.name})"
+                ),
+                "LOCATION:" + escape_text(booking.room.name),
+                "DESCRIPTION:" + escape_text(
+                    f"Project: {meeting.team.project.name}\n"
+                    f"Booked by: {booking.user.email}"
+                ),
+                "END:VEVENT",
+            )
+
+    def lines(self):
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        yield from (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//Team Meeting Service//Bookings//EN",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            "X-WR-CALNAME:" + escape_text(self.name),
+        )
+        for booking in self.get_bookings().iterator(
+            chunk_size=CALENDAR_CHUNK_SIZE
+        ):
+            yield from self.events(booking, stamp)
+        yield "END:VCALENDAR"
+
+    def chunks(self):
+        """Yield the feed content in chunks of folded lines"""
+        return join_chunks(
+            (fold(line) for line in self.lines()), CALENDAR_CHUNK_SIZE
+        )
@@ -0,0 +1,111 @@
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, connection, transaction
+from PIL import Image, ImageOps
+
+from team_meeting import cache
+from team_meeting.models import Project
+
+logger = logging.getLogger(__name__)
+
+# variant: longest side in pixels
+IMAGE_VARIANTS = {
+    "thumbnail": 160,
+    "medium": 640,
+}
+# format: (Pillow format, extension, save options)
+IMAGE_FORMATS = {
+    "webp": ("WEBP", "webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "jpg", {"quality": 85, "optimize": True}),
+}
+
+executor = None
+
+
+def get_executor():
+    global executor
+    if executor is None:
+        executor = ThreadPoolExecutor(
+            max_workers=settings.IMAGE_VARIANT_WORKERS,
+            thread_name_prefix="image-variants",
+        )
+    return executor
+
+
+def variant_name(name, variant, image_format):
+    """Return the storage name of a variant of the image of name"""
+    directory, filename = os.path.split(name)
+    stem, _ = os.path.splitext(filename)
+    extension = IMAGE_FORMATS[image_format][1]
+    return os.path.join(
+        directory, "variants", f"{stem}-{variant}.{extension}"
+    )
+
+
+def resize(image, size, image_format):
+    variant = image.copy()
+    variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+    if image_format == "jpeg" and variant.mode != "RGB":
+        variant = variant.convert("RGB")
+
+    pillow_format, _, options = IMAGE_FORMATS[image_format]
+    content = io.BytesIO()
+    variant.save(content, pillow_format, **options)
+    return content.getvalue()
+
+
+def generate_variants(project_id, name):
+    """Store the variants of the image of name and record them on the
+    project, if the image was not replaced meanwhile
+
+    Images are named by their content, so variants stored already
+    are the same and shared with the projects of the same image.
+    """
+    with default_storage.open(name) as file:
+        image = ImageOps.exif_transpose(Image.open(file))
+        image.load()
+
+    names = {}
+    for variant, size in IMAGE_VARIANTS.items():
+        names[variant] = {}
+        for image_format in IMAGE_FORMATS:
+            path = variant_name(name, variant, image_format)
+            if default_storage.exists(path):
+                names[variant][image_format] = path
+                continue
+            # a job of the same image saving meanwhile gets another name
+            names[variant][image_format] = default_storage.save(
+                path, ContentFile(resize(image, size, image_format))
+            )
+
+    if Project.objects.filter(pk=project_id, image=name).update(
+        image_variants=names
+    ):
+        # update() sends no post_save
+        cache.invalidate(Project)
+
+
+def run_generate_variants(project_id, name):
+    # pool threads are not requests, nothing closes their connections
+    close_old_connections()
+    try:
+        generate_variants(project_id, name)
+    except Exception:
+        logger.exception("Variants of %s failed", name)
+    finally:
+        connection.close()
+
+
+def schedule_variants(project):
+    """Generate the variants of the project image in the worker pool
+    once the upload is committed, the request does not wait for them"""
+    project_id, name = project.pk, project.image.name
+    transaction.on_commit(
+        lambda: get_executor().submit(run_generate_variants, project_id, name)
+    )
@@ -0,0 +1,84 @@
+# Generated by Django 4.1.7 on 2026-10-18 06:33
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_room_occupancy(apps, schema_editor):
+    Booking = apps.get_model("team_meeting", "Booking")
+    RoomOccupancy = apps.get_model("team_meeting", "RoomOccupancy")
+
+    masks = {}
+    for room_id, day, start_hour, end_hour in Booking.objects.values_list(
+        "room_id", "day", "start_hour", "end_hour"
+    ).iterator():
+        mask = ((1 << (end_hour - start_hour)) - 1) << start_hour
+        masks[(room_id, day)] = masks.get((room_id, day), 0) | mask
+
+    RoomOccupancy.objects.bulk_create(
+        RoomOccupancy(room_id=room_id, day=day, mask=mask)
+        for (room_id, day), mask in masks.items()
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("team_meeting", "0005_alter_typeofmeeting_name"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="booking",
+            name="end_hour",
+            field=models.IntegerField(
+                validators=[
+                    django.core.validators.MinValueValidator(1),
+                    django.core.validators.MaxValueValidator(24),
+                ]
+            ),
+        ),
+        migrations.AlterField(
+            model_name="booking",
+            name="start_hour",
+            field=models.IntegerField(
+                validators=[
+                    django.core.validators.MinValueValidator(0),
+                    django.core.validators.MaxValueValidator(23),
+                ]
+            ),
+        ),
+        migrations.CreateModel(
+            name="RoomOccupancy",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("mask", models.IntegerField(default=0)),
+                (
+                    "room",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="occupancies",
+                        to="team_meeting.meetingroom",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="roomoccupancy",
+            constraint=models.UniqueConstraint(
+                fields=("room", "day"), name="unique_room_day_occupancy"
+            ),
+        ),
+        migrations.RunPython(
+            fill_room_occupancy, migrations.RunPython.noop
+        ),
+    ]
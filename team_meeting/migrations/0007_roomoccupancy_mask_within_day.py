@@ -0,0 +1,19 @@
+# Generated by Django 4.1.7 on 2026-10-18 06:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("team_meeting", "0006_roomoccupancy"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="roomoccupancy",
+            constraint=models.CheckConstraint(
+                check=models.Q(("mask__gte", 0), ("mask__lt", 16777216)),
+                name="room_occupancy_mask_within_day",
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.1.7 on 2026-10-18 06:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("team_meeting", "0007_roomoccupancy_mask_within_day"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="meetingroom",
+            index=models.Index(
+                fields=["capacity", "has_projector", "is_soundproof"],
+                name="team_meetin_capacit_393cac_idx",
+            ),
+        ),
+    ]
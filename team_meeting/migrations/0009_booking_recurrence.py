@@ -0,0 +1,104 @@
+# Generated by Django 4.1.7 on 2026-10-18 06:40
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("team_meeting", "0008_meetingroom_capacity_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="booking",
+            name="frequency",
+            field=models.CharField(
+                blank=True,
+                choices=[("DAILY", "Daily"), ("WEEKLY", "Weekly")],
+                default="",
+                max_length=6,
+            ),
+        ),
+        migrations.AddField(
+            model_name="booking",
+            name="interval",
+            field=models.PositiveSmallIntegerField(
+                default=1,
+                validators=[
+                    django.core.validators.MinValueValidator(1),
+                    django.core.validators.MaxValueValidator(52),
+                ],
+            ),
+        ),
+        migrations.AddField(
+            model_name="booking",
+            name="repeat_count",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(1),
+                    django.core.validators.MaxValueValidator(366),
+                ],
+            ),
+        ),
+        migrations.AddField(
+            model_name="booking",
+            name="repeat_until",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name="RecurrenceException",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("original_day", models.DateField()),
+                ("is_cancelled", models.BooleanField(default=False)),
+                ("day", models.DateField()),
+                (
+                    "start_hour",
+                    models.IntegerField(
+                        validators=[
+                            django.core.validators.MinValueValidator(0),
+                            django.core.validators.MaxValueValidator(23),
+                        ]
+                    ),
+                ),
+                (
+                    "end_hour",
+                    models.IntegerField(
+                        validators=[
+                            django.core.validators.MinValueValidator(1),
+                            django.core.validators.MaxValueValidator(24),
+                        ]
+                    ),
+                ),
+                (
+                    "booking",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="exceptions",
+                        to="team_meeting.booking",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["original_day"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="recurrenceexception",
+            constraint=models.UniqueConstraint(
+                fields=("booking", "original_day"), name="unique_booking_exception_day"
+            ),
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 4.1.7 on 2026-10-18 06:43
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("team_meeting", "0009_booking_recurrence"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="booking",
+            options={"ordering": ["day", "start_hour", "id"]},
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.1.7 on 2026-10-18 06:44
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("team_meeting", "0010_alter_booking_options"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["day", "start_hour", "id"], name="team_meetin_day_f863c1_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["room", "day", "start_hour"],
+                name="team_meetin_room_id_e3fc69_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["user", "day"], name="team_meetin_user_id_399e6e_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="meetingroom",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="meetingroom_name_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="project_name_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="team",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="team_name_trgm_idx",
+            ),
+        ),
+    ]
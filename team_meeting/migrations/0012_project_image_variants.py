@@ -0,0 +1,17 @@
+# Generated by Django 4.1.7 on 2026-10-18 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("team_meeting", "0011_booking_and_name_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="image_variants",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
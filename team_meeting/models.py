@@ -1,13 +1,22 @@
+import hashlib
 import os
-import uuid
+from collections import defaultdict, namedtuple
+from datetime import timedelta
 
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
-from django.utils.text import slugify
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Upper
+from django.db.models.lookups import Exact
 from rest_framework.exceptions import ValidationError
 
 from team_meeting_service import settings
 
+PROJECT_IMAGE_DIR = "uploads/projects/"
+# (room, day) slots locked by one query
+OCCUPANCY_LOCK_BATCH_SIZE = 1000
+
 
 class MeetingRoom(models.Model):
     name = models.CharField(max_length=63, unique=True)
@@ -19,6 +28,15 @@ class MeetingRoom(models.Model):
 
     class Meta:
         ordering = ["capacity"]
+        indexes = [
+            models.Index(
+                fields=["capacity", "has_projector", "is_soundproof"]
+            ),
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="meetingroom_name_trgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -29,20 +47,46 @@ class MeetingRoom(models.Model):
         )
 
 
-def project_image_file_path(instance, filename):
+def content_hash(file):
+    """Return the SHA-256 hex digest of the file, the one computed
+    while it was uploaded if there is one"""
+    digest = getattr(file, "sha256", None)
+    if digest is None:
+        sha256 = hashlib.sha256()
+        for chunk in file.chunks():
+            sha256.update(chunk)
+        digest = sha256.hexdigest()
+    return digest
+
+
+def project_image_name(file, filename):
+    """Name images by the hash of their content, so that identical
+    uploads share one file, which never changes"""
     _, extension = os.path.splitext(filename)
-    filename = f"{slugify(instance.name)}-{uuid.uuid4()}{extension}"
+    filename = f"{content_hash(file)}{extension.lower()}"
 
-    return os.path.join("uploads/projects/", filename)
+    return os.path.join(PROJECT_IMAGE_DIR, filename)
+
+
+def project_image_file_path(instance, filename):
+    return project_image_name(instance.image.file, filename)
 
 
 class Project(models.Model):
     name = models.CharField(max_length=63, unique=True)
     description = models.TextField(blank=True)
     image = models.ImageField(null=True, upload_to=project_image_file_path)
+    # variant: {format: storage name}, filled in after upload
+    image_variants = models.JSONField(default=dict, blank=True)
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="project_name_trgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -57,6 +101,12 @@ class Team(models.Model):
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="team_name_trgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.project})"
@@ -84,55 +134,479 @@ class Meeting(models.Model):
         return f"{self.type_of_meeting} of {self.team}"
 
 
+def hours_mask(start_hour, end_hour):
+    """Return bitmask with one bit set for every hour in [start, end)"""
+    return ((1 << (end_hour - start_hour)) - 1) << start_hour
+
+
+class RoomOccupancy(models.Model):
+    """Occupied hours of a meeting room on a day, one bit per hour"""
+
+    room = models.ForeignKey(
+        MeetingRoom, on_delete=models.CASCADE, related_name="occupancies"
+    )
+    day = models.DateField()
+    mask = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["room", "day"], name="unique_room_day_occupancy"
+            ),
+            models.CheckConstraint(
+                check=models.Q(mask__gte=0, mask__lt=1 << 24),
+                name="room_occupancy_mask_within_day",
+            ),
+        ]
+
+    @staticmethod
+    def free_intervals(mask):
+        """Return (start_hour, end_hour) of every free interval of a day"""
+        intervals = []
+        start_hour = None
+        for hour in range(24):
+            if not mask & (1 << hour):
+                if start_hour is None:
+                    start_hour = hour
+            elif start_hour is not None:
+                intervals.append((start_hour, hour))
+                start_hour = None
+        if start_hour is not None:
+            intervals.append((start_hour, 24))
+        return intervals
+
+    @staticmethod
+    def get_mask(room, day):
+        mask = RoomOccupancy.objects.filter(
+            room=room, day=day
+        ).values_list("mask", flat=True).first()
+        return mask or 0
+
+    @staticmethod
+    def claim(room_id, day, mask):
+        """Occupy hours unless any of them is taken, return if succeeded
+
+        The (room, day) row is created unless it exists, then the
+        conditional update locks it, so concurrent claims of the same
+        room and day are serialized by the database.
+        """
+        RoomOccupancy.objects.bulk_create(
+            [RoomOccupancy(room_id=room_id, day=day)], ignore_conflicts=True
+        )
+        return bool(
+            RoomOccupancy.objects.filter(
+                Exact(F("mask").bitand(mask), 0), room_id=room_id, day=day
+            ).update(mask=F("mask").bitor(mask))
+        )
+
+    @staticmethod
+    def lock(slots, batch_size=OCCUPANCY_LOCK_BATCH_SIZE):
+        """Return occupancies of (room_id, day) slots locked for update
+
+        Rows are locked in batches of consecutive slots in the order of
+        (room_id, day), one condition per room of a batch, so that the
+        size of a query is bounded and the order of locks is kept.
+        """
+        slots = sorted(set(slots))
+        if not slots:
+            return {}
+
+        RoomOccupancy.objects.bulk_create(
+            [
+                RoomOccupancy(room_id=room_id, day=day)
+                for room_id, day in slots
+            ],
+            ignore_conflicts=True,
+        )
+
+        occupancies = {}
+        for start in range(0, len(slots), batch_size):
+            days = defaultdict(list)
+            for room_id, day in slots[start:start + batch_size]:
+                days[room_id].append(day)
+            condition = Q()
+            for room_id, room_days in days.items():
+                condition |= Q(room_id=room_id, day__in=room_days)
+            for occupancy in RoomOccupancy.objects.select_for_update().filter(
+                condition
+            ).order_by("room_id", "day"):
+                occupancies[(occupancy.room_id, occupancy.day)] = occupancy
+        return occupancies
+
+    @staticmethod
+    def find_conflicts(occupancies, slots):
+        """Return (slot, occupied mask) of every slot overlapping locked
+        occupancies or a previous slot"""
+        masks = {}
+        conflicts = []
+        for slot in slots:
+            room_id, day, mask = slot
+            occupied = masks.get(
+                (room_id, day), occupancies[(room_id, day)].mask
+            )
+            if occupied & mask:
+                conflicts.append((slot, occupied))
+            masks[(room_id, day)] = occupied | mask
+        return conflicts
+
+    @staticmethod
+    def occupy(occupancies, slots):
+        for room_id, day, mask in slots:
+            occupancies[(room_id, day)].mask |= mask
+
+    @staticmethod
+    def move(released, claimed):
+        """Release and claim (room_id, day, mask) slots in one transaction,
+        return conflicts of claimed slots
+
+        Rows are locked in the order of (room_id, day), so that concurrent
+        moves between the same rooms and days do not deadlock. A single
+        claimed slot locks one row only, it is claimed right away.
+        """
+        if not released and len(claimed) <= 1:
+            return [
+                (slot, RoomOccupancy.get_mask(slot[0], slot[1]))
+                for slot in claimed
+                if not RoomOccupancy.claim(*slot)
+            ]
+
+        occupancies = RoomOccupancy.lock(
+            (room_id, day) for room_id, day, _ in released + claimed
+        )
+        for room_id, day, mask in released:
+            occupancies[(room_id, day)].mask &= ~mask
+
+        conflicts = RoomOccupancy.find_conflicts(occupancies, claimed)
+        if not conflicts:
+            RoomOccupancy.occupy(occupancies, claimed)
+            RoomOccupancy.objects.bulk_update(occupancies.values(), ["mask"])
+        return conflicts
+
+    @staticmethod
+    def release_all(slots):
+        """Release (room_id, day, mask) slots of existing occupancies,
+        one update per room and mask
+
+        No rows are created, so that hours of bookings deleted along with
+        their room are not written back to the room being deleted.
+        """
+        days = defaultdict(list)
+        for room_id, day, mask in slots:
+            days[(room_id, mask)].append(day)
+        for (room_id, mask), room_days in days.items():
+            RoomOccupancy.objects.filter(
+                room_id=room_id, day__in=room_days
+            ).update(mask=F("mask").bitand(~mask))
+
+    def __str__(self):
+        return f"{self.room_id} {self.day} ({self.mask:024b})"
+
+
+Occurrence = namedtuple(
+    "Occurrence", ("original_day", "day", "start_hour", "end_hour")
+)
+
+
 class Booking(models.Model):
+    DAILY = "DAILY"
+    WEEKLY = "WEEKLY"
+    FREQUENCY_CHOICES = [
+        (DAILY, "Daily"),
+        (WEEKLY, "Weekly"),
+    ]
+    MAX_OCCURRENCES = 366
+
     room = models.ForeignKey(
         MeetingRoom, on_delete=models.CASCADE, related_name="bookings"
     )
     day = models.DateField()
-    start_hour = models.IntegerField()
-    end_hour = models.IntegerField()
+    start_hour = models.IntegerField(
+        validators=[MinValueValidator(0), MaxValueValidator(23)]
+    )
+    end_hour = models.IntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(24)]
+    )
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE
     )
     meeting = models.OneToOneField(
         Meeting, on_delete=models.CASCADE, related_name="booking"
     )
+    frequency = models.CharField(
+        max_length=6, choices=FREQUENCY_CHOICES, blank=True, default=""
+    )
+    interval = models.PositiveSmallIntegerField(
+        default=1, validators=[MinValueValidator(1), MaxValueValidator(52)]
+    )
+    repeat_until = models.DateField(null=True, blank=True)
+    repeat_count = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        validators=[
+            MinValueValidator(1), MaxValueValidator(MAX_OCCURRENCES)
+        ],
+    )
 
     class Meta:
-        ordering = ["day", "start_hour"]
+        ordering = ["day", "start_hour", "id"]
+        indexes = [
+            models.Index(fields=["day", "start_hour", "id"]),
+            models.Index(fields=["room", "day", "start_hour"]),
+            models.Index(fields=["user", "day"]),
+        ]
+
+    SLOT_FIELDS = (
+        "room_id",
+        "day",
+        "start_hour",
+        "end_hour",
+        "frequency",
+        "interval",
+        "repeat_until",
+        "repeat_count",
+    )
+
+    # values of SLOT_FIELDS stored in the database, if known
+    _stored = None
+    _exceptions = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = instance.__dict__
+        if all(name in loaded for name in Booking.SLOT_FIELDS):
+            instance._stored = tuple(
+                loaded[name] for name in Booking.SLOT_FIELDS
+            )
+        return instance
 
     @property
     def duration(self):
         return f"{self.start_hour}:00 - {self.end_hour}:00"
 
+    @property
+    def hours_mask(self):
+        return hours_mask(self.start_hour, self.end_hour)
+
+    @property
+    def is_recurring(self):
+        return bool(self.frequency)
+
+    @property
+    def recurrence_rule(self):
+        if not self.is_recurring:
+            return None
+        return {
+            "frequency": self.frequency,
+            "interval": self.interval,
+            "repeat_until": self.repeat_until,
+            "repeat_count": self.repeat_count,
+        }
+
     @staticmethod
-    def validate_time(id, day, start_hour, end_hour, room, error_to_raise):
-        bookings_start_in_range = Booking.objects.filter(
-            day=day, room=room, start_hour__range=(start_hour, end_hour - 1)
-        ).exclude(id=id)
-        bookings_end_in_range = Booking.objects.filter(
-            day=day, room=room, end_hour__range=(start_hour + 1, end_hour)
-        ).exclude(id=id)
-        if bookings_start_in_range:
-            raise error_to_raise(
-                "Your meeting end time conflicts with another meeting"
+    def occurrence_days(day, frequency, interval, repeat_until, repeat_count):
+        if not frequency:
+            yield day
+            return
+
+        step = timedelta(
+            days=interval * (7 if frequency == Booking.WEEKLY else 1)
+        )
+        for index in range(repeat_count or Booking.MAX_OCCURRENCES):
+            occurrence_day = day + index * step
+            if repeat_until and occurrence_day > repeat_until:
+                return
+            yield occurrence_day
+
+    @staticmethod
+    def expand(
+        day,
+        start_hour,
+        end_hour,
+        frequency,
+        interval,
+        repeat_until,
+        repeat_count,
+        exceptions,
+    ):
+        """Lazily yield occurrences of a booking rule with exceptions"""
+        for original_day in Booking.occurrence_days(
+            day, frequency, interval, repeat_until, repeat_count
+        ):
+            exception = exceptions.get(original_day)
+            if exception is None:
+                yield Occurrence(
+                    original_day, original_day, start_hour, end_hour
+                )
+            elif not exception.is_cancelled:
+                yield Occurrence(
+                    original_day,
+                    exception.day,
+                    exception.start_hour,
+                    exception.end_hour,
+                )
+
+    def get_exceptions(self):
+        if self.pk is None:
+            return {}
+        if self._exceptions is None:
+            self._exceptions = {
+                exception.original_day: exception
+                for exception in RecurrenceException.objects.filter(
+                    booking_id=self.pk
+                )
+            }
+        return self._exceptions
+
+    def occurrences(self, day_from=None, day_to=None):
+        exceptions = self.get_exceptions() if self.is_recurring else {}
+        for occurrence in Booking.expand(
+            self.day,
+            self.start_hour,
+            self.end_hour,
+            self.frequency,
+            self.interval,
+            self.repeat_until,
+            self.repeat_count,
+            exceptions,
+        ):
+            if day_from and occurrence.day < day_from:
+                continue
+            if day_to and occurrence.day > day_to:
+                continue
+            yield occurrence
+
+    def get_slots(self):
+        return [
+            (
+                self.room_id,
+                occurrence.day,
+                hours_mask(occurrence.start_hour, occurrence.end_hour),
             )
-        if bookings_end_in_range:
-            raise error_to_raise(
-                "Your meeting start time conflicts with another meeting"
+            for occurrence in self.occurrences()
+        ]
+
+    def get_occupied(self):
+        if self._stored is None and self.pk is not None:
+            self._stored = Booking.objects.filter(pk=self.pk).values_list(
+                *Booking.SLOT_FIELDS
+            ).first()
+        if self._stored is None:
+            return []
+
+        room_id, *rule = self._stored
+        exceptions = self.get_exceptions() if rule[3] else {}
+        return [
+            (
+                room_id,
+                occurrence.day,
+                hours_mask(occurrence.start_hour, occurrence.end_hour),
+            )
+            for occurrence in Booking.expand(*rule, exceptions)
+        ]
+
+    @staticmethod
+    def conflict_message(start_hour, occupied):
+        if occupied & (1 << start_hour):
+            return "Your meeting start time conflicts with another meeting"
+        return "Your meeting end time conflicts with another meeting"
+
+    @staticmethod
+    def conflicts_error(conflicts, many, error_to_raise):
+        messages = []
+        for (room_id, day, mask), occupied in conflicts:
+            message = Booking.conflict_message(
+                (mask & -mask).bit_length() - 1, occupied
             )
+            messages.append(f"{message} on {day}" if many else message)
+        return error_to_raise(messages)
+
+    @staticmethod
+    def validate_time(start_hour, end_hour, error_to_raise, occupied=0):
         if start_hour >= end_hour:
             raise error_to_raise(
                 "Start hour should be smaller than end hour"
             )
+        if occupied & hours_mask(start_hour, end_hour):
+            raise error_to_raise(
+                Booking.conflict_message(start_hour, occupied)
+            )
+
+    @staticmethod
+    def validate_recurrence(
+        day, frequency, interval, repeat_until, repeat_count, error_to_raise
+    ):
+        if not frequency:
+            if repeat_until or repeat_count:
+                raise error_to_raise(
+                    "Only recurring bookings can have repeat end"
+                )
+            return
+        if not (repeat_until or repeat_count):
+            raise error_to_raise(
+                "Recurring booking should repeat until a day "
+                "or a number of times"
+            )
+        if repeat_until and repeat_until < day:
+            raise error_to_raise(
+                "Recurring booking should not end before its day"
+            )
+        if repeat_until and not repeat_count:
+            step = interval * (7 if frequency == Booking.WEEKLY else 1)
+            if (repeat_until - day).days // step >= Booking.MAX_OCCURRENCES:
+                raise error_to_raise(
+                    "Recurring booking should not repeat more than "
+                    f"{Booking.MAX_OCCURRENCES} times"
+                )
+
+    def occupy(self, released, claimed):
+        conflicts = RoomOccupancy.move(released, claimed)
+        if conflicts:
+            raise Booking.conflicts_error(
+                conflicts, len(claimed) > 1, ValidationError
+            )
+
+    def add_exception(
+        self,
+        original_day,
+        is_cancelled=False,
+        day=None,
+        start_hour=None,
+        end_hour=None,
+    ):
+        """Cancel or move a single occurrence of a recurring booking"""
+        with transaction.atomic():
+            released = self.get_occupied()
+            exception, _ = RecurrenceException.objects.update_or_create(
+                booking=self,
+                original_day=original_day,
+                defaults={
+                    "is_cancelled": is_cancelled,
+                    "day": original_day if day is None else day,
+                    "start_hour": (
+                        self.start_hour if start_hour is None else start_hour
+                    ),
+                    "end_hour": (
+                        self.end_hour if end_hour is None else end_hour
+                    ),
+                },
+            )
+            self._exceptions = None
+            self.occupy(released, self.get_slots())
+        return exception
 
     def clean(self):
         Booking.validate_time(
-            self.id,
-            self.day,
             self.start_hour,
             self.end_hour,
-            self.room,
+            ValidationError,
+        )
+        Booking.validate_recurrence(
+            self.day,
+            self.frequency,
+            self.interval,
+            self.repeat_until,
+            self.repeat_count,
             ValidationError,
         )
 
@@ -144,12 +618,52 @@ class Booking(models.Model):
         update_fields=None,
     ):
         self.full_clean()
-        return super(Booking, self).save(
-            force_insert, force_update, using, update_fields
-        )
+        with transaction.atomic(using=using):
+            self.occupy(self.get_occupied(), self.get_slots())
+            result = super(Booking, self).save(
+                force_insert, force_update, using, update_fields
+            )
+            self._stored = tuple(
+                getattr(self, name) for name in Booking.SLOT_FIELDS
+            )
+        return result
 
     def __str__(self):
         return (
             f"{self.meeting} ({self.room.name} meeting room, "
             f"{self.day} {self.start_hour}:00-{self.end_hour}:00)"
         )
+
+
+class RecurrenceException(models.Model):
+    """Cancelled or moved occurrence of a recurring booking"""
+
+    booking = models.ForeignKey(
+        Booking, on_delete=models.CASCADE, related_name="exceptions"
+    )
+    original_day = models.DateField()
+    is_cancelled = models.BooleanField(default=False)
+    day = models.DateField()
+    start_hour = models.IntegerField(
+        validators=[MinValueValidator(0), MaxValueValidator(23)]
+    )
+    end_hour = models.IntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(24)]
+    )
+
+    class Meta:
+        ordering = ["original_day"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["booking", "original_day"],
+                name="unique_booking_exception_day",
+            )
+        ]
+
+    def __str__(self):
+        if self.is_cancelled:
+            return f"{self.booking} cancelled on {self.original_day}"
+        return (
+            f"{self.booking} moved from {self.original_day} to "
+            f"{self.day} {self.start_hour}:00-{self.end_hour}:00"
+        )
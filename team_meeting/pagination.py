@@ -0,0 +1,326 @@
+import base64
+import json
+from functools import cached_property
+
+from django.core.paginator import EmptyPage, InvalidPage, Page, Paginator
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset):
+    """Return the planner's row estimate of a queryset on PostgreSQL,
+    the exact count elsewhere"""
+    if connections[queryset.db].vendor != "postgresql":
+        return queryset.count()
+
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return plan[0]["Plan"]["Plan Rows"]
+
+
+async def aestimate_count(queryset):
+    """estimate_count() with the queries of the async ORM"""
+    if connections[queryset.db].vendor != "postgresql":
+        return await queryset.acount()
+
+    plan = json.loads(await queryset.order_by().aexplain(format="json"))
+    return plan[0]["Plan"]["Plan Rows"]
+
+
+class EstimatedCountPage(Page):
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        return self.has_more
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator using an estimated count, pages are fetched by offset
+    regardless of the estimate, so no page is cut short by it"""
+
+    @cached_property
+    def count(self):
+        return estimate_count(self.object_list)
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise EmptyPage("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        return self.get_estimated_page(list(self.get_rows(number)), number)
+
+    async def apage(self, number):
+        """page() with the queries of the async ORM"""
+        number = self.validate_number(number)
+        return self.get_estimated_page(
+            [row async for row in self.get_rows(number)], number
+        )
+
+    def get_rows(self, number):
+        """Return rows of the page and the first row after it"""
+        bottom = (number - 1) * self.per_page
+        return self.object_list[bottom:bottom + self.per_page + 1]
+
+    def get_estimated_page(self, object_list, number):
+        if number > 1 and not object_list:
+            raise EmptyPage("That page contains no results")
+
+        return EstimatedCountPage(
+            object_list[:self.per_page],
+            number,
+            self,
+            has_more=len(object_list) > self.per_page,
+        )
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination on the full ordering of the queryset
+
+    The position is the tuple of ordering values of the first or last
+    row of a page, so every page is a single indexed range scan without
+    OFFSET or COUNT. The ordering is completed with the primary key to
+    be unique.
+
+    Rows after the position are an OR of one step per ordering field,
+    which PostgreSQL cannot use as the start of an index range. The
+    redundant bound of the leading field is, so the scan of an index on
+    the ordering starts at the position (see test_cursor_is_index_range).
+    """
+
+    cursor_query_param = "cursor"
+
+    def __init__(self, page_size):
+        self.page_size = page_size
+
+    @staticmethod
+    def get_ordering(queryset):
+        ordering = list(
+            queryset.query.order_by or queryset.model._meta.ordering
+        )
+        if not {"pk", "id", "-pk", "-id"} & set(ordering):
+            ordering.append("pk")
+        return ordering
+
+    @staticmethod
+    def position_filter(ordering, position, reverse):
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip("-")
+            lookup = "gt" if field.startswith("-") == reverse else "lt"
+            step = Q(**{f"{name}__{lookup}": position[index]})
+            for previous, value in zip(ordering[:index], position):
+                step &= Q(**{previous.lstrip("-"): value})
+            condition |= step
+
+        if len(ordering) > 1:
+            name = ordering[0].lstrip("-")
+            lookup = "gte" if ordering[0].startswith("-") == reverse else "lte"
+            condition &= Q(**{f"{name}__{lookup}": position[0]})
+        return condition
+
+    @staticmethod
+    def get_model_field(model, field):
+        name = field.lstrip("-")
+        if name == "pk":
+            return model._meta.pk
+        return model._meta.get_field(name)
+
+    @staticmethod
+    def get_value(obj, name):
+        # rows of values() querysets are dicts
+        if isinstance(obj, dict):
+            return obj[name]
+        return getattr(obj, name)
+
+    def encode_cursor(self, obj, reverse):
+        position = [
+            self.get_value(obj, field.lstrip("-")) for field in self.ordering
+        ]
+        data = json.dumps(
+            {"p": position, "r": reverse}, default=str
+        ).encode()
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            base64.urlsafe_b64encode(data).decode(),
+        )
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position = [
+                self.get_model_field(model, field).to_python(value)
+                for field, value in zip(self.ordering, data["p"])
+            ]
+            if len(position) != len(self.ordering):
+                raise ValueError
+        except Exception:
+            raise NotFound("Invalid cursor")
+        return position, bool(data.get("r"))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.get_page(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() with the queries of the async ORM"""
+        return self.get_page(
+            [row async for row in self.get_page_queryset(queryset, request)]
+        )
+
+    def get_page_queryset(self, queryset, request):
+        """Return the rows of the page after or before the cursor
+        position and the first row past it"""
+        self.base_url = remove_query_param(
+            request.build_absolute_uri(), self.cursor_query_param
+        )
+        self.ordering = self.get_ordering(queryset)
+        self.position, self.reverse = self.decode_cursor(
+            request, queryset.model
+        )
+
+        if self.reverse:
+            queryset = queryset.order_by(*[
+                field[1:] if field.startswith("-") else f"-{field}"
+                for field in self.ordering
+            ])
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if self.position is not None:
+            queryset = queryset.filter(
+                self.position_filter(
+                    self.ordering, self.position, self.reverse
+                )
+            )
+        return queryset[:self.page_size + 1]
+
+    def get_page(self, results):
+        """Return the results of the page, setting its links"""
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if self.reverse:
+            results.reverse()
+
+        has_next = has_more if not self.reverse else self.position is not None
+        has_previous = has_more if self.reverse else self.position is not None
+        self.next_link = (
+            self.encode_cursor(results[-1], False)
+            if results and has_next else None
+        )
+        self.previous_link = (
+            self.encode_cursor(results[0], True)
+            if results and has_previous else None
+        )
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.next_link,
+            "previous": self.previous_link,
+            "results": data,
+        })
+
+
+class MeetingBookingPagination(PageNumberPagination):
+    """Page number pagination, or keyset pagination with ?pagination=cursor
+
+    With ?count=estimate the page number mode reports the planner's row
+    estimate instead of running COUNT(*) over the whole queryset.
+    """
+
+    page_size = 10
+    max_page_size = 100
+    mode_query_param = "pagination"
+    count_query_param = "count"
+
+    keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get(self.mode_query_param) == "cursor":
+            self.keyset = KeysetPagination(self.page_size)
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        if request.query_params.get(self.count_query_param) == "estimate":
+            self.django_paginator_class = EstimatedCountPaginator
+
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() with the queries of the async ORM"""
+        if request.query_params.get(self.mode_query_param) == "cursor":
+            self.keyset = KeysetPagination(self.page_size)
+            return await self.keyset.apaginate_queryset(
+                queryset, request, view
+            )
+
+        page_size = self.get_page_size(request)
+        if request.query_params.get(self.count_query_param) == "estimate":
+            paginator = EstimatedCountPaginator(queryset, page_size)
+            paginator.count = await aestimate_count(queryset)
+        else:
+            paginator = self.django_paginator_class(queryset, page_size)
+            paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+
+        try:
+            if isinstance(paginator, EstimatedCountPaginator):
+                self.page = await paginator.apage(page_number)
+            else:
+                self.page = paginator.page(page_number)
+                self.page.object_list = [
+                    row async for row in self.page.object_list
+                ]
+        except InvalidPage as exc:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            )
+
+        self.request = request
+        return list(self.page)
+
+    def get_paginated_response(self, data):
+        if self.keyset:
+            return self.keyset.get_paginated_response(data)
+
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Pagination mode, page (default) or cursor",
+                "schema": {"type": "string", "enum": ["page", "cursor"]},
+            },
+            {
+                "name": KeysetPagination.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Count of page mode, exact (default) "
+                               "or estimate",
+                "schema": {"type": "string", "enum": ["exact", "estimate"]},
+            },
+        ]
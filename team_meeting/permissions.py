@@ -17,4 +17,4 @@ class IsOwnerOfObject(BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method == "GET":
             return True
-        return obj.user == request.user
+        return obj.user_id == request.user.id
@@ -0,0 +1,68 @@
+from rest_framework import serializers
+
+
+def plan_related(serializer, prefix="", prefetch=False):
+    """Return select_related and prefetch_related paths of a serializer
+
+    Model serializers declare the relations their own fields read in
+    select_related and prefetch_related attributes. Relations of nested
+    model serializers are joined by their source, every path below a
+    many=True field is prefetched.
+    """
+    select_paths, prefetch_paths = [], []
+
+    def add(path, many):
+        if prefetch or many:
+            prefetch_paths.append(prefix + path)
+        else:
+            select_paths.append(prefix + path)
+
+    for path in getattr(serializer, "select_related", ()):
+        add(path, False)
+    for path in getattr(serializer, "prefetch_related", ()):
+        add(path, True)
+
+    for field in serializer.fields.values():
+        many = isinstance(field, serializers.ListSerializer)
+        nested = field.child if many else field
+        if not isinstance(nested, serializers.ModelSerializer):
+            continue
+        if field.source == "*":
+            continue
+
+        path = field.source.replace(".", "__")
+        add(path, many)
+        nested_select, nested_prefetch = plan_related(
+            nested, f"{prefix}{path}__", prefetch or many
+        )
+        select_paths += nested_select
+        prefetch_paths += nested_prefetch
+
+    return select_paths, prefetch_paths
+
+
+def plan_queryset(queryset, serializer):
+    """Apply the related paths of the serializer if it serializes
+    the model of the queryset"""
+    if not isinstance(serializer, serializers.ModelSerializer):
+        return queryset
+    if serializer.Meta.model is not queryset.model:
+        return queryset
+
+    select_paths, prefetch_paths = plan_related(serializer)
+    if select_paths:
+        queryset = queryset.select_related(*select_paths)
+    if prefetch_paths:
+        queryset = queryset.prefetch_related(*prefetch_paths)
+    return queryset
+
+
+class PrefetchPlannerMixin:
+    """Load the relations that the serializer of the action reads
+    together with the queryset"""
+
+    def get_queryset(self):
+        serializer = self.get_serializer_class()(
+            context=self.get_serializer_context()
+        )
+        return plan_queryset(super().get_queryset(), serializer)
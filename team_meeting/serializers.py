@@ -1,15 +1,41 @@
+from datetime import date, timedelta
+
+from django.core.files.storage import default_storage
 from django.db import transaction
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
+from team_meeting import cache, feeds
 from team_meeting.models import (
     MeetingRoom,
     Project,
     TypeOfMeeting,
     Team,
     Meeting,
-    Booking
+    Booking,
+    RecurrenceException,
+    RoomOccupancy,
+    project_image_name,
 )
 
+BULK_BOOKINGS_MAX = 500
+AVAILABILITY_MAX_DAYS = 31
+ROOM_FINDER_MAX_RESULTS = 100
+
+
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field looking objects up in the "preloaded" context
+    first, so that many items are validated without a query each"""
+
+    def to_internal_value(self, data):
+        preloaded = self.context.get("preloaded", {}).get(
+            self.get_queryset().model, {}
+        )
+        if str(data) in preloaded:
+            return preloaded[str(data)]
+        return super().to_internal_value(data)
+
 
 class MeetingRoomSerializer(serializers.ModelSerializer):
 
@@ -18,7 +44,169 @@ class MeetingRoomSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class DateRangeQuerySerializer(serializers.Serializer):
+    def get_fields(self):
+        return {
+            "from": serializers.DateField(required=False),
+            "to": serializers.DateField(required=False),
+        }
+
+
+class AvailabilityQuerySerializer(DateRangeQuerySerializer):
+    def validate(self, attrs):
+        day_from = attrs.get("from", date.today())
+        day_to = attrs.get("to", day_from)
+
+        if day_to < day_from:
+            raise serializers.ValidationError(
+                "Date 'to' should not be earlier than 'from'"
+            )
+        if (day_to - day_from).days >= AVAILABILITY_MAX_DAYS:
+            raise serializers.ValidationError(
+                f"Date range should not exceed {AVAILABILITY_MAX_DAYS} days"
+            )
+
+        return {
+            "days": [
+                day_from + timedelta(days=offset)
+                for offset in range((day_to - day_from).days + 1)
+            ]
+        }
+
+
+class BookingExportQuerySerializer(DateRangeQuerySerializer):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fields["type"] = serializers.ChoiceField(
+            choices=[self.CSV, self.NDJSON], default=self.CSV
+        )
+        return fields
+
+    def validate(self, attrs):
+        if "from" in attrs and "to" in attrs and attrs["to"] < attrs["from"]:
+            raise serializers.ValidationError(
+                "Date 'to' should not be earlier than 'from'"
+            )
+
+        return attrs
+
+
+class CalendarFeedSerializer(serializers.Serializer):
+    url = serializers.URLField(read_only=True)
+
+
+class CalendarWindowQuerySerializer(serializers.Serializer):
+    past = serializers.IntegerField(
+        min_value=0,
+        max_value=feeds.CALENDAR_MAX_DAYS,
+        default=feeds.CALENDAR_PAST_DAYS,
+    )
+    future = serializers.IntegerField(
+        min_value=0,
+        max_value=feeds.CALENDAR_MAX_DAYS,
+        default=feeds.CALENDAR_FUTURE_DAYS,
+    )
+
+
+class FreeIntervalSerializer(serializers.Serializer):
+    start_hour = serializers.IntegerField()
+    end_hour = serializers.IntegerField()
+
+
+class RoomDayAvailabilitySerializer(serializers.Serializer):
+    day = serializers.DateField()
+    free = FreeIntervalSerializer(many=True)
+
+
+class MeetingRoomAvailabilitySerializer(serializers.ModelSerializer):
+    """Free hour intervals of a room, expects context with "days" and
+    "masks" mapping (room_id, day) to the occupancy mask"""
+
+    days = serializers.SerializerMethodField()
+
+    class Meta:
+        model = MeetingRoom
+        fields = ("id", "name", "days")
+
+    @extend_schema_field(RoomDayAvailabilitySerializer(many=True))
+    def get_days(self, room):
+        masks = self.context["masks"]
+        return [
+            {
+                "day": day,
+                "free": [
+                    {"start_hour": start_hour, "end_hour": end_hour}
+                    for start_hour, end_hour in RoomOccupancy.free_intervals(
+                        masks.get((room.id, day), 0)
+                    )
+                ],
+            }
+            for day in self.context["days"]
+        ]
+
+
+class RoomFinderQuerySerializer(serializers.Serializer):
+    team = serializers.PrimaryKeyRelatedField(
+        queryset=Team.objects.all(), required=False
+    )
+    headcount = serializers.IntegerField(min_value=1, required=False)
+    has_projector = serializers.BooleanField(default=False)
+    is_soundproof = serializers.BooleanField(default=False)
+    day = serializers.DateField()
+    start_hour = serializers.IntegerField(min_value=0, max_value=23)
+    end_hour = serializers.IntegerField(min_value=1, max_value=24)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=ROOM_FINDER_MAX_RESULTS, default=10
+    )
+
+    def validate(self, attrs):
+        Booking.validate_time(
+            attrs["start_hour"],
+            attrs["end_hour"],
+            serializers.ValidationError,
+        )
+        if "headcount" not in attrs:
+            if "team" not in attrs:
+                raise serializers.ValidationError(
+                    "Either team or headcount should be provided"
+                )
+            attrs["headcount"] = attrs["team"].num_of_members
+
+        return attrs
+
+
+@extend_schema_field(
+    {
+        "type": "object",
+        "additionalProperties": {
+            "type": "object",
+            "additionalProperties": {"type": "string", "format": "uri"},
+        },
+        "example": {"thumbnail": {"webp": "http://...", "jpeg": "http://..."}},
+    }
+)
+class ImageVariantsField(serializers.ReadOnlyField):
+    """URLs of the resized variants of an image by variant and format,
+    empty until the variants are generated"""
+
+    def to_representation(self, value):
+        request = self.context.get("request")
+        urls = {}
+        for variant, names in value.items():
+            urls[variant] = {}
+            for image_format, name in names.items():
+                url = default_storage.url(name)
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                urls[variant][image_format] = url
+        return urls
+
+
 class ProjectSerializer(serializers.ModelSerializer):
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Project
@@ -44,14 +232,31 @@ class ProjectRetrieveSerializer(ProjectSerializer):
 
     class Meta:
         model = Project
-        fields = ("id", "name", "description", "image", "teams")
+        fields = (
+            "id",
+            "name",
+            "description",
+            "image",
+            "image_variants",
+            "teams",
+        )
 
 
 class ProjectImageSerializer(ProjectSerializer):
 
     class Meta:
         model = Project
-        fields = ("id", "image")
+        fields = ("id", "image", "image_variants")
+
+    def update(self, instance, validated_data):
+        image = validated_data.get("image")
+        if image:
+            name = project_image_name(image, image.name)
+            if instance.image.storage.exists(name):
+                # the same content is stored already
+                validated_data["image"] = name
+
+        return super().update(instance, validated_data)
 
 
 class TypeOfMeetingSerializer(serializers.ModelSerializer):
@@ -69,6 +274,8 @@ class TeamSerializer(serializers.ModelSerializer):
 
 
 class TeamListSerializer(TeamSerializer):
+    select_related = ("project",)
+
     project = serializers.CharField(
         source="project.name", read_only=True
     )
@@ -94,6 +301,8 @@ class MeetingSerializer(serializers.ModelSerializer):
 
 
 class MeetingListSerializer(serializers.ModelSerializer):
+    select_related = ("team__project", "type_of_meeting")
+
     team = serializers.SlugRelatedField(
         slug_field="name",
         read_only=True
@@ -116,6 +325,7 @@ class MeetingListSerializer(serializers.ModelSerializer):
 
 
 class MeetingCreateSerializer(serializers.ModelSerializer):
+    serializer_related_field = PreloadedPrimaryKeyRelatedField
 
     class Meta:
         model = Meeting
@@ -123,6 +333,8 @@ class MeetingCreateSerializer(serializers.ModelSerializer):
 
 
 class MeetingRetrieveSerializer(serializers.ModelSerializer):
+    select_related = ("team", "type_of_meeting")
+
     team = serializers.CharField(source="team.name")
     project = ProjectRetrieveSerializer(source="team.project")
     type_of_meeting = serializers.CharField()
@@ -146,6 +358,8 @@ class BookingSerializer(serializers.ModelSerializer):
 
 
 class BookingMeetingSerializer(serializers.ModelSerializer):
+    select_related = ("team__project", "type_of_meeting")
+
     team = serializers.CharField(source="team.name")
     project = serializers.CharField(source="team.project.name")
     type_of_meeting = serializers.CharField()
@@ -155,15 +369,75 @@ class BookingMeetingSerializer(serializers.ModelSerializer):
         fields = ("team", "project", "type_of_meeting")
 
 
+class BookingRecurrenceSerializer(serializers.Serializer):
+    frequency = serializers.CharField()
+    interval = serializers.IntegerField()
+    repeat_until = serializers.DateField(allow_null=True)
+    repeat_count = serializers.IntegerField(allow_null=True)
+
+
 class BookingListSerializer(BookingSerializer):
+    select_related = ("room", "user")
+
     time = serializers.CharField(source="duration", read_only=True)
     room = serializers.CharField(source="room.name")
     user = serializers.CharField(source="user.email")
     meeting = BookingMeetingSerializer()
+    recurrence = BookingRecurrenceSerializer(
+        source="recurrence_rule", read_only=True, allow_null=True
+    )
 
     class Meta:
         model = Booking
-        fields = ("id", "day", "time", "room", "user", "meeting")
+        fields = (
+            "id", "day", "time", "room", "user", "meeting", "recurrence"
+        )
+
+
+# columns of booking_list_row, ordering fields of Booking included
+BOOKING_LIST_COLUMNS = (
+    "id",
+    "day",
+    "start_hour",
+    "end_hour",
+    "room__name",
+    "user__email",
+    "meeting__team__name",
+    "meeting__team__project__name",
+    "meeting__type_of_meeting__name",
+    "frequency",
+    "interval",
+    "repeat_until",
+    "repeat_count",
+)
+
+
+def booking_list_row(row):
+    """Return BookingListSerializer representation of a booking
+    from its BOOKING_LIST_COLUMNS values, without model instances"""
+    recurrence = None
+    if row["frequency"]:
+        repeat_until = row["repeat_until"]
+        recurrence = {
+            "frequency": row["frequency"],
+            "interval": row["interval"],
+            "repeat_until": repeat_until and repeat_until.isoformat(),
+            "repeat_count": row["repeat_count"],
+        }
+
+    return {
+        "id": row["id"],
+        "day": row["day"].isoformat(),
+        "time": f"{row['start_hour']}:00 - {row['end_hour']}:00",
+        "room": row["room__name"],
+        "user": row["user__email"],
+        "meeting": {
+            "team": row["meeting__team__name"],
+            "project": row["meeting__team__project__name"],
+            "type_of_meeting": row["meeting__type_of_meeting__name"],
+        },
+        "recurrence": recurrence,
+    }
 
 
 class BookingRetrieveSerializer(BookingListSerializer):
@@ -172,11 +446,39 @@ class BookingRetrieveSerializer(BookingListSerializer):
 
 
 class BookingCreateSerializer(BookingSerializer):
+    serializer_related_field = PreloadedPrimaryKeyRelatedField
     meeting = MeetingCreateSerializer(read_only=False)
 
     class Meta:
         model = Booking
-        fields = ("room", "day", "start_hour", "end_hour", "meeting")
+        fields = (
+            "room",
+            "day",
+            "start_hour",
+            "end_hour",
+            "frequency",
+            "interval",
+            "repeat_until",
+            "repeat_count",
+            "meeting",
+        )
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        Booking.validate_time(
+            data["start_hour"],
+            data["end_hour"],
+            serializers.ValidationError,
+        )
+        Booking.validate_recurrence(
+            data["day"],
+            data.get("frequency"),
+            data.get("interval", 1),
+            data.get("repeat_until"),
+            data.get("repeat_count"),
+            serializers.ValidationError,
+        )
+        return data
 
     def create(self, validated_data):
         with transaction.atomic():
@@ -188,11 +490,138 @@ class BookingCreateSerializer(BookingSerializer):
             return booking
 
 
+class BookingBulkCreateSerializer(serializers.Serializer):
+    bookings = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=BULK_BOOKINGS_MAX,
+    )
+    all_or_nothing = serializers.BooleanField(default=False)
+
+    @staticmethod
+    def preload(items):
+        """Fetch rooms, teams and types of meeting of all items at once"""
+        meetings = [
+            item["meeting"] for item in items
+            if isinstance(item.get("meeting"), dict)
+        ]
+        lookups = (
+            (MeetingRoom, items, "room"),
+            (Team, meetings, "team"),
+            (TypeOfMeeting, meetings, "type_of_meeting"),
+        )
+        preloaded = {}
+        for model, values, name in lookups:
+            ids = {
+                str(value[name]) for value in values
+                if str(value.get(name)).isdigit()
+            }
+            preloaded[model] = {
+                str(pk): obj
+                for pk, obj in model.objects.in_bulk(ids).items()
+            }
+        return preloaded
+
+    def validate(self, attrs):
+        valid, errors = {}, {}
+        context = dict(
+            self.context, preloaded=self.preload(attrs["bookings"])
+        )
+        for index, data in enumerate(attrs["bookings"]):
+            serializer = BookingCreateSerializer(data=data, context=context)
+            if serializer.is_valid():
+                valid[index] = serializer.validated_data
+            else:
+                errors[index] = serializer.errors
+
+        if errors and attrs["all_or_nothing"]:
+            raise serializers.ValidationError({"bookings": errors})
+
+        attrs["bookings"] = valid
+        attrs["errors"] = errors
+        return attrs
+
+    def create(self, validated_data):
+        """Create all bookings that conflict neither with existing
+        bookings nor with each other, in one transaction"""
+        errors = validated_data["errors"]
+        meetings, bookings = [], []
+        slots = {}
+        for index, item in validated_data["bookings"].items():
+            item = dict(item)
+            meetings.append(
+                Meeting(requires_meeting_room=True, **item.pop("meeting"))
+            )
+            bookings.append(Booking(user=validated_data["user"], **item))
+            slots[index] = bookings[-1].get_slots()
+
+        with transaction.atomic():
+            occupancies = RoomOccupancy.lock(
+                (room_id, day)
+                for booking_slots in slots.values()
+                for room_id, day, _ in booking_slots
+            )
+            accepted = []
+            for index, meeting, booking in zip(slots, meetings, bookings):
+                conflicts = RoomOccupancy.find_conflicts(
+                    occupancies, slots[index]
+                )
+                if conflicts:
+                    error = Booking.conflicts_error(
+                        conflicts,
+                        len(slots[index]) > 1,
+                        serializers.ValidationError,
+                    )
+                    errors[index] = {
+                        api_settings.NON_FIELD_ERRORS_KEY: error.detail
+                    }
+                    continue
+                RoomOccupancy.occupy(occupancies, slots[index])
+                accepted.append((meeting, booking))
+
+            if errors and validated_data["all_or_nothing"]:
+                raise serializers.ValidationError({"bookings": errors})
+
+            Meeting.objects.bulk_create(
+                meeting for meeting, _ in accepted
+            )
+            for meeting, booking in accepted:
+                booking.meeting = meeting
+            created = Booking.objects.bulk_create(
+                booking for _, booking in accepted
+            )
+            RoomOccupancy.objects.bulk_update(
+                occupancies.values(), ["mask"]
+            )
+            # bulk_create sends no post_save
+            cache.invalidate(Meeting)
+            cache.invalidate(Booking)
+            for booking in created:
+                feeds.invalidate_booking(booking)
+
+        return {"created": created, "errors": dict(sorted(errors.items()))}
+
+    def to_representation(self, instance):
+        return {
+            "created": BookingSerializer(instance["created"], many=True).data,
+            "errors": instance["errors"],
+        }
+
+
 class BookingUpdateSerializer(BookingSerializer):
 
     class Meta:
         model = Booking
-        fields = ("room", "day", "start_hour", "end_hour")
+        fields = (
+            "room",
+            "day",
+            "start_hour",
+            "end_hour",
+            "frequency",
+            "interval",
+            "repeat_until",
+            "repeat_count",
+        )
 
     def update(self, instance, validated_data):
 
@@ -202,6 +631,64 @@ class BookingUpdateSerializer(BookingSerializer):
             "start_hour", instance.start_hour
         )
         instance.end_hour = validated_data.get("end_hour", instance.end_hour)
+        for field in (
+            "frequency", "interval", "repeat_until", "repeat_count"
+        ):
+            setattr(
+                instance, field, validated_data.get(
+                    field, getattr(instance, field)
+                )
+            )
         instance.save()
 
         return instance
+
+
+class OccurrenceSerializer(serializers.Serializer):
+    original_day = serializers.DateField()
+    day = serializers.DateField()
+    start_hour = serializers.IntegerField()
+    end_hour = serializers.IntegerField()
+
+
+class RecurrenceExceptionSerializer(serializers.ModelSerializer):
+    day = serializers.DateField(required=False)
+    start_hour = serializers.IntegerField(
+        min_value=0, max_value=23, required=False
+    )
+    end_hour = serializers.IntegerField(
+        min_value=1, max_value=24, required=False
+    )
+
+    class Meta:
+        model = RecurrenceException
+        fields = (
+            "id", "original_day", "is_cancelled", "day", "start_hour",
+            "end_hour"
+        )
+
+    def validate(self, attrs):
+        booking = self.context["booking"]
+        if not booking.is_recurring:
+            raise serializers.ValidationError(
+                "Only recurring bookings can have exceptions"
+            )
+        if attrs["original_day"] not in Booking.occurrence_days(
+            booking.day,
+            booking.frequency,
+            booking.interval,
+            booking.repeat_until,
+            booking.repeat_count,
+        ):
+            raise serializers.ValidationError(
+                "Original day is not an occurrence of the booking"
+            )
+        Booking.validate_time(
+            attrs.get("start_hour", booking.start_hour),
+            attrs.get("end_hour", booking.end_hour),
+            serializers.ValidationError,
+        )
+        return attrs
+
+    def create(self, validated_data):
+        return self.context["booking"].add_exception(**validated_data)
@@ -0,0 +1,90 @@
+from django.conf import settings
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from team_meeting import cache, feeds
+from team_meeting.models import (
+    Booking,
+    Meeting,
+    MeetingRoom,
+    Project,
+    RecurrenceException,
+    RoomOccupancy,
+    Team,
+    TypeOfMeeting,
+)
+
+
+@receiver(pre_delete, sender=Booking)
+def collect_booking_hours(sender, instance, **kwargs):
+    # exceptions of the booking are deleted before post_delete is sent
+    instance._released = instance.get_occupied()
+
+
+@receiver(post_delete, sender=Booking)
+def release_booking_hours(sender, instance, **kwargs):
+    RoomOccupancy.release_all(instance._released)
+
+
+@receiver(post_save, sender=MeetingRoom)
+@receiver(post_delete, sender=MeetingRoom)
+@receiver(post_save, sender=TypeOfMeeting)
+@receiver(post_delete, sender=TypeOfMeeting)
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+def invalidate_reference_data(sender, **kwargs):
+    cache.invalidate(sender)
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+@receiver(post_save, sender=RecurrenceException)
+@receiver(post_delete, sender=RecurrenceException)
+@receiver(post_save, sender=Meeting)
+@receiver(post_delete, sender=Meeting)
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_booking_data(sender, **kwargs):
+    cache.invalidate(sender)
+
+
+@receiver(pre_save, sender=Booking)
+def invalidate_stored_room_calendar(sender, instance, **kwargs):
+    # the booking may be moved out of the room it is stored in
+    if instance._stored is not None:
+        feeds.invalidate_scope(feeds.ROOM, instance._stored[0])
+
+
+@receiver(post_save, sender=Booking)
+@receiver(pre_delete, sender=Booking)
+def invalidate_booking_calendars(sender, instance, **kwargs):
+    feeds.invalidate_booking(instance)
+
+
+@receiver(post_save, sender=RecurrenceException)
+@receiver(post_delete, sender=RecurrenceException)
+def invalidate_exception_calendars(sender, instance, **kwargs):
+    feeds.invalidate_booking(instance.booking)
+
+
+@receiver(pre_save, sender=Meeting)
+def invalidate_stored_team_calendar(sender, instance, **kwargs):
+    if instance.pk is not None:
+        feeds.invalidate_scope(
+            feeds.TEAM,
+            Meeting.objects.filter(pk=instance.pk).values_list(
+                "team_id", flat=True
+            ).first(),
+        )
+
+
+@receiver(post_save, sender=Meeting)
+def invalidate_team_calendar(sender, instance, **kwargs):
+    feeds.invalidate_scope(feeds.TEAM, instance.team_id)
@@ -0,0 +1,53 @@
+from asgiref.sync import async_to_sync
+from django.core.handlers.asgi import ASGIHandler
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections
+
+
+def asgi_get(path, query_string="", headers=None):
+    """Serve a GET request with the ASGI handler, as an ASGI server
+    does, return the status, headers and body of the response
+
+    Unlike AsyncClient, the handler iterates streaming responses
+    in the event loop.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "query_string": query_string.encode(),
+        "headers": [
+            (name.lower().encode(), value.encode())
+            for name, value in (headers or {}).items()
+        ],
+        "server": ("testserver", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    # connections of the test case are kept open
+    request_started.disconnect(close_old_connections)
+    request_finished.disconnect(close_old_connections)
+    try:
+        async_to_sync(ASGIHandler())(scope, receive, send)
+    finally:
+        request_started.connect(close_old_connections)
+        request_finished.connect(close_old_connections)
+
+    start = messages[0]
+    return (
+        start["status"],
+        {
+            name.decode(): value.decode()
+            for name, value in start["headers"]
+        },
+        b"".join(message.get("body", b"") for message in messages[1:]),
+    )
@@ -0,0 +1,232 @@
+import asyncio
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from team_meeting.cache import get_reference_cache
+from team_meeting.models import (
+    MeetingRoom,
+    Project,
+    Team,
+    TypeOfMeeting,
+    Meeting,
+    Booking,
+)
+from team_meeting.pagination import MeetingBookingPagination
+
+ASYNC_BOOKING_URL = reverse("team-meeting:async-booking-list")
+ASYNC_ROOM_URL = reverse("team-meeting:async-meeting-room-list")
+ASYNC_AVAILABILITY_URL = reverse(
+    "team-meeting:async-meeting-room-availability"
+)
+BOOKING_URL = reverse("team-meeting:booking-list")
+ROOM_URL = reverse("team-meeting:meetingroom-list")
+AVAILABILITY_URL = reverse("team-meeting:meetingroom-rooms-availability")
+
+
+def async_availability_url(room_id):
+    return reverse(
+        "team-meeting:async-meeting-room-detail-availability",
+        args=[room_id],
+    )
+
+
+def availability_url(room_id):
+    return reverse("team-meeting:meetingroom-availability", args=[room_id])
+
+
+class AsyncReadViewTests(TestCase):
+    def setUp(self):
+        get_reference_cache().clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpassword",
+        )
+        self.client.force_authenticate(self.user)
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+
+        self.room = MeetingRoom.objects.create(name="Blue", capacity=20)
+        MeetingRoom.objects.create(name="Green", capacity=5)
+        project = Project.objects.create(name="Taxi")
+        team = Team.objects.create(
+            name="Backend", project=project, num_of_members=5
+        )
+        type_of_meeting = TypeOfMeeting.objects.create(name="Weekly")
+        for hour in range(12):
+            Booking.objects.create(
+                room=self.room,
+                day="2023-01-02",
+                start_hour=hour,
+                end_hour=hour + 1,
+                user=self.user,
+                meeting=Meeting.objects.create(
+                    team=team, type_of_meeting=type_of_meeting
+                ),
+                frequency=Booking.DAILY if hour % 2 else "",
+                repeat_count=3 if hour % 2 else None,
+            )
+
+    def get(self, url, data=None, **headers):
+        headers.setdefault("AUTHORIZATION", f"Bearer {self.token}")
+
+        async def get():
+            return await self.async_client.get(url, data, **headers)
+
+        return async_to_sync(get)()
+
+    def assertSameResponse(self, async_url, url, data=None):
+        """Assert the async view responds as the viewset, links aside"""
+        res = self.get(async_url, data)
+        expected = self.client.get(url, data)
+
+        self.assertEqual(res.status_code, expected.status_code)
+        self.assertEqual(res["Content-Type"], "application/json")
+        self.assertEqual(
+            res.json(),
+            json.loads(expected.content.decode().replace(url, async_url)),
+        )
+
+    def test_booking_list(self):
+        for data in (
+            {},
+            {"page": 2},
+            {"page": 3},
+            {"page": 9},
+            {"count": "estimate"},
+            {"day": "2023-01-02", "room": "blu"},
+            {"pagination": "cursor"},
+        ):
+            with self.subTest(data=data):
+                self.assertSameResponse(ASYNC_BOOKING_URL, BOOKING_URL, data)
+
+    def test_booking_list_next_cursor(self):
+        res = self.get(ASYNC_BOOKING_URL, {"pagination": "cursor"})
+        res = self.get(res.json()["next"])
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.json()["results"]), 2)
+
+    def test_booking_list_not_modified(self):
+        res = self.get(ASYNC_BOOKING_URL)
+        etag = res["ETag"]
+
+        res = self.get(ASYNC_BOOKING_URL, IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Booking.objects.first().delete()
+        res = self.get(ASYNC_BOOKING_URL, IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_booking_list_runs_no_sync_code(self):
+        # users, throttle counters, stamps and rows are fetched async
+        with mock.patch(
+            "team_meeting.views.sync_to_async",
+            side_effect=AssertionError("sync code called"),
+        ):
+            for data in ({}, {"count": "estimate"}, {"pagination": "cursor"}):
+                res = self.get(ASYNC_BOOKING_URL, data)
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_queries_are_recorded(self):
+        # load the user and create the throttle counter
+        self.get(ASYNC_BOOKING_URL)
+
+        res = self.get(ASYNC_BOOKING_URL)
+
+        # the throttle counter, the count and the page
+        self.assertEqual(res.asgi_request.query_recorder.count, 3)
+
+    # the sync debug toolbar would serve requests one by one
+    @override_settings(
+        MIDDLEWARE=[
+            name for name in settings.MIDDLEWARE
+            if not name.startswith("debug_toolbar")
+        ]
+    )
+    def test_concurrent_requests_are_recorded_apart(self):
+        counts = []
+        for url in (ASYNC_BOOKING_URL, ASYNC_ROOM_URL):
+            self.get(url)
+            counts.append(self.get(url).asgi_request.query_recorder.count)
+
+        paginate = MeetingBookingPagination.apaginate_queryset
+        started, resume = asyncio.Event(), asyncio.Event()
+
+        async def paginate_later(*args, **kwargs):
+            started.set()
+            await asyncio.wait_for(resume.wait(), 10)
+            return await paginate(*args, **kwargs)
+
+        headers = {"AUTHORIZATION": f"Bearer {self.token}"}
+
+        async def get_room_list():
+            # while the booking list waits for its page
+            await asyncio.wait_for(started.wait(), 10)
+            res = await self.async_client.get(ASYNC_ROOM_URL, **headers)
+            resume.set()
+            return res
+
+        async def get_together():
+            return await asyncio.gather(
+                self.async_client.get(ASYNC_BOOKING_URL, **headers),
+                get_room_list(),
+            )
+
+        with mock.patch.object(
+            MeetingBookingPagination, "apaginate_queryset", paginate_later
+        ):
+            responses = async_to_sync(get_together)()
+
+        self.assertEqual(
+            [res.asgi_request.query_recorder.count for res in responses],
+            counts,
+        )
+
+    def test_room_list(self):
+        self.assertSameResponse(ASYNC_ROOM_URL, ROOM_URL)
+        # from the reference data cache
+        self.assertSameResponse(ASYNC_ROOM_URL, ROOM_URL)
+
+    def test_availability(self):
+        for data in (
+            {"from": "2023-01-01", "to": "2023-01-04"},
+            {"from": "2023-01-04", "to": "2023-01-01"},
+        ):
+            with self.subTest(data=data):
+                self.assertSameResponse(
+                    ASYNC_AVAILABILITY_URL, AVAILABILITY_URL, data
+                )
+                self.assertSameResponse(
+                    async_availability_url(self.room.id),
+                    availability_url(self.room.id),
+                    data,
+                )
+
+    def test_availability_of_missing_room(self):
+        res = self.get(async_availability_url(self.room.id + 100))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_auth_required(self):
+        for token in ("", "invalid"):
+            res = self.get(ASYNC_BOOKING_URL, AUTHORIZATION=f"Bearer {token}")
+
+            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+            self.assertIn("WWW-Authenticate", res)
+
+    def test_inactive_user(self):
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.get(ASYNC_BOOKING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,120 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from team_meeting.models import (
+    MeetingRoom,
+    Project,
+    Team,
+    TypeOfMeeting,
+    Meeting,
+    Booking,
+    RoomOccupancy,
+    hours_mask,
+)
+
+BOOKING_BULK_URL = reverse("team-meeting:booking-bulk-create")
+
+
+class BookingBulkApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpassword",
+        )
+        self.client.force_authenticate(self.user)
+
+        self.room = MeetingRoom.objects.create(name="Blue", capacity=20)
+        project = Project.objects.create(name="Taxi")
+        self.team = Team.objects.create(
+            name="Backend", project=project, num_of_members=5
+        )
+        self.type_of_meeting = TypeOfMeeting.objects.create(name="Weekly")
+
+        Booking.objects.create(
+            room=self.room,
+            day="2023-01-01",
+            start_hour=10,
+            end_hour=12,
+            user=self.user,
+            meeting=Meeting.objects.create(
+                team=self.team, type_of_meeting=self.type_of_meeting
+            ),
+        )
+
+    def booking_payload(self, day, start_hour, end_hour):
+        return {
+            "room": self.room.id,
+            "day": day,
+            "start_hour": start_hour,
+            "end_hour": end_hour,
+            "meeting": {
+                "team": self.team.id,
+                "type_of_meeting": self.type_of_meeting.id,
+            },
+        }
+
+    def test_bulk_create_bookings(self):
+        payload = {
+            "bookings": [
+                self.booking_payload("2023-01-01", 12, 13),
+                self.booking_payload("2023-01-02", 10, 12),
+                self.booking_payload("2023-01-02", 12, 14),
+            ]
+        }
+        res = self.client.post(BOOKING_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data["created"]), 3)
+        self.assertEqual(res.data["errors"], {})
+        self.assertEqual(Booking.objects.count(), 4)
+        self.assertEqual(Meeting.objects.count(), 4)
+        self.assertEqual(
+            RoomOccupancy.get_mask(self.room, "2023-01-02"), hours_mask(10, 14)
+        )
+
+    def test_bulk_create_reports_conflicting_bookings(self):
+        payload = {
+            "bookings": [
+                self.booking_payload("2023-01-01", 11, 13),
+                self.booking_payload("2023-01-02", 10, 12),
+                self.booking_payload("2023-01-02", 11, 12),
+                self.booking_payload("2023-01-02", 15, 12),
+            ]
+        }
+        res = self.client.post(BOOKING_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(len(res.data["created"]), 1)
+        self.assertEqual(list(res.data["errors"]), [0, 2, 3])
+        self.assertEqual(Booking.objects.count(), 2)
+
+    def test_bulk_create_all_or_nothing(self):
+        payload = {
+            "bookings": [
+                self.booking_payload("2023-01-02", 10, 12),
+                self.booking_payload("2023-01-01", 9, 11),
+            ],
+            "all_or_nothing": True,
+        }
+        res = self.client.post(BOOKING_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(1, res.data["bookings"])
+        self.assertEqual(Booking.objects.count(), 1)
+        self.assertEqual(RoomOccupancy.get_mask(self.room, "2023-01-02"), 0)
+
+    def test_bulk_create_with_invalid_data(self):
+        payload = {
+            "bookings": [
+                {"room": self.room.id, "day": "2023-01-02"},
+            ],
+        }
+        res = self.client.post(BOOKING_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(res.data["errors"]), [0])
+        self.assertEqual(Booking.objects.count(), 1)
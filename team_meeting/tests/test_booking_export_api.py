@@ -0,0 +1,123 @@
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from team_meeting.export import join_chunks
+from team_meeting.models import (
+    MeetingRoom,
+    Project,
+    Team,
+    TypeOfMeeting,
+    Meeting,
+    Booking,
+)
+from team_meeting.tests.asgi import asgi_get
+
+BOOKING_EXPORT_URL = reverse("team-meeting:booking-export")
+
+
+class BookingExportApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpassword",
+        )
+        self.client.force_authenticate(self.user)
+
+        self.room = MeetingRoom.objects.create(name="Blue", capacity=20)
+        self.other_room = MeetingRoom.objects.create(name="Green", capacity=5)
+        project = Project.objects.create(name="Taxi")
+        self.team = Team.objects.create(
+            name="Backend", project=project, num_of_members=5
+        )
+        self.type_of_meeting = TypeOfMeeting.objects.create(name="Weekly")
+
+        self.book(self.room, "2023-01-01")
+        self.book(self.other_room, "2023-01-15")
+        self.book(self.room, "2023-02-01")
+
+    def book(self, room, day):
+        return Booking.objects.create(
+            room=room,
+            day=day,
+            start_hour=10,
+            end_hour=12,
+            user=self.user,
+            meeting=Meeting.objects.create(
+                team=self.team, type_of_meeting=self.type_of_meeting
+            ),
+        )
+
+    def export(self, **params):
+        res = self.client.get(BOOKING_EXPORT_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        return res, b"".join(res.streaming_content).decode()
+
+    def test_export_csv(self):
+        res, content = self.export()
+
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(res["Content-Type"], "text/csv")
+        self.assertIn('filename="bookings.csv"', res["Content-Disposition"])
+        self.assertEqual(
+            [row["day"] for row in rows],
+            ["2023-01-01", "2023-01-15", "2023-02-01"],
+        )
+        self.assertEqual(rows[0]["room"], "Blue")
+        self.assertEqual(rows[0]["user"], "test@test.com")
+        self.assertEqual(rows[0]["project"], "Taxi")
+        self.assertEqual(rows[0]["repeat_until"], "")
+
+    def test_export_ndjson_with_date_range(self):
+        res, content = self.export(
+            type="ndjson", **{"from": "2023-01-01", "to": "2023-01-31"}
+        )
+
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+        self.assertEqual(
+            [row["day"] for row in rows], ["2023-01-01", "2023-01-15"]
+        )
+        self.assertEqual(rows[0]["frequency"], "")
+
+    def test_export_with_filters(self):
+        _, content = self.export(type="ndjson", room="green")
+
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([row["room"] for row in rows], ["Green"])
+
+    def test_export_under_asgi(self):
+        token = RefreshToken.for_user(self.user).access_token
+        status_code, headers, body = asgi_get(
+            BOOKING_EXPORT_URL,
+            "type=ndjson",
+            {"Authorization": f"Bearer {token}"},
+        )
+
+        self.assertEqual(status_code, status.HTTP_200_OK)
+        self.assertEqual(headers["Content-Type"], "application/x-ndjson")
+        _, content = self.export(type="ndjson")
+        self.assertEqual(body.decode(), content)
+
+    def test_export_with_invalid_params(self):
+        for params in (
+            {"type": "xml"},
+            {"from": "2023-02-01", "to": "2023-01-01"},
+        ):
+            res = self.client.get(BOOKING_EXPORT_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_join_chunks(self):
+        self.assertEqual(
+            list(join_chunks(["a", "b", "c"], size=2)), ["ab", "c"]
+        )
+        self.assertEqual(list(join_chunks([], size=2)), [])
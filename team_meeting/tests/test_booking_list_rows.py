@@ -0,0 +1,114 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from team_meeting.models import (
+    MeetingRoom,
+    Project,
+    Team,
+    TypeOfMeeting,
+    Meeting,
+    Booking,
+)
+from team_meeting.serializers import (
+    BOOKING_LIST_COLUMNS,
+    BookingListSerializer,
+    booking_list_row,
+)
+
+BOOKING_URL = reverse("team-meeting:booking-list")
+
+
+class BookingListRowTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpassword",
+        )
+        self.client.force_authenticate(self.user)
+
+        room = MeetingRoom.objects.create(name="Blue", capacity=20)
+        project = Project.objects.create(name="Taxi")
+        team = Team.objects.create(
+            name="Backend", project=project, num_of_members=5
+        )
+        type_of_meeting = TypeOfMeeting.objects.create(name="Weekly")
+
+        for index, params in enumerate(
+            (
+                {},
+                {"frequency": Booking.DAILY, "repeat_count": 3},
+                {
+                    "frequency": Booking.WEEKLY,
+                    "interval": 2,
+                    "repeat_until": "2023-03-01",
+                },
+            )
+        ):
+            Booking.objects.create(
+                room=room,
+                day="2023-01-01",
+                start_hour=index * 2,
+                end_hour=index * 2 + 1,
+                user=self.user,
+                meeting=Meeting.objects.create(
+                    team=team, type_of_meeting=type_of_meeting
+                ),
+                **params,
+            )
+
+    def test_parity_with_serializer(self):
+        bookings = Booking.objects.all()
+
+        rows = [
+            booking_list_row(row)
+            for row in bookings.values(*BOOKING_LIST_COLUMNS)
+        ]
+        serializer = BookingListSerializer(bookings, many=True)
+
+        self.assertEqual(
+            json.dumps(rows), json.dumps(serializer.data)
+        )
+
+    def test_list_response_matches_serializer(self):
+        serializer = BookingListSerializer(Booking.objects.all(), many=True)
+
+        for params in ({}, {"pagination": "cursor"}):
+            res = self.client.get(BOOKING_URL, params)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                json.dumps(res.data["results"]), json.dumps(serializer.data)
+            )
+
+    def test_cursor_pages_of_rows(self):
+        booking = Booking.objects.first()
+        for hour in range(10, 20):
+            Booking.objects.create(
+                room=booking.room,
+                day="2023-01-02",
+                start_hour=hour,
+                end_hour=hour + 1,
+                user=self.user,
+                meeting=Meeting.objects.create(
+                    team=booking.meeting.team,
+                    type_of_meeting=booking.meeting.type_of_meeting,
+                ),
+            )
+
+        ids = []
+        url = BOOKING_URL + "?pagination=cursor"
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids += [row["id"] for row in res.data["results"]]
+            url = res.data["next"]
+
+        self.assertEqual(
+            ids, list(Booking.objects.values_list("id", flat=True))
+        )
@@ -0,0 +1,261 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from team_meeting.models import (
+    MeetingRoom,
+    Project,
+    Team,
+    TypeOfMeeting,
+    Meeting,
+    Booking,
+    RoomOccupancy,
+    hours_mask,
+)
+
+BOOKING_URL = reverse("team-meeting:booking-list")
+
+
+def occurrences_url(booking_id):
+    return reverse("team-meeting:booking-occurrences", args=[booking_id])
+
+
+def exceptions_url(booking_id):
+    return reverse("team-meeting:booking-exceptions", args=[booking_id])
+
+
+class BookingRecurrenceApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpassword",
+        )
+        self.client.force_authenticate(self.user)
+
+        self.room = MeetingRoom.objects.create(name="Blue", capacity=20)
+        project = Project.objects.create(name="Taxi")
+        self.team = Team.objects.create(
+            name="Backend", project=project, num_of_members=5
+        )
+        self.type_of_meeting = TypeOfMeeting.objects.create(name="Weekly")
+
+    def book(self, day, start_hour, end_hour, user=None, **params):
+        return Booking.objects.create(
+            room=self.room,
+            day=day,
+            start_hour=start_hour,
+            end_hour=end_hour,
+            user=user or self.user,
+            meeting=Meeting.objects.create(
+                team=self.team, type_of_meeting=self.type_of_meeting
+            ),
+            **params,
+        )
+
+    def book_weekly(self):
+        return self.book(
+            "2023-01-02", 10, 11, frequency=Booking.WEEKLY, repeat_count=4
+        )
+
+    def occupied(self, day):
+        return RoomOccupancy.get_mask(self.room, day)
+
+    def test_create_recurring_booking(self):
+        payload = {
+            "room": self.room.id,
+            "day": "2023-01-02",
+            "start_hour": 10,
+            "end_hour": 11,
+            "frequency": "WEEKLY",
+            "interval": 2,
+            "repeat_until": "2023-02-26",
+            "meeting": {
+                "team": self.team.id,
+                "type_of_meeting": self.type_of_meeting.id,
+            },
+        }
+        res = self.client.post(BOOKING_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Booking.objects.count(), 1)
+        for day in ("2023-01-02", "2023-01-16", "2023-01-30", "2023-02-13"):
+            self.assertEqual(self.occupied(day), hours_mask(10, 11))
+        self.assertEqual(self.occupied("2023-01-09"), 0)
+        self.assertEqual(self.occupied("2023-02-27"), 0)
+
+    def test_recurring_booking_requires_end(self):
+        payload = {
+            "room": self.room.id,
+            "day": "2023-01-02",
+            "start_hour": 10,
+            "end_hour": 11,
+            "frequency": "DAILY",
+            "meeting": {
+                "team": self.team.id,
+                "type_of_meeting": self.type_of_meeting.id,
+            },
+        }
+        res = self.client.post(BOOKING_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_recurring_booking_of_too_many_occurrences(self):
+        payload = {
+            "room": self.room.id,
+            "day": "2023-01-02",
+            "start_hour": 10,
+            "end_hour": 11,
+            "frequency": "DAILY",
+            "repeat_until": "2024-12-31",
+            "meeting": {
+                "team": self.team.id,
+                "type_of_meeting": self.type_of_meeting.id,
+            },
+        }
+        res = self.client.post(BOOKING_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("366", str(res.data))
+        self.assertFalse(Booking.objects.exists())
+
+        # the 366th occurrence is the last one
+        res = self.client.post(
+            BOOKING_URL,
+            dict(payload, repeat_until="2024-01-02"),
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(RoomOccupancy.objects.count(), 366)
+
+    def test_update_to_too_many_occurrences(self):
+        booking = self.book_weekly()
+
+        res = self.client.patch(
+            reverse("team-meeting:booking-detail", args=[booking.id]),
+            {"repeat_count": None, "repeat_until": "2030-12-31"},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        booking.refresh_from_db()
+        self.assertEqual(booking.repeat_count, 4)
+
+    def test_recurring_booking_conflicts_checked_for_whole_series(self):
+        self.book("2023-01-16", 9, 12)
+
+        with self.assertRaisesMessage(ValidationError, "on 2023-01-16"):
+            self.book_weekly()
+
+        self.assertEqual(Booking.objects.count(), 1)
+        self.assertEqual(self.occupied("2023-01-02"), 0)
+
+    def test_list_occurrences(self):
+        booking = self.book_weekly()
+
+        res = self.client.get(occurrences_url(booking.id))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [occurrence["day"] for occurrence in res.data],
+            ["2023-01-02", "2023-01-09", "2023-01-16", "2023-01-23"],
+        )
+
+        res = self.client.get(
+            occurrences_url(booking.id),
+            {"from": "2023-01-05", "to": "2023-01-20"},
+        )
+        self.assertEqual(
+            [occurrence["day"] for occurrence in res.data],
+            ["2023-01-09", "2023-01-16"],
+        )
+
+    def test_cancel_occurrence(self):
+        booking = self.book_weekly()
+
+        res = self.client.post(
+            exceptions_url(booking.id),
+            {"original_day": "2023-01-09", "is_cancelled": True},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.occupied("2023-01-09"), 0)
+        self.assertEqual(self.occupied("2023-01-16"), hours_mask(10, 11))
+        self.book("2023-01-09", 10, 11)
+
+    def test_move_occurrence(self):
+        booking = self.book_weekly()
+        self.book("2023-01-10", 14, 15)
+
+        res = self.client.post(
+            exceptions_url(booking.id),
+            {"original_day": "2023-01-09", "day": "2023-01-10",
+             "start_hour": 14, "end_hour": 16},
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.occupied("2023-01-09"), hours_mask(10, 11))
+
+        res = self.client.post(
+            exceptions_url(booking.id),
+            {"original_day": "2023-01-09", "day": "2023-01-10",
+             "start_hour": 15, "end_hour": 16},
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.occupied("2023-01-09"), 0)
+        self.assertEqual(self.occupied("2023-01-10"), hours_mask(14, 16))
+        self.assertIn(
+            (date(2023, 1, 9), date(2023, 1, 10), 15, 16),
+            list(Booking.objects.get(id=booking.id).occurrences()),
+        )
+
+    def test_exception_for_day_outside_series(self):
+        booking = self.book_weekly()
+
+        res = self.client.post(
+            exceptions_url(booking.id),
+            {"original_day": "2023-01-10", "is_cancelled": True},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_delete_recurring_booking_releases_series(self):
+        booking = self.book_weekly()
+        booking.add_exception(date(2023, 1, 9), is_cancelled=True)
+        self.book("2023-01-09", 10, 11)
+
+        booking.meeting.delete()
+
+        for day in ("2023-01-02", "2023-01-16", "2023-01-23"):
+            self.assertEqual(self.occupied(day), 0)
+        self.assertEqual(self.occupied("2023-01-09"), hours_mask(10, 11))
+
+    def test_delete_room_with_recurring_booking(self):
+        self.book_weekly()
+
+        self.room.delete()
+
+        connection.check_constraints()
+        self.assertFalse(Booking.objects.exists())
+        self.assertFalse(RoomOccupancy.objects.exists())
+
+    def test_delete_user_with_recurring_booking(self):
+        self.book_weekly()
+        other_user = get_user_model().objects.create_user(
+            "other@test.com", "testpassword"
+        )
+        self.book("2023-01-09", 12, 13, user=other_user)
+
+        self.user.delete()
+
+        connection.check_constraints()
+        self.assertFalse(Booking.objects.filter(user=self.user).exists())
+        for day in ("2023-01-02", "2023-01-16", "2023-01-23"):
+            self.assertEqual(self.occupied(day), 0)
+        self.assertEqual(self.occupied("2023-01-09"), hours_mask(12, 13))
+        self.assertEqual(RoomOccupancy.objects.count(), 4)
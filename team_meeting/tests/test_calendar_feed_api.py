@@ -0,0 +1,178 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from team_meeting import feeds
+from team_meeting.cache import get_reference_cache
+from team_meeting.models import (
+    MeetingRoom,
+    Project,
+    Team,
+    TypeOfMeeting,
+    Meeting,
+    Booking,
+)
+from team_meeting.tests.asgi import asgi_get
+
+
+def feed_url(scope, pk):
+    return reverse(
+        "team-meeting:calendar-feed", args=[feeds.feed_token(scope, pk)]
+    )
+
+
+class CalendarFeedTests(TestCase):
+    def setUp(self):
+        get_reference_cache().clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpassword",
+        )
+        self.client.force_authenticate(self.user)
+
+        self.room = MeetingRoom.objects.create(name="Blue", capacity=20)
+        self.other_room = MeetingRoom.objects.create(name="Green", capacity=5)
+        project = Project.objects.create(name="Taxi")
+        self.team = Team.objects.create(
+            name="Backend", project=project, num_of_members=5
+        )
+        self.type_of_meeting = TypeOfMeeting.objects.create(name="Daily")
+        self.today = date.today()
+
+    def book(self, day, room=None, **params):
+        defaults = {
+            "room": room or self.room,
+            "day": day,
+            "start_hour": 10,
+            "end_hour": 11,
+            "user": self.user,
+            "meeting": Meeting.objects.create(
+                team=self.team, type_of_meeting=self.type_of_meeting
+            ),
+        }
+        defaults.update(params)
+
+        return Booking.objects.create(**defaults)
+
+    def get_feed(self, url, **params):
+        res = APIClient().get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        content = b"".join(
+            res.streaming_content if res.streaming else [res.content]
+        ).decode()
+        return res, content
+
+    def test_feed_url(self):
+        res = self.client.get(
+            reverse(
+                "team-meeting:meetingroom-calendar", args=[self.room.id]
+            )
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(
+            res.data["url"].endswith(feed_url(feeds.ROOM, self.room.id))
+        )
+
+    def test_room_feed(self):
+        self.book(self.today)
+        self.book(self.today, room=self.other_room)
+
+        res, content = self.get_feed(feed_url(feeds.ROOM, self.room.id))
+
+        self.assertEqual(res["Content-Type"], "text/calendar; charset=utf-8")
+        self.assertTrue(content.startswith("BEGIN:VCALENDAR\r\n"))
+        self.assertTrue(content.endswith("END:VCALENDAR\r\n"))
+        self.assertEqual(content.count("BEGIN:VEVENT"), 1)
+        self.assertIn("SUMMARY:Daily (Backend)", content)
+        self.assertIn("LOCATION:Blue", content)
+
+    def test_feed_window(self):
+        self.book(self.today - timedelta(days=10))
+        self.book(self.today + timedelta(days=10))
+        self.book(
+            self.today - timedelta(days=100),
+            start_hour=12,
+            end_hour=13,
+            frequency=Booking.DAILY,
+            repeat_count=200,
+        )
+
+        _, content = self.get_feed(
+            feed_url(feeds.ROOM, self.room.id), past=5, future=20
+        )
+
+        # 26 days of the daily booking and the booking in 10 days
+        self.assertEqual(content.count("BEGIN:VEVENT"), 26 + 1)
+
+    def test_team_and_user_feeds(self):
+        other_user = get_user_model().objects.create_user(
+            "other@test.com", "testpassword", team=self.team
+        )
+        self.book(self.today)
+
+        _, team_content = self.get_feed(feed_url(feeds.TEAM, self.team.id))
+        _, user_content = self.get_feed(feed_url(feeds.USER, other_user.id))
+
+        self.assertEqual(team_content.count("BEGIN:VEVENT"), 1)
+        self.assertEqual(user_content.count("BEGIN:VEVENT"), 1)
+
+    def test_feed_is_cached_and_invalidated(self):
+        url = feed_url(feeds.ROOM, self.room.id)
+        self.book(self.today)
+        res, _ = self.get_feed(url)
+
+        with self.assertNumQueries(1):
+            cached = APIClient().get(url)
+        self.assertFalse(cached.streaming)
+
+        not_modified = APIClient().get(url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(
+            not_modified.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+
+        booking = Booking.objects.get(room=self.room)
+        booking.room = self.other_room
+        booking.save()
+        _, content = self.get_feed(url)
+        self.assertNotIn("BEGIN:VEVENT", content)
+
+        _, content = self.get_feed(feed_url(feeds.ROOM, self.other_room.id))
+        self.assertIn("BEGIN:VEVENT", content)
+
+    def test_feed_under_asgi(self):
+        url = feed_url(feeds.ROOM, self.room.id)
+        self.book(self.today)
+
+        status_code, _, body = asgi_get(url)
+
+        self.assertEqual(status_code, status.HTTP_200_OK)
+        self.assertIn(b"BEGIN:VEVENT", body)
+        _, cached = self.get_feed(url)
+        self.assertEqual(body.decode(), cached)
+
+    def test_invalid_feed(self):
+        url = feed_url(feeds.ROOM, self.room.id)
+
+        res = APIClient().get(url.replace(".ics", "x.ics"))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+        res = APIClient().get(feed_url(feeds.ROOM, 0))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+        res = APIClient().get(url, {"past": -1})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_fold_long_lines(self):
+        line = "DESCRIPTION:" + "ї" * 100
+
+        folded = feeds.fold(line)
+
+        parts = folded.split("\r\n ")
+        self.assertTrue(all(len(part.encode()) <= 77 for part in parts))
+        self.assertEqual("".join(parts), line + "\r\n")
@@ -0,0 +1,192 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import VersionStamp
+from team_meeting.cache import get_reference_cache, new_stamp, version_key
+from team_meeting.models import (
+    MeetingRoom,
+    Project,
+    Team,
+    TypeOfMeeting,
+    Meeting,
+    Booking,
+)
+
+BOOKING_URL = reverse("team-meeting:booking-list")
+BOOKING_BULK_URL = reverse("team-meeting:booking-bulk-create")
+MEETING_URL = reverse("team-meeting:meeting-list")
+
+
+def detail_url(booking_id):
+    return reverse("team-meeting:booking-detail", args=[booking_id])
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        get_reference_cache().clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpassword",
+        )
+        self.client.force_authenticate(self.user)
+
+        # stamps are stored on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room = MeetingRoom.objects.create(name="Blue", capacity=20)
+            self.project = Project.objects.create(name="Taxi")
+            self.team = Team.objects.create(
+                name="Backend", project=self.project, num_of_members=5
+            )
+            self.type_of_meeting = TypeOfMeeting.objects.create(
+                name="Weekly"
+            )
+            self.booking = self.book(10, 12)
+
+    def book(self, start_hour, end_hour):
+        return Booking.objects.create(
+            room=self.room,
+            day="2023-01-01",
+            start_hour=start_hour,
+            end_hour=end_hour,
+            user=self.user,
+            meeting=Meeting.objects.create(
+                team=self.team, type_of_meeting=self.type_of_meeting
+            ),
+        )
+
+    def test_list_not_modified(self):
+        res = self.client.get(BOOKING_URL, {"day": "2023-01-01"})
+        etag = res["ETag"]
+
+        # the throttle counter only
+        with self.assertNumQueries(1):
+            res = self.client.get(
+                BOOKING_URL, {"day": "2023-01-01"}, HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+        self.assertEqual(res.content, b"")
+
+    def test_etag_depends_on_url(self):
+        etag = self.client.get(BOOKING_URL)["ETag"]
+
+        res = self.client.get(
+            BOOKING_URL, {"day": "2023-01-02"}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_retrieve_not_modified(self):
+        url = detail_url(self.booking.id)
+        etag = self.client.get(url)["ETag"]
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=f'"x", W/{etag}')
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_booking_changes_modify_list(self):
+        etag = self.client.get(BOOKING_URL)["ETag"]
+
+        booking = self.book(14, 15)
+        res = self.client.get(BOOKING_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 2)
+        etag = res["ETag"]
+
+        booking.meeting.delete()
+        res = self.client.get(BOOKING_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 1)
+
+    def test_bulk_create_modifies_list(self):
+        etag = self.client.get(BOOKING_URL)["ETag"]
+
+        self.client.post(
+            BOOKING_BULK_URL,
+            {
+                "bookings": [
+                    {
+                        "room": self.room.id,
+                        "day": "2023-01-02",
+                        "start_hour": 10,
+                        "end_hour": 12,
+                        "meeting": {
+                            "team": self.team.id,
+                            "type_of_meeting": self.type_of_meeting.id,
+                        },
+                    }
+                ]
+            },
+            format="json",
+        )
+        res = self.client.get(BOOKING_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 2)
+
+    def test_related_changes_modify_list(self):
+        etag = self.client.get(MEETING_URL)["ETag"]
+
+        self.project.name = "Library"
+        self.project.save()
+        res = self.client.get(MEETING_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["project"], "Library")
+
+    @override_settings(REFERENCE_DATA_STAMP_TIMEOUT=60)
+    def test_etag_does_not_change_past_stamp_timeout(self):
+        etag = self.client.get(BOOKING_URL)["ETag"]
+
+        with mock.patch("time.time", return_value=time.time() + 61):
+            res = self.client.get(BOOKING_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @override_settings(REFERENCE_DATA_STAMP_TIMEOUT=60)
+    def test_write_of_other_process_modifies_list_after_stamp_timeout(self):
+        etag = self.client.get(BOOKING_URL)["ETag"]
+
+        # other worker processes renew the stored stamp
+        VersionStamp.objects.filter(key=version_key(Booking)).update(
+            stamp=new_stamp()
+        )
+        res = self.client.get(BOOKING_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with mock.patch("time.time", return_value=time.time() + 61):
+            res = self.client.get(BOOKING_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_rolled_back_write_does_not_modify_list(self):
+        etag = self.client.get(BOOKING_URL)["ETag"]
+
+        with transaction.atomic():
+            self.book(14, 15)
+            transaction.set_rollback(True)
+        # as other worker processes, which read the stored stamps
+        get_reference_cache().clear()
+        res = self.client.get(BOOKING_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @override_settings(REFERENCE_DATA_STAMP_TIMEOUT=None)
+    def test_etag_of_shared_cache_does_not_time_out(self):
+        etag = self.client.get(BOOKING_URL)["ETag"]
+
+        with mock.patch("time.time", return_value=time.time() + 24 * 3600):
+            res = self.client.get(BOOKING_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
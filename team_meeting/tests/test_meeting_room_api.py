@@ -0,0 +1,162 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from team_meeting.models import (
+    MeetingRoom,
+    Project,
+    Team,
+    TypeOfMeeting,
+    Meeting,
+    Booking,
+)
+
+AVAILABILITY_URL = reverse("team-meeting:meetingroom-rooms-availability")
+ROOM_FINDER_URL = reverse("team-meeting:meetingroom-find")
+
+
+def availability_url(room_id):
+    return reverse("team-meeting:meetingroom-availability", args=[room_id])
+
+
+class MeetingRoomAvailabilityApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpassword",
+        )
+        self.client.force_authenticate(self.user)
+
+        self.room_blue = MeetingRoom.objects.create(name="Blue", capacity=20)
+        self.room_green = MeetingRoom.objects.create(name="Green", capacity=5)
+        project = Project.objects.create(name="Taxi")
+        self.team = Team.objects.create(
+            name="Backend", project=project, num_of_members=5
+        )
+        self.type_of_meeting = TypeOfMeeting.objects.create(name="Weekly")
+
+        self.book(self.room_blue, "2023-01-02", 10, 12)
+        self.book(self.room_blue, "2023-01-02", 14, 15)
+        self.book(self.room_green, "2023-01-03", 0, 9)
+
+    def book(self, room, day, start_hour, end_hour):
+        return Booking.objects.create(
+            room=room,
+            day=day,
+            start_hour=start_hour,
+            end_hour=end_hour,
+            user=self.user,
+            meeting=Meeting.objects.create(
+                team=self.team, type_of_meeting=self.type_of_meeting
+            ),
+        )
+
+    def test_room_availability(self):
+        res = self.client.get(
+            availability_url(self.room_blue.id),
+            {"from": "2023-01-01", "to": "2023-01-02"},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["id"], self.room_blue.id)
+        self.assertEqual(
+            [day["free"] for day in res.data["days"]],
+            [
+                [{"start_hour": 0, "end_hour": 24}],
+                [
+                    {"start_hour": 0, "end_hour": 10},
+                    {"start_hour": 12, "end_hour": 14},
+                    {"start_hour": 15, "end_hour": 24},
+                ],
+            ],
+        )
+
+    def test_all_rooms_availability(self):
+        res = self.client.get(AVAILABILITY_URL, {"from": "2023-01-03"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        free = {room["name"]: room["days"][0]["free"] for room in res.data}
+        self.assertEqual(free["Blue"], [{"start_hour": 0, "end_hour": 24}])
+        self.assertEqual(free["Green"], [{"start_hour": 9, "end_hour": 24}])
+
+    def test_availability_with_invalid_range(self):
+        for params in (
+            {"from": "2023-01-05", "to": "2023-01-01"},
+            {"from": "2023-01-01", "to": "2023-03-01"},
+            {"from": "yesterday"},
+        ):
+            res = self.client.get(AVAILABILITY_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class RoomFinderApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpassword",
+        )
+        self.client.force_authenticate(self.user)
+
+        self.room_small = MeetingRoom.objects.create(
+            name="Small", capacity=4, has_projector=True
+        )
+        self.room_medium = MeetingRoom.objects.create(
+            name="Medium", capacity=8
+        )
+        self.room_large = MeetingRoom.objects.create(
+            name="Large", capacity=20, has_projector=True, is_soundproof=True
+        )
+        project = Project.objects.create(name="Taxi")
+        self.team = Team.objects.create(
+            name="Backend", project=project, num_of_members=6
+        )
+        type_of_meeting = TypeOfMeeting.objects.create(name="Weekly")
+
+        Booking.objects.create(
+            room=self.room_medium,
+            day="2023-01-02",
+            start_hour=10,
+            end_hour=12,
+            user=self.user,
+            meeting=Meeting.objects.create(
+                team=self.team, type_of_meeting=type_of_meeting
+            ),
+        )
+
+    def find(self, **params):
+        defaults = {"day": "2023-01-02", "start_hour": 9, "end_hour": 10}
+        defaults.update(params)
+        res = self.client.get(ROOM_FINDER_URL, defaults)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [room["name"] for room in res.data]
+
+    def test_find_rooms_ordered_by_best_fit(self):
+        self.assertEqual(
+            self.find(headcount=3), ["Small", "Medium", "Large"]
+        )
+        self.assertEqual(self.find(team=self.team.id), ["Medium", "Large"])
+
+    def test_find_rooms_excludes_occupied_rooms(self):
+        self.assertEqual(
+            self.find(team=self.team.id, start_hour=11, end_hour=13),
+            ["Large"],
+        )
+
+    def test_find_rooms_with_equipment(self):
+        self.assertEqual(
+            self.find(headcount=2, has_projector=True), ["Small", "Large"]
+        )
+        self.assertEqual(
+            self.find(headcount=2, is_soundproof=True), ["Large"]
+        )
+
+    def test_find_rooms_requires_headcount_or_team(self):
+        res = self.client.get(
+            ROOM_FINDER_URL,
+            {"day": "2023-01-02", "start_hour": 9, "end_hour": 10},
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,160 @@
+import json
+from datetime import date
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from team_meeting.models import (
+    MeetingRoom,
+    Project,
+    Team,
+    TypeOfMeeting,
+    Meeting,
+    Booking,
+)
+from team_meeting.pagination import KeysetPagination
+
+BOOKING_URL = reverse("team-meeting:booking-list")
+MEETING_URL = reverse("team-meeting:meeting-list")
+
+
+class PaginationApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpassword",
+        )
+        self.client.force_authenticate(self.user)
+
+        rooms = [
+            MeetingRoom.objects.create(name=name, capacity=10)
+            for name in ("Blue", "Green", "Yellow")
+        ]
+        project = Project.objects.create(name="Taxi")
+        team = Team.objects.create(
+            name="Backend", project=project, num_of_members=5
+        )
+        type_of_meeting = TypeOfMeeting.objects.create(name="Weekly")
+
+        for day in ("2023-01-01", "2023-01-02"):
+            for start_hour in range(8, 12):
+                for room in rooms:
+                    Booking.objects.create(
+                        room=room,
+                        day=day,
+                        start_hour=start_hour,
+                        end_hour=start_hour + 1,
+                        user=self.user,
+                        meeting=Meeting.objects.create(
+                            team=team, type_of_meeting=type_of_meeting
+                        ),
+                    )
+
+    def walk(self, url, link="next"):
+        ids = []
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", res.data)
+            page = [item["id"] for item in res.data["results"]]
+            ids = ids + page if link == "next" else page + ids
+            url = res.data[link]
+        return ids
+
+    def test_cursor_pagination_of_bookings(self):
+        ids = self.walk(f"{BOOKING_URL}?pagination=cursor")
+
+        self.assertEqual(
+            ids, list(Booking.objects.values_list("id", flat=True))
+        )
+
+    def test_cursor_pagination_backwards(self):
+        res = self.client.get(BOOKING_URL, {"pagination": "cursor"})
+        self.assertIsNone(res.data["previous"])
+        while res.data["next"]:
+            res = self.client.get(res.data["next"])
+
+        last_page = [item["id"] for item in res.data["results"]]
+        ids = self.walk(res.data["previous"], link="previous")
+
+        self.assertEqual(
+            ids + last_page,
+            list(Booking.objects.values_list("id", flat=True)),
+        )
+
+    def test_cursor_pagination_with_filter(self):
+        ids = self.walk(
+            f"{BOOKING_URL}?pagination=cursor&day=2023-01-02&room=green"
+        )
+
+        self.assertEqual(
+            ids,
+            list(
+                Booking.objects.filter(
+                    day="2023-01-02", room__name="Green"
+                ).values_list("id", flat=True)
+            ),
+        )
+
+    def test_cursor_pagination_of_meetings(self):
+        ids = self.walk(f"{MEETING_URL}?pagination=cursor")
+
+        self.assertEqual(
+            ids,
+            list(Meeting.objects.order_by("id").values_list("id", flat=True)),
+        )
+
+    @skipUnless(connection.vendor == "postgresql", "plans of PostgreSQL")
+    def test_cursor_is_index_range(self):
+        ordering = ["day", "start_hour", "id"]
+        queryset = Booking.objects.order_by(*ordering).filter(
+            KeysetPagination.position_filter(
+                ordering, [date(2023, 1, 1), 10, 1], False
+            )
+        )[:11]
+        sql, params = queryset.query.sql_with_params()
+
+        with connection.cursor() as cursor:
+            # plans of the small tables of tests depend on their statistics,
+            # the scan of the index on the ordering is the one left
+            for plan_type in ("seqscan", "bitmapscan", "sort"):
+                cursor.execute(f"SET LOCAL enable_{plan_type} = off")
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        nodes, plans = [], [plan[0]["Plan"]]
+        while plans:
+            node = plans.pop()
+            nodes.append(node)
+            plans.extend(node.get("Plans", []))
+        # the index is read from the position on
+        self.assertEqual(
+            [node["Node Type"] for node in nodes], ["Limit", "Index Scan"]
+        )
+        self.assertEqual(
+            nodes[1]["Index Cond"], "(day >= '2023-01-01'::date)"
+        )
+
+    def test_invalid_cursor(self):
+        res = self.client.get(
+            BOOKING_URL, {"pagination": "cursor", "cursor": "invalid"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_estimated_count(self):
+        res = self.client.get(BOOKING_URL, {"count": "estimate", "page": 3})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("count", res.data)
+        self.assertEqual(len(res.data["results"]), 4)
+        self.assertIsNone(res.data["next"])
+        self.assertIsNotNone(res.data["previous"])
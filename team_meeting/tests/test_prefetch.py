@@ -0,0 +1,129 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from team_meeting.cache import get_reference_cache
+from team_meeting.models import (
+    MeetingRoom,
+    Project,
+    Team,
+    TypeOfMeeting,
+    Meeting,
+    Booking,
+)
+from team_meeting.prefetch import plan_related
+from team_meeting.serializers import (
+    BookingRetrieveSerializer,
+    MeetingRetrieveSerializer,
+    TeamRetrieveSerializer,
+)
+
+MEETING_URL = reverse("team-meeting:meeting-list")
+BOOKING_URL = reverse("team-meeting:booking-list")
+
+
+class PlanRelatedTests(TestCase):
+    def test_nested_serializers(self):
+        self.assertEqual(
+            plan_related(TeamRetrieveSerializer()),
+            (["project"], ["project__teams"]),
+        )
+        self.assertEqual(
+            plan_related(MeetingRetrieveSerializer()),
+            (
+                ["team", "type_of_meeting", "team__project"],
+                ["team__project__teams"],
+            ),
+        )
+
+    def test_declared_paths_of_nested_serializers(self):
+        select_paths, prefetch_paths = plan_related(
+            BookingRetrieveSerializer()
+        )
+
+        self.assertEqual(
+            set(select_paths),
+            {
+                "room",
+                "user",
+                "meeting",
+                "meeting__team__project",
+                "meeting__type_of_meeting",
+            },
+        )
+        self.assertEqual(prefetch_paths, [])
+
+
+class ConstantQueryCountTests(TestCase):
+    def setUp(self):
+        get_reference_cache().clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpassword",
+        )
+        self.client.force_authenticate(self.user)
+        self.type_of_meeting = TypeOfMeeting.objects.create(name="Weekly")
+
+    def add_meetings(self, count):
+        start = Meeting.objects.count()
+        for index in range(start, start + count):
+            project = Project.objects.create(name=f"Project {index}")
+            team = Team.objects.create(
+                name=f"Team {index}", project=project, num_of_members=5
+            )
+            Team.objects.create(
+                name=f"Other team {index}", project=project, num_of_members=5
+            )
+            meeting = Meeting.objects.create(
+                team=team, type_of_meeting=self.type_of_meeting
+            )
+            Booking.objects.create(
+                room=MeetingRoom.objects.create(
+                    name=f"Room {index}", capacity=10
+                ),
+                day="2023-01-01",
+                start_hour=10,
+                end_hour=12,
+                user=self.user,
+                meeting=meeting,
+            )
+        return meeting
+
+    def test_retrieve_query_count(self):
+        meeting = self.add_meetings(1)
+        team = meeting.team
+        urls = (
+            reverse("team-meeting:project-detail", args=[team.project_id]),
+            reverse("team-meeting:team-detail", args=[team.id]),
+            reverse("team-meeting:meeting-detail", args=[meeting.id]),
+        )
+
+        # create the throttle counter
+        self.client.get(urls[0])
+
+        for url in urls:
+            # the throttle counter, the object with its relations,
+            # the teams of the project
+            with self.assertNumQueries(3):
+                res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_list_query_count_does_not_grow(self):
+        for url in (MEETING_URL, BOOKING_URL):
+            # create the throttle counter
+            self.client.get(url)
+            self.add_meetings(1)
+            with CaptureQueriesContext(connection) as few:
+                self.client.get(url)
+
+            self.add_meetings(5)
+            with CaptureQueriesContext(connection) as many:
+                res = self.client.get(url)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(many), len(few))
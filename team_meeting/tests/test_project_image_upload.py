@@ -0,0 +1,121 @@
+import hashlib
+import io
+import os
+from unittest import mock
+
+from PIL import Image
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from core.views import media
+from team_meeting.models import PROJECT_IMAGE_DIR, Project
+
+
+def image_upload_url(project_id):
+    return reverse("team-meeting:project-upload-image", args=[project_id])
+
+
+def image_content(image_format="PNG", size=(20, 10), mode="RGB"):
+    content = io.BytesIO()
+    Image.new(mode, size).save(content, format=image_format)
+    return content.getvalue()
+
+
+@mock.patch("team_meeting.images.get_executor", mock.Mock())
+class ProjectImageUploadTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            "admin@myproject.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(name="Taxi")
+
+    def tearDown(self):
+        for project in Project.objects.all():
+            if project.image:
+                project.image.delete()
+
+    def upload(self, content, filename="image.png", project=None):
+        project = project or self.project
+        return self.client.post(
+            image_upload_url(project.id),
+            {"image": SimpleUploadedFile(filename, content)},
+            format="multipart",
+        )
+
+    def test_image_is_named_by_content_hash(self):
+        content = image_content()
+
+        res = self.upload(content, "Logo.PNG")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.project.refresh_from_db()
+        self.assertEqual(
+            self.project.image.name,
+            f"{PROJECT_IMAGE_DIR}{hashlib.sha256(content).hexdigest()}.png",
+        )
+
+    def test_identical_uploads_share_file(self):
+        other = Project.objects.create(name="Library")
+        content = image_content()
+
+        self.upload(content)
+        self.upload(content, project=other)
+
+        self.project.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.project.image.name, other.image.name)
+
+    @override_settings(PROJECT_IMAGE_MAX_SIZE=1000)
+    def test_image_over_max_size(self):
+        noise = Image.frombytes("RGB", (100, 100), os.urandom(30_000))
+        content = io.BytesIO()
+        noise.save(content, format="PNG")
+
+        for content in (content.getvalue(), b"x" * 10**5):
+            res = self.upload(content)
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("1000 bytes", res.data["image"][0])
+
+    def test_decompression_bomb(self):
+        content = image_content(size=(6000, 6000), mode="1")
+
+        res = self.upload(content)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("pixels", res.data["image"][0])
+
+    def test_unsupported_format(self):
+        res = self.upload(image_content("BMP"), "image.bmp")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("BMP", res.data["image"][0])
+
+    def test_not_an_image(self):
+        res = self.upload(b"not an image", "image.jpg")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Project.objects.get(pk=self.project.pk).image)
+
+    def test_image_is_served_as_immutable(self):
+        self.upload(image_content())
+        self.project.refresh_from_db()
+
+        # media are served by the urlconf with DEBUG only
+        res = media(
+            RequestFactory().get("/"),
+            self.project.image.name,
+            document_root=settings.MEDIA_ROOT,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("immutable", res["Cache-Control"])
+        # closing the response would send request_finished
+        res.file_to_stream.close()
@@ -0,0 +1,166 @@
+import tempfile
+import threading
+from unittest import mock
+
+from PIL import Image
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from team_meeting import images
+from team_meeting.models import Project
+
+PROJECT_URL = reverse("team-meeting:project-list")
+
+
+def image_upload_url(project_id):
+    return reverse("team-meeting:project-upload-image", args=[project_id])
+
+
+class InlineExecutor:
+    """Run jobs in the test transaction, which the connection handling
+    of pool threads would close"""
+
+    def submit(self, function, *args):
+        with mock.patch("team_meeting.images.close_old_connections"):
+            with mock.patch("team_meeting.images.connection"):
+                function(*args)
+
+
+class ProjectImageVariantsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            "admin@myproject.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(name="Taxi")
+
+    def tearDown(self):
+        self.project.refresh_from_db()
+        for names in self.project.image_variants.values():
+            for name in names.values():
+                default_storage.delete(name)
+        self.project.image.delete()
+
+    def upload(self, size=(800, 400), project=None):
+        project = project or self.project
+        with tempfile.NamedTemporaryFile(suffix=".png") as ntf:
+            Image.new("RGBA", size).save(ntf, format="PNG")
+            ntf.seek(0)
+            return self.client.post(
+                image_upload_url(project.id),
+                {"image": ntf},
+                format="multipart",
+            )
+
+    def test_upload_does_not_wait_for_variants(self):
+        executor = mock.Mock()
+        with mock.patch(
+            "team_meeting.images.get_executor", return_value=executor
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                res = self.upload()
+
+        self.project.refresh_from_db()
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["image_variants"], {})
+        executor.submit.assert_called_once_with(
+            images.run_generate_variants,
+            self.project.id,
+            self.project.image.name,
+        )
+
+    def test_variants_are_listed(self):
+        with mock.patch(
+            "team_meeting.images.get_executor", return_value=InlineExecutor()
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.upload()
+
+        res = self.client.get(PROJECT_URL)
+        urls = res.data[0]["image_variants"]
+        self.project.refresh_from_db()
+
+        self.assertEqual(set(urls), set(images.IMAGE_VARIANTS))
+        for variant, size in images.IMAGE_VARIANTS.items():
+            names = self.project.image_variants[variant]
+            self.assertEqual(set(names), set(images.IMAGE_FORMATS))
+            for image_format, name in names.items():
+                self.assertEqual(
+                    urls[variant][image_format],
+                    f"http://testserver{default_storage.url(name)}",
+                )
+                with default_storage.open(name) as file:
+                    self.assertEqual(Image.open(file).size, (size, size // 2))
+
+    def test_variants_of_replaced_image_are_not_recorded(self):
+        with mock.patch("team_meeting.images.get_executor"):
+            self.upload()
+        self.project.refresh_from_db()
+        name = self.project.image.name
+        with mock.patch("team_meeting.images.get_executor"):
+            self.upload(size=(400, 800))
+
+        images.generate_variants(self.project.id, name)
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.image_variants, {})
+        for variant in images.IMAGE_VARIANTS:
+            for image_format in images.IMAGE_FORMATS:
+                default_storage.delete(
+                    images.variant_name(name, variant, image_format)
+                )
+        default_storage.delete(name)
+
+    def test_projects_of_the_same_image_share_variants(self):
+        other = Project.objects.create(name="Delivery")
+        with mock.patch(
+            "team_meeting.images.get_executor", return_value=InlineExecutor()
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.upload()
+            with mock.patch(
+                "team_meeting.images.resize", side_effect=AssertionError
+            ):
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.upload(project=other)
+
+        self.project.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(other.image.name, self.project.image.name)
+        self.assertEqual(other.image_variants, self.project.image_variants)
+        for names in other.image_variants.values():
+            for name in names.values():
+                self.assertTrue(default_storage.exists(name))
+
+    def test_pool_thread_closes_its_connection(self):
+        used = []
+        wrapper = type(connections[DEFAULT_DB_ALIAS])
+
+        def generate_variants(project_id, name):
+            # the connection of the pool thread
+            used.append(connections[DEFAULT_DB_ALIAS])
+            used[0].ensure_connection()
+            raise OSError("cannot identify image file")
+
+        # SQLite keeps in-memory test databases open on close()
+        with mock.patch.object(
+            wrapper, "close", autospec=True, side_effect=wrapper.close
+        ) as close, mock.patch(
+            "team_meeting.images.generate_variants", generate_variants
+        ), self.assertLogs("team_meeting.images", "ERROR"):
+            thread = threading.Thread(
+                target=images.run_generate_variants,
+                args=(self.project.id, "missing.png"),
+            )
+            thread.start()
+            thread.join()
+
+        self.assertEqual(len(used), 1)
+        close.assert_called_with(used[0])
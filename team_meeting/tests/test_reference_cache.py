@@ -0,0 +1,98 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from team_meeting.cache import get_reference_cache
+from team_meeting.models import MeetingRoom, Project, Team, TypeOfMeeting
+
+MEETING_ROOM_URL = reverse("team-meeting:meetingroom-list")
+TYPE_OF_MEETING_URL = reverse("team-meeting:typeofmeeting-list")
+TEAM_URL = reverse("team-meeting:team-list")
+
+
+class ReferenceDataCacheTests(TestCase):
+    def setUp(self):
+        get_reference_cache().clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpassword",
+        )
+        self.client.force_authenticate(self.user)
+
+        # stamps are stored on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            MeetingRoom.objects.create(name="Blue", capacity=20)
+            self.project = Project.objects.create(name="Taxi")
+            self.team = Team.objects.create(
+                name="Backend", project=self.project, num_of_members=5
+            )
+
+    def test_list_is_served_from_cache(self):
+        res = self.client.get(MEETING_ROOM_URL)
+
+        # the throttle counter only
+        with self.assertNumQueries(1):
+            cached = self.client.get(MEETING_ROOM_URL)
+
+        self.assertEqual(cached.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached.data, res.data)
+
+    @override_settings(REFERENCE_DATA_STAMP_TIMEOUT=60)
+    def test_list_is_served_from_cache_past_stamp_timeout(self):
+        res = self.client.get(MEETING_ROOM_URL)
+
+        # the throttle counter and the stored stamps
+        with mock.patch("time.time", return_value=time.time() + 61):
+            with self.assertNumQueries(2):
+                cached = self.client.get(MEETING_ROOM_URL)
+
+        self.assertEqual(cached.data, res.data)
+
+    def test_cache_is_keyed_by_query_params(self):
+        self.client.get(TEAM_URL)
+
+        res = self.client.get(TEAM_URL, {"name": "front"})
+
+        self.assertEqual(res.data, [])
+
+    def test_cache_is_invalidated_on_save_and_delete(self):
+        self.client.get(MEETING_ROOM_URL)
+
+        room = MeetingRoom.objects.create(name="Green", capacity=5)
+        res = self.client.get(MEETING_ROOM_URL)
+        self.assertEqual(len(res.data), 2)
+
+        room.delete()
+        res = self.client.get(MEETING_ROOM_URL)
+        self.assertEqual(len(res.data), 1)
+
+    def test_team_list_is_invalidated_on_project_change(self):
+        self.client.get(TEAM_URL)
+
+        self.project.name = "Library"
+        self.project.save()
+        res = self.client.get(TEAM_URL)
+
+        self.assertEqual(res.data[0]["project"], "Library")
+
+    def test_other_lists_stay_cached(self):
+        self.client.get(MEETING_ROOM_URL)
+
+        TypeOfMeeting.objects.create(name="Weekly")
+
+        # the throttle counter only
+        with self.assertNumQueries(1):
+            self.client.get(MEETING_ROOM_URL)
+
+    def test_cache_requires_authentication(self):
+        self.client.get(MEETING_ROOM_URL)
+
+        res = APIClient().get(MEETING_ROOM_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,183 @@
+import threading
+import time
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from rest_framework.exceptions import ValidationError
+
+from team_meeting.models import (
+    MeetingRoom,
+    Project,
+    Team,
+    TypeOfMeeting,
+    Meeting,
+    Booking,
+    RoomOccupancy,
+    hours_mask,
+)
+
+
+class RoomOccupancyTestMixin:
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpassword",
+        )
+        self.room = MeetingRoom.objects.create(name="Blue", capacity=20)
+        self.other_room = MeetingRoom.objects.create(name="Green", capacity=5)
+        project = Project.objects.create(name="Taxi")
+        self.team = Team.objects.create(
+            name="Backend", project=project, num_of_members=5
+        )
+        self.type_of_meeting = TypeOfMeeting.objects.create(name="Weekly")
+
+    def book(self, start_hour, end_hour, day="2023-01-01", room=None):
+        meeting = Meeting.objects.create(
+            team=self.team, type_of_meeting=self.type_of_meeting
+        )
+        return Booking.objects.create(
+            room=room or self.room,
+            day=day,
+            start_hour=start_hour,
+            end_hour=end_hour,
+            user=self.user,
+            meeting=meeting,
+        )
+
+
+class RoomOccupancyTests(RoomOccupancyTestMixin, TestCase):
+    def test_hours_mask(self):
+        self.assertEqual(hours_mask(0, 1), 0b1)
+        self.assertEqual(hours_mask(10, 12), 0b11 << 10)
+        self.assertEqual(hours_mask(0, 24), (1 << 24) - 1)
+
+    def test_create_booking_occupies_hours(self):
+        self.book(10, 12)
+        self.book(14, 15)
+
+        self.assertEqual(
+            RoomOccupancy.get_mask(self.room, "2023-01-01"),
+            hours_mask(10, 12) | hours_mask(14, 15),
+        )
+
+    def test_update_booking_moves_occupied_hours(self):
+        booking = self.book(10, 12)
+        booking = Booking.objects.get(id=booking.id)
+
+        booking.start_hour = 11
+        booking.end_hour = 13
+        booking.save()
+        self.assertEqual(
+            RoomOccupancy.get_mask(self.room, "2023-01-01"), hours_mask(11, 13)
+        )
+
+        booking.room = self.other_room
+        booking.save()
+        self.assertEqual(RoomOccupancy.get_mask(self.room, "2023-01-01"), 0)
+        self.assertEqual(
+            RoomOccupancy.get_mask(self.other_room, "2023-01-01"),
+            hours_mask(11, 13),
+        )
+
+    def test_delete_booking_releases_hours(self):
+        booking = self.book(10, 12)
+        self.book(12, 13)
+
+        booking.meeting.delete()
+
+        self.assertEqual(
+            RoomOccupancy.get_mask(self.room, "2023-01-01"), hours_mask(12, 13)
+        )
+
+    def test_adjacent_bookings_do_not_conflict(self):
+        self.book(10, 12)
+        self.book(12, 14)
+        self.book(8, 10)
+
+        self.assertEqual(Booking.objects.count(), 3)
+
+    def test_overlapping_bookings_conflict(self):
+        self.book(10, 14)
+
+        for start_hour, end_hour in ((9, 11), (13, 15), (11, 12), (8, 16)):
+            with self.assertRaises(ValidationError):
+                self.book(start_hour, end_hour)
+
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_same_hours_in_another_room_or_day_do_not_conflict(self):
+        self.book(10, 12)
+        self.book(10, 12, room=self.other_room)
+        self.book(10, 12, day="2023-01-02")
+
+        self.assertEqual(Booking.objects.count(), 3)
+
+    def test_failed_update_keeps_booked_hours(self):
+        self.book(8, 10)
+        booking = Booking.objects.get(id=self.book(10, 12).id)
+
+        booking.start_hour = 9
+        with self.assertRaisesMessage(
+            ValidationError, "start time conflicts"
+        ):
+            booking.save()
+
+        self.assertEqual(
+            RoomOccupancy.get_mask(self.room, "2023-01-01"), hours_mask(8, 12)
+        )
+
+    def test_lock_in_batches(self):
+        self.book(10, 12, day="2023-01-02")
+        slots = [
+            (self.other_room.id, date(2023, 1, 1)),
+            (self.room.id, date(2023, 1, 2)),
+            (self.room.id, date(2023, 1, 1)),
+            (self.room.id, date(2023, 1, 2)),
+        ]
+
+        # missing rows are created, then one query per batch
+        with self.assertNumQueries(3):
+            occupancies = RoomOccupancy.lock(slots, batch_size=2)
+
+        self.assertEqual(list(occupancies), sorted(set(slots)))
+        self.assertEqual(
+            occupancies[(self.room.id, date(2023, 1, 2))].mask,
+            hours_mask(10, 12),
+        )
+        self.assertEqual(
+            occupancies[(self.other_room.id, date(2023, 1, 1))].mask, 0
+        )
+
+
+@skipUnlessDBFeature("has_select_for_update")
+class ConcurrentBookingTests(RoomOccupancyTestMixin, TransactionTestCase):
+    def test_concurrent_bookings_of_same_hours(self):
+        self.book(8, 9)
+        claimed = threading.Event()
+        results = []
+
+        def book_in_transaction(wait_for_other):
+            try:
+                with transaction.atomic():
+                    self.book(10, 12)
+                    claimed.set()
+                    if wait_for_other:
+                        time.sleep(0.5)
+                results.append("booked")
+            except ValidationError:
+                results.append("conflict")
+            finally:
+                connection.close()
+
+        first = threading.Thread(target=book_in_transaction, args=(True,))
+        first.start()
+        claimed.wait(5)
+        second = threading.Thread(target=book_in_transaction, args=(False,))
+        second.start()
+        first.join()
+        second.join()
+
+        self.assertEqual(sorted(results), ["booked", "conflict"])
+        self.assertEqual(Booking.objects.count(), 2)
@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from team_meeting.models import Project, Team
+
+TEAM_URL = reverse("team-meeting:team-list")
+
+
+class AuthenticatedTeamApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpassword",
+        )
+        self.client.force_authenticate(self.user)
+
+        project_taxi = Project.objects.create(name="Taxi")
+        project_library = Project.objects.create(name="Library")
+        Team.objects.create(
+            name="Backend", project=project_taxi, num_of_members=5
+        )
+        Team.objects.create(
+            name="Frontend", project=project_taxi, num_of_members=3
+        )
+        Team.objects.create(
+            name="Backend", project=project_library, num_of_members=4
+        )
+
+    def test_filter_teams_by_name(self):
+        res = self.client.get(TEAM_URL, {"name": "BACK"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(team["project"] for team in res.data),
+            ["Library", "Taxi"],
+        )
+
+    def test_filter_teams_by_project(self):
+        res = self.client.get(TEAM_URL, {"project": "tax"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [team["name"] for team in res.data], ["Backend", "Frontend"]
+        )
@@ -0,0 +1,105 @@
+import hashlib
+import io
+
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+from PIL import Image
+from rest_framework.exceptions import ValidationError
+
+# size of the other fields of the form, allowed over the image size
+FORM_SIZE = 2**16
+# header bytes read at most to identify the image
+HEADER_MAX_SIZE = 2**20
+
+
+class ProjectImageUploadHandler(FileUploadHandler):
+    """Stream uploaded images to temporary files chunk by chunk,
+    hashing them and validating their header before the rest is read
+
+    Uploads over PROJECT_IMAGE_MAX_SIZE, of formats other than
+    PROJECT_IMAGE_FORMATS or with more than PROJECT_IMAGE_MAX_PIXELS
+    (decompression bombs) are rejected with a validation error of the
+    image field as soon as that is known, without decoding the image.
+    """
+
+    chunk_size = 2**16
+
+    def handle_raw_input(
+        self, input_data, META, content_length, boundary, encoding=None
+    ):
+        if content_length > settings.PROJECT_IMAGE_MAX_SIZE + FORM_SIZE:
+            self.reject_size()
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.file = TemporaryUploadedFile(
+            self.file_name,
+            self.content_type,
+            0,
+            self.charset,
+            self.content_type_extra,
+        )
+        self.sha256 = hashlib.sha256()
+        self.header = b""
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > settings.PROJECT_IMAGE_MAX_SIZE:
+            self.reject_size()
+
+        if self.header is not None:
+            self.header += raw_data
+            self.validate_header()
+
+        self.sha256.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        if self.header is not None:
+            self.validate_header(complete=True)
+
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.sha256 = self.sha256.hexdigest()
+        return self.file
+
+    def upload_interrupted(self):
+        if hasattr(self, "file"):
+            self.file.close()
+
+    def validate_header(self, complete=False):
+        try:
+            # reads the header only, pixels are not decoded
+            image = Image.open(io.BytesIO(self.header))
+        except Image.DecompressionBombError:
+            self.reject_pixels()
+        except OSError:
+            if complete or len(self.header) >= HEADER_MAX_SIZE:
+                self.reject("Upload a valid image.")
+            return
+
+        if image.format not in settings.PROJECT_IMAGE_FORMATS:
+            self.reject(
+                f"Image format {image.format} is not supported, use one of "
+                f"{', '.join(settings.PROJECT_IMAGE_FORMATS)}."
+            )
+        width, height = image.size
+        if width * height > settings.PROJECT_IMAGE_MAX_PIXELS:
+            self.reject_pixels()
+        self.header = None
+
+    def reject_size(self):
+        self.reject(
+            "Image should not exceed "
+            f"{settings.PROJECT_IMAGE_MAX_SIZE} bytes."
+        )
+
+    def reject_pixels(self):
+        self.reject(
+            "Image should not exceed "
+            f"{settings.PROJECT_IMAGE_MAX_PIXELS} pixels."
+        )
+
+    def reject(self, message):
+        self.upload_interrupted()
+        raise ValidationError({"image": [message]})
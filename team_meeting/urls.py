@@ -8,6 +8,10 @@ from team_meeting.views import (
     TeamViewSet,
     MeetingViewSet,
     BookingViewSet,
+    CalendarFeedView,
+    AsyncBookingListView,
+    AsyncMeetingRoomListView,
+    AsyncMeetingRoomAvailabilityView,
 )
 
 router = routers.DefaultRouter()
@@ -18,6 +22,33 @@ router.register("teams", TeamViewSet)
 router.register("meetings", MeetingViewSet)
 router.register("bookings", BookingViewSet)
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path("", include(router.urls)),
+    path(
+        "calendars/<str:token>.ics",
+        CalendarFeedView.as_view(),
+        name="calendar-feed",
+    ),
+    path(
+        "async/bookings/",
+        AsyncBookingListView.as_view(),
+        name="async-booking-list",
+    ),
+    path(
+        "async/meeting_rooms/",
+        AsyncMeetingRoomListView.as_view(),
+        name="async-meeting-room-list",
+    ),
+    path(
+        "async/meeting_rooms/availability/",
+        AsyncMeetingRoomAvailabilityView.as_view(),
+        name="async-meeting-room-availability",
+    ),
+    path(
+        "async/meeting_rooms/<int:pk>/availability/",
+        AsyncMeetingRoomAvailabilityView.as_view(),
+        name="async-meeting-room-detail-availability",
+    ),
+]
 
 app_name = "team-meeting"
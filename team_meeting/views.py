@@ -1,26 +1,74 @@
+import hashlib
+import math
 from datetime import datetime
 
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.db.models import Exists, F, OuterRef
+from django.db.models.lookups import GreaterThan
+from django.http import (
+    Http404,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.urls import reverse
+from django.utils.cache import quote_etag
+from django.views import View
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
-from rest_framework import mixins, status, viewsets
+from rest_framework import exceptions, mixins, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.viewsets import GenericViewSet
 
+from core.metrics import SerializerTimingMixin, serializer_timer
+from core.renderers import FastJSONRenderer
+from team_meeting import feeds, images
+from team_meeting.cache import (
+    CachedListMixin,
+    ConditionalGetMixin,
+    get_reference_cache,
+)
+from team_meeting.export import (
+    BOOKING_EXPORT_COLUMNS,
+    EXPORT_CHUNK_SIZE,
+    csv_lines,
+    is_asgi,
+    join_chunks,
+    ndjson_lines,
+    streaming_response,
+)
 from team_meeting.models import (
     MeetingRoom,
     Project,
     TypeOfMeeting,
-    Team, Meeting, Booking
+    Team,
+    Meeting,
+    Booking,
+    RecurrenceException,
+    RoomOccupancy,
+    hours_mask,
 )
+from team_meeting.pagination import MeetingBookingPagination
+from team_meeting.prefetch import PrefetchPlannerMixin
+from team_meeting.uploads import ProjectImageUploadHandler
 from team_meeting.permissions import (
     IsOwnerOfObject,
     IsAdminOrIfAuthenticatedReadOnly
 )
 from team_meeting.serializers import (
+    BOOKING_LIST_COLUMNS,
+    booking_list_row,
     MeetingRoomSerializer,
+    AvailabilityQuerySerializer,
+    MeetingRoomAvailabilitySerializer,
+    RoomFinderQuerySerializer,
     ProjectSerializer,
     ProjectRetrieveSerializer,
     ProjectImageSerializer,
@@ -37,11 +85,61 @@ from team_meeting.serializers import (
     BookingListSerializer,
     BookingRetrieveSerializer,
     BookingCreateSerializer,
+    BookingBulkCreateSerializer,
     BookingUpdateSerializer,
+    BookingExportQuerySerializer,
+    CalendarFeedSerializer,
+    CalendarWindowQuerySerializer,
+    DateRangeQuerySerializer,
+    OccurrenceSerializer,
+    RecurrenceExceptionSerializer,
 )
 
+AVAILABILITY_PARAMETERS = [
+    OpenApiParameter(
+        "from",
+        type=OpenApiTypes.DATE,
+        description="First day, today by default (ex. ?from=2023-01-23)",
+    ),
+    OpenApiParameter(
+        "to",
+        type=OpenApiTypes.DATE,
+        description="Last day, same as from by default (ex. ?to=2023-01-27)",
+    ),
+]
+
+BOOKING_FILTER_PARAMETERS = [
+    OpenApiParameter(
+        "day",
+        type=OpenApiTypes.DATE,
+        description="Filter by booking day (ex. ?2023-01-23)",
+    ),
+    OpenApiParameter(
+        "room",
+        type=OpenApiTypes.STR,
+        description="Filter by meeting room name day (ex. ?blue)",
+    ),
+    OpenApiParameter(
+        "project",
+        type=OpenApiTypes.STR,
+        description="Filter by project name (ex. ?project=lib)",
+    ),
+]
+
+
+def calendar_feed_response(request, scope, pk):
+    url = reverse(
+        "team-meeting:calendar-feed", args=[feeds.feed_token(scope, pk)]
+    )
+    serializer = CalendarFeedSerializer(
+        {"url": request.build_absolute_uri(url)}
+    )
+    return Response(serializer.data, status=status.HTTP_200_OK)
+
 
 class MeetingRoomViewSet(
+    CachedListMixin,
+    SerializerTimingMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     GenericViewSet,
@@ -49,9 +147,116 @@ class MeetingRoomViewSet(
     queryset = MeetingRoom.objects.all()
     serializer_class = MeetingRoomSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_dependencies = (MeetingRoom,)
+
+    def get_serializer_class(self):
+        if self.action in ("availability", "rooms_availability"):
+            return MeetingRoomAvailabilitySerializer
+
+        return MeetingRoomSerializer
+
+    def get_availability_days(self):
+        query = AvailabilityQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        return query.validated_data["days"]
+
+    @staticmethod
+    def get_occupancies(days, room=None):
+        """Return (room_id, day, mask) of occupied rooms in the days"""
+        occupancies = RoomOccupancy.objects.filter(
+            day__range=(days[0], days[-1])
+        )
+        if room is not None:
+            occupancies = occupancies.filter(room=room)
+
+        return occupancies.order_by("room_id", "day").values_list(
+            "room_id", "day", "mask"
+        )
+
+    def get_availability_data(self, rooms, many, days, masks):
+        context = self.get_serializer_context()
+        context.update(days=days, masks=masks)
+
+        serializer = self.get_serializer(rooms, many=many, context=context)
+        return serializer.data
+
+    def get_availability(self, rooms, many):
+        days = self.get_availability_days()
+        masks = {
+            (room_id, day): mask
+            for room_id, day, mask in self.get_occupancies(
+                days, None if many else rooms
+            )
+        }
+
+        data = self.get_availability_data(rooms, many, days, masks)
+        return Response(data, status=status.HTTP_200_OK)
+
+    @extend_schema(parameters=AVAILABILITY_PARAMETERS)
+    @action(methods=["GET"], detail=True, url_path="availability")
+    def availability(self, request, pk=None):
+        """Endpoint for free hours of specific meeting room per day"""
+        return self.get_availability(self.get_object(), many=False)
+
+    @extend_schema(
+        operation_id="team_meeting_meeting_rooms_availability_list",
+        parameters=AVAILABILITY_PARAMETERS,
+        responses=MeetingRoomAvailabilitySerializer(many=True),
+    )
+    @action(methods=["GET"], detail=False, url_path="availability")
+    def rooms_availability(self, request):
+        """Endpoint for free hours of all meeting rooms per day"""
+        return self.get_availability(self.get_queryset(), many=True)
+
+    @extend_schema(
+        parameters=[RoomFinderQuerySerializer],
+        responses=MeetingRoomSerializer(many=True),
+    )
+    @action(methods=["GET"], detail=False, url_path="find")
+    def find(self, request):
+        """Endpoint for free meeting rooms fitting the meeting best,
+        smallest sufficient capacity first"""
+        query = RoomFinderQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        taken = RoomOccupancy.objects.filter(
+            room=OuterRef("pk"), day=params["day"]
+        ).filter(
+            GreaterThan(
+                F("mask").bitand(
+                    hours_mask(params["start_hour"], params["end_hour"])
+                ),
+                0,
+            )
+        )
+        rooms = self.get_queryset().filter(
+            capacity__gte=params["headcount"]
+        ).filter(~Exists(taken))
+
+        if params["has_projector"]:
+            rooms = rooms.filter(has_projector=True)
+
+        if params["is_soundproof"]:
+            rooms = rooms.filter(is_soundproof=True)
+
+        rooms = rooms.order_by("capacity", "id")[:params["limit"]]
+        serializer = self.get_serializer(rooms, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @extend_schema(responses=CalendarFeedSerializer)
+    @action(methods=["GET"], detail=True, url_path="calendar")
+    def calendar(self, request, pk=None):
+        """Endpoint for the iCalendar feed URL of specific meeting room"""
+        return calendar_feed_response(
+            request, feeds.ROOM, self.get_object().pk
+        )
 
 
 class ProjectViewSet(
+    CachedListMixin,
+    PrefetchPlannerMixin,
+    SerializerTimingMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     mixins.CreateModelMixin,
@@ -60,6 +265,7 @@ class ProjectViewSet(
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_dependencies = (Project,)
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -78,7 +284,7 @@ class ProjectViewSet(
 
     def get_queryset(self):
         name = self.request.query_params.get("name")
-        queryset = self.queryset.all()
+        queryset = super().get_queryset()
 
         if name:
             queryset = queryset.filter(name__icontains=name)
@@ -104,18 +310,24 @@ class ProjectViewSet(
         permission_classes=[IsAdminUser],
     )
     def upload_image(self, request, pk=None):
-        """Endpoint for uploading image to specific project"""
+        """Endpoint for uploading image to specific project, its resized
+        variants are generated in the background"""
+        request.upload_handlers = [ProjectImageUploadHandler(request)]
         project = self.get_object()
         serializer = self.get_serializer(project, data=request.data)
 
         if serializer.is_valid():
-            serializer.save()
+            serializer.save(image_variants={})
+            if project.image:
+                images.schedule_variants(project)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 class TypeOfMeetingViewSet(
+    CachedListMixin,
+    SerializerTimingMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     GenericViewSet,
@@ -123,28 +335,35 @@ class TypeOfMeetingViewSet(
     queryset = TypeOfMeeting.objects.all()
     serializer_class = TypeOfMeetingSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_dependencies = (TypeOfMeeting,)
 
 
 class TeamViewSet(
+    CachedListMixin,
+    PrefetchPlannerMixin,
+    SerializerTimingMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     mixins.CreateModelMixin,
     GenericViewSet,
 ):
-    queryset = Team.objects.select_related("project")
+    queryset = Team.objects.all()
     serializer_class = TeamSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_dependencies = (Team, Project)
 
     def get_queryset(self):
         name = self.request.query_params.get("name")
         project = self.request.query_params.get("project")
-        queryset = self.queryset.all()
+        queryset = super().get_queryset()
 
         if name:
             queryset = queryset.filter(name__icontains=name)
 
         if project:
-            queryset = queryset.filter(project__name__icontains=project)
+            queryset = queryset.filter(
+                project__in=Project.objects.filter(name__icontains=project)
+            )
 
         return queryset
 
@@ -165,6 +384,14 @@ class TeamViewSet(
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(responses=CalendarFeedSerializer)
+    @action(methods=["GET"], detail=True, url_path="calendar")
+    def calendar(self, request, pk=None):
+        """Endpoint for the iCalendar feed URL of specific team"""
+        return calendar_feed_response(
+            request, feeds.TEAM, self.get_object().pk
+        )
+
     def get_serializer_class(self):
         if self.action == "list":
             return TeamListSerializer
@@ -175,25 +402,28 @@ class TeamViewSet(
         return TeamSerializer
 
 
-class MeetingBookingPagination(PageNumberPagination):
-    page_size = 10
-    max_page_size = 100
-
-
-class MeetingViewSet(viewsets.ModelViewSet):
-    queryset = Meeting.objects.select_related(
-        "type_of_meeting", "team__project"
-    )
+class MeetingViewSet(
+    ConditionalGetMixin,
+    PrefetchPlannerMixin,
+    SerializerTimingMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = Meeting.objects.all()
     permission_classes = (IsAuthenticated,)
     pagination_class = MeetingBookingPagination
+    etag_dependencies = (Meeting, TypeOfMeeting, Team, Project)
 
     def get_queryset(self):
         project = self.request.query_params.get("project")
 
-        queryset = self.queryset.all()
+        queryset = super().get_queryset()
 
         if project:
-            queryset = queryset.filter(team__project__name__icontains=project)
+            queryset = queryset.filter(
+                team__project__in=Project.objects.filter(
+                    name__icontains=project
+                )
+            )
 
         return queryset
 
@@ -225,60 +455,82 @@ class MeetingViewSet(viewsets.ModelViewSet):
         serializer.save(requires_meeting_room="False")
 
 
-class BookingViewSet(viewsets.ModelViewSet):
-    queryset = Booking.objects.select_related(
-        "room",
-        "user",
-        "meeting__team",
-        "meeting__type_of_meeting",
-        "meeting__team__project"
-    )
+class BookingViewSet(
+    ConditionalGetMixin,
+    PrefetchPlannerMixin,
+    SerializerTimingMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = Booking.objects.all()
     serializer_class = BookingSerializer
     permission_classes = (IsAuthenticated, IsOwnerOfObject)
     pagination_class = MeetingBookingPagination
+    throttle_scope = "booking"
+    # writes validate foreign keys and claim hours in savepoints
+    query_budget = {
+        "create": 20,
+        "bulk_create": 20,
+        "update": 20,
+        "partial_update": 20,
+        "exceptions": 20,
+    }
+    etag_dependencies = (
+        Booking,
+        RecurrenceException,
+        Meeting,
+        MeetingRoom,
+        TypeOfMeeting,
+        Team,
+        Project,
+        get_user_model(),
+    )
 
     def get_queryset(self):
         day = self.request.query_params.get("day")
         room = self.request.query_params.get("room")
         project = self.request.query_params.get("project")
 
-        queryset = self.queryset.all()
+        queryset = super().get_queryset()
 
         if day:
             day = datetime.strptime(day, "%Y-%m-%d").date()
             queryset = queryset.filter(day=day)
 
+        # match names in the small tables first, so that their trigram
+        # indexes are used and bookings are found by (room, day) index
         if room:
-            queryset = queryset.filter(room__name__icontains=room)
+            queryset = queryset.filter(
+                room__in=MeetingRoom.objects.filter(name__icontains=room)
+            )
 
         if project:
             queryset = queryset.filter(
-                meeting__team__project__name__icontains=project
+                meeting__team__project__in=Project.objects.filter(
+                    name__icontains=project
+                )
             )
 
         return queryset
 
-    @extend_schema(
-        parameters=[
-            OpenApiParameter(
-                "day",
-                type=OpenApiTypes.DATE,
-                description="Filter by booking day (ex. ?2023-01-23)",
-            ),
-            OpenApiParameter(
-                "room",
-                type=OpenApiTypes.STR,
-                description="Filter by meeting room name day (ex. ?blue)",
-            ),
-            OpenApiParameter(
-                "project",
-                type=OpenApiTypes.STR,
-                description="Filter by project name (ex. ?project=lib)",
-            ),
-        ]
-    )
+    @extend_schema(parameters=BOOKING_FILTER_PARAMETERS)
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        return self.get_conditional_response(request, self.list_rows)
+
+    def list_rows(self, request):
+        """Return the representation of BookingListSerializer, built
+        from values() rows without model instances or nested serializers"""
+        page = self.paginate_queryset(self.get_rows_queryset())
+        data = self.get_rows_data(page)
+        return self.get_paginated_response(data)
+
+    def get_rows_queryset(self):
+        return self.filter_queryset(self.get_queryset()).values(
+            *BOOKING_LIST_COLUMNS
+        )
+
+    def get_rows_data(self, rows):
+        with serializer_timer(self.request._request):
+            return [booking_list_row(row) for row in rows]
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -293,11 +545,383 @@ class BookingViewSet(viewsets.ModelViewSet):
         if self.action == "update":
             return BookingUpdateSerializer
 
+        if self.action == "bulk_create":
+            return BookingBulkCreateSerializer
+
+        if self.action == "occurrences":
+            return OccurrenceSerializer
+
+        if self.action == "exceptions":
+            return RecurrenceExceptionSerializer
+
         return BookingSerializer
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @action(methods=["POST"], detail=False, url_path="bulk")
+    def bulk_create(self, request):
+        """Endpoint for creating many bookings at once. Bookings that
+        conflict are reported by their index, the rest are created
+        unless all_or_nothing is set"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(user=request.user)
+
+        if not serializer.data["errors"]:
+            response_status = status.HTTP_201_CREATED
+        elif serializer.data["created"]:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+
+        return Response(serializer.data, status=response_status)
+
+    @extend_schema(
+        parameters=BOOKING_FILTER_PARAMETERS + [
+            OpenApiParameter(
+                "from",
+                type=OpenApiTypes.DATE,
+                description="First booking day (ex. ?from=2023-01-01)",
+            ),
+            OpenApiParameter(
+                "to",
+                type=OpenApiTypes.DATE,
+                description="Last booking day (ex. ?to=2023-01-31)",
+            ),
+            OpenApiParameter(
+                "type",
+                type=OpenApiTypes.STR,
+                enum=[
+                    BookingExportQuerySerializer.CSV,
+                    BookingExportQuerySerializer.NDJSON,
+                ],
+                description="Export format, csv (default) or ndjson",
+            ),
+        ],
+        responses={
+            (200, "text/csv"): OpenApiTypes.STR,
+            (200, "application/x-ndjson"): OpenApiTypes.STR,
+        },
+    )
+    @action(methods=["GET"], detail=False, url_path="export")
+    def export(self, request):
+        """Endpoint for streaming all filtered bookings as CSV or NDJSON,
+        rows are read from a server-side cursor (into a temporary file
+        first under ASGI)"""
+        query = BookingExportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        queryset = self.get_queryset()
+        if "from" in params:
+            queryset = queryset.filter(day__gte=params["from"])
+        if "to" in params:
+            queryset = queryset.filter(day__lte=params["to"])
+
+        header = list(BOOKING_EXPORT_COLUMNS)
+        rows = queryset.values_list(
+            *BOOKING_EXPORT_COLUMNS.values()
+        ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+        if params["type"] == BookingExportQuerySerializer.CSV:
+            lines = csv_lines(header, rows)
+            content_type = "text/csv"
+        else:
+            lines = ndjson_lines(header, rows)
+            content_type = "application/x-ndjson"
+
+        response = streaming_response(
+            join_chunks(lines), request, content_type
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="bookings.{params["type"]}"'
+        )
+        return response
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "from",
+                type=OpenApiTypes.DATE,
+                description="Skip occurrences before the day "
+                            "(ex. ?from=2023-01-23)",
+            ),
+            OpenApiParameter(
+                "to",
+                type=OpenApiTypes.DATE,
+                description="Skip occurrences after the day "
+                            "(ex. ?to=2023-02-23)",
+            ),
+        ],
+        responses=OccurrenceSerializer(many=True),
+    )
+    @action(methods=["GET"], detail=True, url_path="occurrences")
+    def occurrences(self, request, pk=None):
+        """Endpoint for occurrences of specific (recurring) booking"""
+        booking = self.get_object()
+        query = DateRangeQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        serializer = self.get_serializer(
+            booking.occurrences(
+                query.validated_data.get("from"),
+                query.validated_data.get("to"),
+            ),
+            many=True,
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @extend_schema(responses=CalendarFeedSerializer)
+    @action(methods=["GET"], detail=False, url_path="calendar")
+    def calendar(self, request):
+        """Endpoint for the iCalendar feed URL of bookings of the user
+        and meetings of the user's team"""
+        return calendar_feed_response(request, feeds.USER, request.user.pk)
+
+    @action(methods=["POST"], detail=True, url_path="exceptions")
+    def exceptions(self, request, pk=None):
+        """Endpoint for cancelling or moving single occurrence
+        of specific recurring booking"""
+        booking = self.get_object()
+        context = self.get_serializer_context()
+        context["booking"] = booking
+        serializer = self.get_serializer(data=request.data, context=context)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
     def perform_destroy(self, instance):
+        # deleting the meeting cascades to its booking
         instance.meeting.delete()
-        instance.delete()
+
+
+class CalendarFeedView(View):
+    """iCalendar feed of the bookings of a meeting room, team or user
+
+    Calendar clients cannot authenticate, so the feed is addressed by a
+    signed token. Feeds are streamed (rendered first under ASGI) and
+    cached until bookings in their scope change.
+    """
+
+    def get(self, request, token):
+        try:
+            scope, pk = feeds.parse_feed_token(token)
+        except (signing.BadSignature, ValueError):
+            raise Http404
+
+        query = CalendarWindowQuerySerializer(data=request.GET)
+        if not query.is_valid():
+            return JsonResponse(query.errors, status=400)
+
+        feed = feeds.CalendarFeed.get(
+            scope,
+            pk,
+            query.validated_data["past"],
+            query.validated_data["future"],
+        )
+        if feed is None:
+            raise Http404
+
+        key = feed.get_cache_key()
+        etag = quote_etag(hashlib.md5(key.encode()).hexdigest())
+        if ConditionalGetMixin.is_not_modified(request, etag):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            content = get_reference_cache().get(key)
+            if content is None and is_asgi(request):
+                # the feed cannot be read while the response is sent
+                content = "".join(self.cache_content(key, feed.chunks()))
+            if content is None:
+                response = StreamingHttpResponse(
+                    self.cache_content(key, feed.chunks())
+                )
+            else:
+                response = HttpResponse(content)
+
+        response["Content-Type"] = "text/calendar; charset=utf-8"
+        response["ETag"] = etag
+        return response
+
+    @staticmethod
+    def cache_content(key, chunks):
+        content = []
+        for chunk in chunks:
+            content.append(chunk)
+            yield chunk
+        get_reference_cache().set(
+            key, "".join(content), settings.REFERENCE_DATA_CACHE_TIMEOUT
+        )
+
+
+class AsyncReadView(View):
+    """Async view of a hot read endpoint of viewset_class, served
+    natively under ASGI to clients polling it
+
+    Requests are authenticated and throttled as by the viewset, which
+    builds the querysets, paginates and serializes; users, throttle
+    counters and rows are fetched with the async ORM and version stamps
+    with the async cache methods. Responses are always JSON.
+    """
+
+    viewset_class = None
+    action = None
+
+    @property
+    def throttle_scope(self):
+        return getattr(self.viewset_class, "throttle_scope", None)
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            request.user = await self.authenticate(request)
+            await self.check_throttles(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return self.error_response(request, exc)
+
+    @staticmethod
+    def get_authenticators():
+        classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+        return [authentication_class() for authentication_class in classes]
+
+    async def authenticate(self, request):
+        for authenticator in self.get_authenticators():
+            if hasattr(authenticator, "aauthenticate"):
+                result = await authenticator.aauthenticate(request)
+            else:
+                result = await sync_to_async(authenticator.authenticate)(
+                    request
+                )
+            if result is not None:
+                return result[0]
+        raise exceptions.NotAuthenticated
+
+    async def check_throttles(self, request):
+        for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES:
+            throttle = throttle_class()
+            if hasattr(throttle, "aallow_request"):
+                allowed = await throttle.aallow_request(request, self)
+            else:
+                allowed = await sync_to_async(throttle.allow_request)(
+                    request, self
+                )
+            if not allowed:
+                raise exceptions.Throttled(throttle.wait())
+
+    def error_response(self, request, exc):
+        data = exc.detail
+        if not isinstance(data, (list, dict)):
+            data = {"detail": data}
+        response = self.render(data, exc.status_code)
+
+        if isinstance(
+            exc,
+            (exceptions.NotAuthenticated, exceptions.AuthenticationFailed),
+        ):
+            response["WWW-Authenticate"] = (
+                self.get_authenticators()[0].authenticate_header(request)
+            )
+        if isinstance(exc, exceptions.Throttled) and exc.wait is not None:
+            response["Retry-After"] = str(math.ceil(exc.wait))
+        return response
+
+    @staticmethod
+    def render(data, status_code=status.HTTP_200_OK):
+        renderer = FastJSONRenderer()
+        return HttpResponse(
+            renderer.render(data, renderer.media_type),
+            status=status_code,
+            content_type=renderer.media_type,
+        )
+
+    def get_viewset(self, request):
+        viewset = self.viewset_class(
+            action_map={request.method.lower(): self.action},
+            format_kwarg=None,
+            args=self.args,
+            kwargs=self.kwargs,
+        )
+        viewset.request = viewset.initialize_request(request)
+        viewset.request.user = request.user
+        viewset.request.accepted_renderer = FastJSONRenderer()
+        viewset.request.accepted_media_type = FastJSONRenderer.media_type
+        return viewset
+
+
+class AsyncBookingListView(AsyncReadView):
+    """Booking list of BookingViewSet with its filters, pagination
+    and ETags"""
+
+    viewset_class = BookingViewSet
+    action = "list"
+
+    async def get(self, request):
+        viewset = self.get_viewset(request)
+
+        etag = await viewset.aget_etag(viewset.request)
+        if viewset.is_not_modified(request, etag):
+            return HttpResponse(
+                status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+
+        page = await viewset.paginator.apaginate_queryset(
+            viewset.get_rows_queryset(), viewset.request, view=viewset
+        )
+        data = viewset.get_rows_data(page)
+
+        response = self.render(viewset.get_paginated_response(data).data)
+        response["ETag"] = etag
+        return response
+
+
+class AsyncMeetingRoomListView(AsyncReadView):
+    """Meeting room list of MeetingRoomViewSet, cached as it is"""
+
+    viewset_class = MeetingRoomViewSet
+    action = "list"
+
+    async def get(self, request):
+        viewset = self.get_viewset(request)
+        cache = get_reference_cache()
+
+        key = await viewset.aget_list_cache_key(request)
+        data = await cache.aget(key)
+        if data is None:
+            rooms = [room async for room in viewset.get_queryset()]
+            data = viewset.get_serializer(rooms, many=True).data
+            await cache.aset(
+                key, data, settings.REFERENCE_DATA_CACHE_TIMEOUT
+            )
+
+        return self.render(data)
+
+
+class AsyncMeetingRoomAvailabilityView(AsyncReadView):
+    """Free hours of all meeting rooms, or of the one of pk, per day"""
+
+    viewset_class = MeetingRoomViewSet
+
+    async def get(self, request, pk=None):
+        self.action = "rooms_availability" if pk is None else "availability"
+        viewset = self.get_viewset(request)
+        days = viewset.get_availability_days()
+
+        rooms = viewset.get_queryset()
+        if pk is None:
+            rooms = [room async for room in rooms]
+        else:
+            rooms = await rooms.filter(pk=pk).afirst()
+            if rooms is None:
+                raise exceptions.NotFound
+
+        masks = {
+            (room_id, day): mask
+            async for room_id, day, mask in viewset.get_occupancies(
+                days, None if pk is None else rooms
+            )
+        }
+
+        return self.render(
+            viewset.get_availability_data(rooms, pk is None, days, masks)
+        )
@@ -34,6 +34,10 @@ INTERNAL_IPS = [
     "127.0.0.1",
 ]
 
+# the toolbar middleware is sync only, with it every request under ASGI,
+# those of async views included, is served in a thread
+DEBUG_TOOLBAR = os.environ.get("DEBUG_TOOLBAR", "1") == "1"
+
 
 # Application definition
 
@@ -44,7 +48,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "debug_toolbar",
+    "django.contrib.postgres",
     "rest_framework",
     "drf_spectacular",
     "team_meeting",
@@ -53,6 +57,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.metrics.MetricsMiddleware",
+    "core.middleware.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -60,9 +66,12 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
 ]
 
+if DEBUG_TOOLBAR:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.append("debug_toolbar.middleware.DebugToolbarMiddleware")
+
 ROOT_URLCONF = "team_meeting_service.urls"
 
 TEMPLATES = [
@@ -98,6 +107,54 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# Set REFERENCE_DATA_CACHE_DIR to share the reference data cache between
+# worker processes through the file system. Otherwise version stamps of
+# cached responses and ETags, stored in the database, are read again
+# after REFERENCE_DATA_STAMP_TIMEOUT seconds, as a write renews the cached
+# stamps of its own worker process only
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "reference_data": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "reference-data",
+    },
+}
+
+REFERENCE_DATA_STAMP_TIMEOUT = 10
+
+if os.environ.get("REFERENCE_DATA_CACHE_DIR"):
+    CACHES["reference_data"] = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ["REFERENCE_DATA_CACHE_DIR"],
+    }
+    REFERENCE_DATA_STAMP_TIMEOUT = None
+
+REFERENCE_DATA_CACHE_TIMEOUT = 60 * 60
+
+
+# Query budgets
+# Requests running more than QUERY_BUDGET queries (unless their view
+# declares query_budget) or repeating a query more than QUERY_REPEAT_LIMIT
+# times are logged, or fail with QUERY_BUDGET_STRICT
+
+QUERY_BUDGET = 10
+QUERY_REPEAT_LIMIT = 5
+QUERY_BUDGET_STRICT = False
+
+
+# Metrics
+# Set METRICS_DIR to a directory shared by the worker processes, so that
+# /metrics reports the requests of all of them
+
+METRICS_DIR = os.environ.get("METRICS_DIR")
+METRICS_FLUSH_INTERVAL = 5
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -143,6 +200,17 @@ STATIC_URL = "static/"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# threads resizing uploaded project images to their variants
+IMAGE_VARIANT_WORKERS = 2
+
+# limits of uploaded project images, checked while they are received
+PROJECT_IMAGE_MAX_SIZE = 5 * 2**20
+PROJECT_IMAGE_MAX_PIXELS = 25_000_000
+PROJECT_IMAGE_FORMATS = ("JPEG", "PNG", "WEBP", "GIF")
+
+# media directories of files named by the hash of their content
+IMMUTABLE_MEDIA_DIRS = ("uploads/projects/",)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
 
@@ -150,12 +218,27 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.CachedJWTAuthentication",
+    ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "core.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ),
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.UserRateThrottle",
+        "core.throttling.UserRateThrottle",
+        "core.throttling.ReadWriteRateThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"user": "100/day"},
+    "DEFAULT_THROTTLE_RATES": {
+        "user": "100/day",
+        # dashboards poll bookings every 30 seconds
+        "booking_read": "240/hour",
+        "booking_write": "20/hour",
+    },
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
@@ -165,6 +248,10 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": False,
 }
 
+# Seconds a worker process reuses a user resolved from an access token,
+# changes of the user expire it earlier
+JWT_USER_CACHE_TIMEOUT = 60
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Teem Meeting Service API",
     "DESCRIPTION": "Arrange meetings and book meeting rooms",
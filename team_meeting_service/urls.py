@@ -20,6 +20,7 @@ from drf_spectacular.views import (
     SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 )
 
+from core.views import media, metrics
 from team_meeting_service import settings
 
 urlpatterns = [
@@ -39,5 +40,10 @@ urlpatterns = [
         SpectacularRedocView.as_view(url_name="schema"),
         name="redoc",
     ),
-    path("__debug__/", include("debug_toolbar.urls")),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    path("metrics", metrics, name="metrics"),
+] + static(
+    settings.MEDIA_URL, view=media, document_root=settings.MEDIA_ROOT
+)
+
+if settings.DEBUG_TOOLBAR:
+    urlpatterns.append(path("__debug__/", include("debug_toolbar.urls")))
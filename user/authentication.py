@@ -0,0 +1,132 @@
+import copy
+import threading
+import time
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+from team_meeting import cache
+from team_meeting.models import Team
+
+
+def user_key(user_id):
+    return f"user:{user_id}"
+
+
+def expire_user(user_id):
+    """Expire the cached user, in every process sharing
+    the reference data cache"""
+    cache.expire(user_key(user_id))
+
+
+class UserCache:
+    """Users resolved by this process, by user id
+
+    Entries hold the version stamps of the user and of teams they were
+    loaded with and are used until JWT_USER_CACHE_TIMEOUT passes or
+    a stamp is renewed.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = {}
+
+    def get(self, user_id, versions):
+        with self.lock:
+            entry = self.users.get(user_id)
+        if entry is None:
+            return None
+
+        user, user_versions, expires_at = entry
+        if user_versions != versions or expires_at < time.monotonic():
+            return None
+        # requests may change their user, never share the cached one
+        return copy.copy(user)
+
+    def set(self, user_id, versions, user):
+        expires_at = time.monotonic() + settings.JWT_USER_CACHE_TIMEOUT
+        with self.lock:
+            self.users[user_id] = (copy.copy(user), versions, expires_at)
+
+    def clear(self):
+        with self.lock:
+            self.users.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication resolving users from a short-lived process cache
+
+    Users are cached by id together with version stamps, which are
+    renewed on post_save and post_delete of the user and of teams
+    (deleting a team clears the team of its users), so changes of
+    is_active, is_staff or team apply to the next request.
+    """
+
+    def get_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        versions = cache.get_stamps(
+            [user_key(user_id), cache.version_key(Team)]
+        )
+        user = user_cache.get(user_id, versions)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, versions, user)
+        return user
+
+    async def aauthenticate(self, request):
+        """authenticate() with the queries of the async ORM"""
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        """get_user() with the queries of the async ORM, users are checked
+        as by JWTAuthentication"""
+        user_id = self.get_user_id(validated_token)
+        versions = await cache.aget_stamps(
+            [user_key(user_id), cache.version_key(Team)]
+        )
+        user = user_cache.get(user_id, versions)
+        if user is not None:
+            return user
+
+        try:
+            user = await self.user_model.objects.aget(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            )
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+
+        user_cache.set(user_id, versions, user)
+        return user
+
+    @staticmethod
+    def get_user_id(validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
@@ -1,3 +1,103 @@
-from django.test import TestCase
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from team_meeting.cache import get_reference_cache
+from team_meeting.models import MeetingRoom, Project, Team
+from user.authentication import CachedJWTAuthentication
+
+ME_URL = reverse("user:manage")
+ROOM_URL = reverse("team-meeting:meetingroom-list")
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        get_reference_cache().clear()
+        self.addCleanup(cache.clear)
+        # stamps are stored on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = get_user_model().objects.create_user(
+                email="user@test.com", password="testpass"
+            )
+        self.token = RefreshToken.for_user(self.user).access_token
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        MeetingRoom.objects.create(name="Blue", capacity=4)
+
+    def user_queries(self, url, method="get", **kwargs):
+        table = get_user_model()._meta.db_table
+        with CaptureQueriesContext(connection) as queries:
+            res = getattr(self.client, method)(url, **kwargs)
+        count = sum(table in query["sql"] for query in queries)
+        return res, count
+
+    def test_user_is_loaded_once(self):
+        res, count = self.user_queries(ROOM_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(count, 1)
+
+        res, count = self.user_queries(ROOM_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(count, 0)
+
+    @override_settings(REFERENCE_DATA_STAMP_TIMEOUT=10)
+    def test_user_stays_cached_past_stamp_timeout(self):
+        self.user_queries(ROOM_URL)
+
+        with mock.patch("time.time", return_value=time.time() + 11):
+            res, count = self.user_queries(ROOM_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(count, 0)
+
+    def test_deactivated_user_is_rejected(self):
+        self.user_queries(ROOM_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(ROOM_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_staff_change_applies_to_next_request(self):
+        payload = {"name": "Green", "capacity": 6}
+        res = self.client.post(ROOM_URL, payload)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        res = self.client.post(ROOM_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_team_change_applies_to_next_request(self):
+        project = Project.objects.create(name="Rooms")
+        team = Team.objects.create(
+            name="Core", project=project, num_of_members=3
+        )
+        authentication = CachedJWTAuthentication()
+        self.assertIsNone(authentication.get_user(self.token).team_id)
+
+        self.user.team = team
+        self.user.save()
+        self.assertEqual(authentication.get_user(self.token).team_id, team.id)
+
+        team.delete()
+        self.assertIsNone(authentication.get_user(self.token).team_id)
+
+    def test_updating_the_user_refreshes_it(self):
+        self.client.get(ME_URL)
+
+        self.client.patch(ME_URL, {"email": "new@test.com"})
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.data["email"], "new@test.com")